@@ -0,0 +1,471 @@
+#!/usr/bin/env python3
+"""
+PRESTANDAMÄTNING FÖR ORC-BERÄKNINGARNA
+Jämför skalär kärna (calc_system_core) med vektoriserad (calc_system_vectorized),
+kallstartstid för kalkylatorns startpunkter samt en benchmarksvit för hela
+kedjan (egenskaper, cykel, ångtabeller, diagram och rapport) med JSON-resultat
+och regressionskontroll mot en baslinje
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from importlib.metadata import PackageNotFoundError, version
+
+import numpy as np
+
+from orc_karna import calc_system_core, calc_system_vectorized
+
+# Driftfönster för slumpade driftpunkter
+T_HOT_OMRADE = (30.0, 80.0)   # °C
+T_COLD_OMRADE = (5.0, 30.0)   # °C
+P_OMRADE = (0.5, 5.0)         # kW
+
+# Tunga beroenden som laddas först vid användning
+TUNGA_MODULER = ('CoolProp', 'pandas', 'matplotlib.pyplot', 'docx')
+
+# Kalkylatorns startpunkter (kod som körs i en ny Python-process)
+STARTPUNKTER = {
+    'diskavstånd': "from orc_karna import calc_disc_spacing; calc_disc_spacing(12.1)",
+    'TesTur-tabell': "from orc_kalkylator_enhanced import print_testur_ref; print_testur_ref()",
+    'kalkylator --help': "import sys; sys.argv = ['orc_kalkylator_enhanced', '--help']; "
+                         "import runpy; runpy.run_module('orc_kalkylator_enhanced', run_name='__main__')",
+}
+
+
+def random_operating_points(n, seed=0):
+    """Slumpade driftpunkter inom projektets driftfönster"""
+    rng = np.random.default_rng(seed)
+    return {
+        'T_hot': rng.uniform(*T_HOT_OMRADE, n),
+        'T_cold': rng.uniform(*T_COLD_OMRADE, n),
+        'P_target_kW': rng.uniform(*P_OMRADE, n),
+        'eta_turb': rng.uniform(0.45, 0.65, n),
+        'eta_gen': rng.uniform(0.90, 0.95, n),
+        'eta_pump': rng.uniform(0.55, 0.75, n),
+    }
+
+
+def time_scalar(fluid, points, backend):
+    """Tid för skalär kärna, en punkt i taget [s]"""
+    t0 = time.perf_counter()
+    for i in range(len(points['T_hot'])):
+        calc_system_core(fluid, points['T_hot'][i], points['T_cold'][i],
+                         points['P_target_kW'][i], points['eta_turb'][i],
+                         points['eta_gen'][i], points['eta_pump'][i], backend=backend)
+    return time.perf_counter() - t0
+
+
+def time_vectorized(fluid, points, backend):
+    """Tid för vektoriserad kärna, alla punkter på en gång [s]"""
+    t0 = time.perf_counter()
+    calc_system_vectorized(fluid, points['T_hot'], points['T_cold'],
+                           points['P_target_kW'], points['eta_turb'],
+                           points['eta_gen'], points['eta_pump'], backend=backend)
+    return time.perf_counter() - t0
+
+
+def bench_scalar_vs_vector(sizes=(10_000, 1_000_000), fluid='R1233zd(E)',
+                           backend='tabell', scalar_limit=50_000):
+    """
+    Mäter skalär och vektoriserad kärna vid givna problemstorlekar
+    Skalär tid över scalar_limit punkter extrapoleras linjärt från scalar_limit punkter.
+    """
+    # Värm upp (ladda tabeller, fyll cacher)
+    warmup = random_operating_points(10, seed=1)
+    time_scalar(fluid, warmup, backend)
+    time_vectorized(fluid, warmup, backend)
+
+    results = []
+    for n in sizes:
+        points = random_operating_points(n)
+        t_vec = time_vectorized(fluid, points, backend)
+        if n <= scalar_limit:
+            t_scalar = time_scalar(fluid, points, backend)
+            extrapolated = False
+        else:
+            sub = {key: values[:scalar_limit] for key, values in points.items()}
+            t_scalar = time_scalar(fluid, sub, backend) * n / scalar_limit
+            extrapolated = True
+        results.append({'n': n, 'scalar_s': t_scalar, 'vector_s': t_vec,
+                        'speedup': t_scalar / t_vec, 'extrapolated': extrapolated})
+    return results
+
+
+def _cold_start(code, repeats):
+    """Bästa väggtid [s] för kod i en ny Python-process"""
+    repo = os.path.dirname(os.path.abspath(__file__))
+    best = float('inf')
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        subprocess.run([sys.executable, '-c', code], cwd=repo, check=False,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def bench_startup(entry_points=STARTPUNKTER, repeats=5):
+    """
+    Kallstartstid för varje startpunkt med lat import (nu) och med de tunga
+    beroendena importerade i förväg (som när de importerades på modulnivå)
+    """
+    eager = "import " + ", ".join(TUNGA_MODULER) + "; "
+    results = []
+    for name, code in entry_points.items():
+        results.append({'name': name,
+                        'eager_s': _cold_start(eager + code, repeats),
+                        'lazy_s': _cold_start(code, repeats)})
+    results.append({'name': 'tom interpretator',
+                    'eager_s': _cold_start(eager, repeats),
+                    'lazy_s': _cold_start('pass', repeats)})
+    return results
+
+
+def print_startup(results):
+    print("\n" + "="*70)
+    print("KALLSTART (bästa av flera körningar)")
+    print("="*70)
+    print(f"{'Startpunkt':<22} {'Före [ms]':>12} {'Lat [ms]':>12} {'Speedup':>10}")
+    print("-"*70)
+    for r in results:
+        print(f"{r['name']:<22} {r['eager_s']*1000:>12.0f} {r['lazy_s']*1000:>12.0f} "
+              f"{r['eager_s']/r['lazy_s']:>9.1f}x")
+    print("Före = " + ", ".join(TUNGA_MODULER) + " importerade vid start")
+    print("="*70 + "\n")
+
+
+# ============================================================================
+# BENCHMARKSVIT
+# ============================================================================
+
+SVIT_STORLEKAR = (1, 100, 10_000, 1_000_000)
+TVA_MEDIER = ('R1233zd(E)', 'R245fa')
+
+# Tillåten relativ försämring mot baslinjen innan sviten underkänns
+REGRESSIONSGRANS = 0.25
+# Mätbrus: skillnader inom upprepningarnas spridning (median - bästa) räknas
+# inte som regression; MIN_SKILLNAD är golvet för timerns upplösning [s]
+MIN_SKILLNAD = 50e-6
+
+# Minsta total mättid per mätpunkt; korta steg upprepas och bästa tid används
+MIN_MATTID = 0.2   # s
+MAX_UPPREPNINGAR = 5
+
+# Paket vars version redovisas i maskinmetadata
+SVIT_PAKET = ('CoolProp', 'numpy', 'scipy', 'pandas', 'matplotlib', 'python-docx')
+
+
+def _package_version(name):
+    try:
+        return version(name)
+    except PackageNotFoundError:
+        return None
+
+
+def machine_metadata():
+    """Maskin, Python, paketversioner och git-version för resultatfilen"""
+    repo = os.path.dirname(os.path.abspath(__file__))
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=repo,
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'host': platform.node(),
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'python': platform.python_version(),
+        'packages': {name: _package_version(name) for name in SVIT_PAKET},
+        'git_commit': commit,
+    }
+
+
+def all_fluids(backend='tabell'):
+    """
+    Rena medier som klarar hela driftfönstret (mättnad och viskositet)
+    och, för backend 'tabell', som går att tabellera
+    """
+    from orc_egenskaper import get_saturation_batch
+    from orc_screening import list_pure_fluids
+    T_K = np.arange(T_COLD_OMRADE[0], T_HOT_OMRADE[1] + 0.5, 0.5) + 273.15
+    fluids = []
+    for fluid in list_pure_fluids():
+        try:
+            sat = get_saturation_batch(fluid, T_K)
+        except ValueError:
+            continue
+        if not all(np.isfinite(values).all() for values in sat.values()):
+            continue
+        if backend == 'tabell':
+            from orc_egenskapstabeller import load_table
+            try:
+                load_table(fluid)
+            except ValueError:
+                continue
+        fluids.append(fluid)
+    return tuple(fluids)
+
+
+def _split_by_fluid(fluids, points):
+    """Fördelar driftpunkterna cykliskt över medierna: [(medium, index), ...]"""
+    n = len(points['T_hot'])
+    return [(fluid, np.arange(i, n, len(fluids))) for i, fluid in enumerate(fluids)
+            if i < n]
+
+
+def _stage_get_props(fluids, points, backend):
+    from orc_karna import get_props
+    T_hot, T_cold = points['T_hot'].tolist(), points['T_cold'].tolist()
+    for i in range(len(T_hot)):
+        get_props(fluids[i % len(fluids)], T_hot[i], T_cold[i])
+
+
+def _stage_enhanced(fluids, points, backend):
+    from orc_kalkylator_enhanced import calc_system_enhanced
+    columns = {key: values.tolist() for key, values in points.items()}
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i in range(len(columns['T_hot'])):
+            fluid = fluids[i % len(fluids)]
+            calc_system_enhanced(fluid, fluid, columns['T_hot'][i], columns['T_cold'][i],
+                                 columns['P_target_kW'][i], columns['eta_turb'][i],
+                                 columns['eta_gen'][i], columns['eta_pump'][i])
+
+
+def _stage_vectorized(fluids, points, backend):
+    fluid = np.asarray(fluids)[np.arange(len(points['T_hot'])) % len(fluids)]
+    calc_system_vectorized(fluid, points['T_hot'], points['T_cold'],
+                           points['P_target_kW'], points['eta_turb'],
+                           points['eta_gen'], points['eta_pump'], backend=backend)
+
+
+def _stage_generate_table(fluids, points, backend):
+    from orc_termo_data import generate_table
+    with contextlib.redirect_stdout(io.StringIO()):
+        for fluid, index in _split_by_fluid(fluids, points):
+            generate_table(fluid, fluid, points['T_hot'][index])
+
+
+def _stage_diagram(output_dir):
+    from generate_diagrams import render_all
+    with contextlib.redirect_stdout(io.StringIO()):
+        render_all(output_dir)
+
+
+def _stage_rapport(output_dir):
+    from generate_rapport import main
+    with contextlib.redirect_stdout(io.StringIO()):
+        main(output_dir)
+
+
+# Steg som skalar med antal driftpunkter: namn → (funktion, största uppmätta n)
+# Över gränsen extrapoleras tiden linjärt från gränsen (som bench_scalar_vs_vector)
+SVIT_STEG = {
+    'get_props': (_stage_get_props, 10_000),
+    'calc_system_enhanced': (_stage_enhanced, 10_000),
+    'calc_system_vectorized': (_stage_vectorized, 1_000_000),
+    'generate_table': (_stage_generate_table, 10_000),
+}
+
+# Steg med fast storlek (hela artefakten), körs i ordning i samma katalog
+SVIT_ARTEFAKTER = {
+    'diagram': _stage_diagram,
+    'rapport': _stage_rapport,
+}
+
+
+def _best_time(fn, before=None):
+    """
+    Bästa tid [s] över upprepningar tills MIN_MATTID eller MAX_UPPREPNINGAR
+    Returnerar (bästa tid, antal upprepningar, relativ spridning (median - bästa)/bästa)
+    """
+    times = []
+    while len(times) < MAX_UPPREPNINGAR and (not times or sum(times) < MIN_MATTID):
+        if before is not None:
+            before()
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    best = min(times)
+    return best, len(times), (float(np.median(times)) - best) / best if best > 0 else 0.0
+
+
+def run_suite(sizes=SVIT_STORLEKAR, fluid_sets=('två', 'alla'), backend='tabell',
+              stages=None, verbose=True):
+    """
+    Kör benchmarksviten och returnerar resultat som dict (JSON-serialiserbar)
+    Egenskapscacharna töms före varje mätning så att varje körning mäter
+    beräkningen; diskcachen stängs av under sviten.
+    """
+    from orc_egenskapscache import MILJOVARIABEL
+
+    saved = os.environ.get(MILJOVARIABEL)
+    os.environ[MILJOVARIABEL] = 'off'
+    try:
+        return _run_suite(sizes, fluid_sets, backend, stages, verbose)
+    finally:
+        if saved is None:
+            del os.environ[MILJOVARIABEL]
+        else:
+            os.environ[MILJOVARIABEL] = saved
+
+
+def _run_suite(sizes, fluid_sets, backend, stages, verbose):
+    from orc_egenskaper import cache_clear
+
+    stages = list(stages or list(SVIT_STEG) + list(SVIT_ARTEFAKTER))
+    groups = {'två': TVA_MEDIER}
+    if 'alla' in fluid_sets:
+        groups['alla'] = all_fluids(backend)
+
+    results = []
+
+    def record(stage, group, n, seconds, repeats, spread, extrapolated=False):
+        entry = {'stage': stage, 'fluids': group, 'n': n, 'seconds': seconds,
+                 'repeats': repeats, 'spread': spread, 'extrapolated': extrapolated}
+        results.append(entry)
+        if verbose:
+            mark = "*" if extrapolated else " "
+            print(f"  {stage:<24} {group:<5} {'' if n is None else f'{n:,}':>10} "
+                  f"{seconds:>11.4f}{mark}")
+
+    for group in fluid_sets:
+        fluids = groups[group]
+        for stage in (s for s in stages if s in SVIT_STEG):
+            fn, limit = SVIT_STEG[stage]
+            # Uppvärmning: importer, splinetabeller, CoolProp-tillstånd
+            warmup = random_operating_points(len(fluids), seed=1)
+            fn(fluids, warmup, backend)
+            for n in sizes:
+                points = random_operating_points(min(n, limit))
+                seconds, repeats, spread = _best_time(lambda: fn(fluids, points, backend),
+                                                      before=cache_clear)
+                if n > limit:
+                    record(stage, group, n, seconds * n / limit, repeats, spread, True)
+                else:
+                    record(stage, group, n, seconds, repeats, spread)
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        for stage in (s for s in stages if s in SVIT_ARTEFAKTER):
+            fn = SVIT_ARTEFAKTER[stage]
+            seconds, repeats, spread = _best_time(lambda: fn(output_dir), before=cache_clear)
+            record(stage, '-', None, seconds, repeats, spread)
+
+    return {
+        'machine': machine_metadata(),
+        'config': {'sizes': list(sizes), 'fluid_sets': {g: list(groups[g])
+                                                        for g in fluid_sets},
+                   'backend': backend},
+        'results': results,
+    }
+
+
+def _result_key(entry):
+    return (entry['stage'], entry['fluids'], entry['n'])
+
+
+def compare_to_baseline(suite, baseline, threshold=REGRESSIONSGRANS):
+    """
+    Jämför mot en tidigare körning
+    En försämring räknas bara om den är större än mätbruset: den största av
+    de två körningarnas spridning mellan upprepningar (minst MIN_SKILLNAD).
+    Returnerar lista med (steg, medier, n, baslinje [s], nu [s], kvot, regression)
+    """
+    old = {_result_key(entry): entry for entry in baseline['results']}
+    rows = []
+    for entry in suite['results']:
+        reference = old.get(_result_key(entry))
+        if reference is None:
+            continue
+        before, now = reference['seconds'], entry['seconds']
+        noise = max(MIN_SKILLNAD, before * reference.get('spread', 0.0),
+                    now * entry.get('spread', 0.0))
+        regression = now > before * (1 + threshold) and now - before > noise
+        rows.append((entry['stage'], entry['fluids'], entry['n'], before, now,
+                     now / before if before > 0 else float('inf'), regression))
+    return rows
+
+
+def print_comparison(rows, threshold=REGRESSIONSGRANS):
+    print("\n" + "="*78)
+    print(f"JÄMFÖRELSE MOT BASLINJE (gräns +{threshold:.0%})")
+    print("="*78)
+    print(f"{'Steg':<24} {'Medier':<6} {'Punkter':>10} {'Före [s]':>10} "
+          f"{'Nu [s]':>10} {'Kvot':>7}")
+    print("-"*78)
+    for stage, group, n, before, now, ratio, regression in rows:
+        print(f"{stage:<24} {group:<6} {'' if n is None else f'{n:,}':>10} "
+              f"{before:>10.4f} {now:>10.4f} {ratio:>6.2f}x"
+              + ("  REGRESSION" if regression else ""))
+    n_reg = sum(row[-1] for row in rows)
+    print(f"\n{n_reg} regressioner av {len(rows)} jämförda mätpunkter")
+    print("="*78 + "\n")
+
+
+def print_results(results, fluid, backend):
+    print("\n" + "="*70)
+    print(f"SKALÄR VS VEKTORISERAD KÄRNA ({fluid}, källa: {backend})")
+    print("="*70)
+    print(f"{'Punkter':>10} {'Skalär [s]':>14} {'Vektor [s]':>12} {'Speedup':>10}")
+    print("-"*70)
+    for r in results:
+        mark = "*" if r['extrapolated'] else " "
+        print(f"{r['n']:>10,} {r['scalar_s']:>13.3f}{mark} {r['vector_s']:>12.4f} "
+              f"{r['speedup']:>9.0f}x")
+    if any(r['extrapolated'] for r in results):
+        print("* extrapolerat från delmängd")
+    print("="*70 + "\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Prestandamätning ORC-kärnan")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 1_000_000])
+    parser.add_argument('--fluid', default='R1233zd(E)')
+    parser.add_argument('--backend', default='tabell', choices=['tabell', 'coolprop'])
+    parser.add_argument('--scalar-limit', type=int, default=50_000)
+    parser.add_argument('--startup', action='store_true',
+                        help="Mät kallstartstid för kalkylatorns startpunkter")
+    parser.add_argument('--suite', action='store_true',
+                        help="Kör benchmarksviten (alla steg, alla storlekar)")
+    parser.add_argument('--fluid-sets', nargs='+', default=['två', 'alla'],
+                        choices=['två', 'alla'])
+    parser.add_argument('--stages', nargs='+', default=None,
+                        choices=list(SVIT_STEG) + list(SVIT_ARTEFAKTER))
+    parser.add_argument('--json', default=None, help="Spara svitens resultat som JSON")
+    parser.add_argument('--baseline', default=None,
+                        help="Tidigare JSON-resultat att jämföra mot")
+    parser.add_argument('--threshold', type=float, default=REGRESSIONSGRANS,
+                        help="Tillåten relativ försämring mot baslinjen")
+    args = parser.parse_args()
+
+    if args.suite:
+        sizes = args.sizes if '--sizes' in sys.argv else SVIT_STORLEKAR
+        print(f"\nBenchmarksvit (källa för vektoriserad kärna: {args.backend})")
+        print(f"  {'Steg':<24} {'Medier':<5} {'Punkter':>10} {'Tid [s]':>12}")
+        suite = run_suite(sizes, args.fluid_sets, args.backend, args.stages)
+        print("* extrapolerat från delmängd")
+        if args.json:
+            with open(args.json, 'w', encoding='utf-8') as f:
+                json.dump(suite, f, indent=2, ensure_ascii=False)
+            print(f"Resultat sparat: {args.json}")
+        if args.baseline:
+            with open(args.baseline, encoding='utf-8') as f:
+                rows = compare_to_baseline(suite, json.load(f), args.threshold)
+            print_comparison(rows, args.threshold)
+            if any(row[-1] for row in rows):
+                sys.exit(1)
+    elif args.startup:
+        print_startup(bench_startup())
+    else:
+        results = bench_scalar_vs_vector(args.sizes, args.fluid, args.backend,
+                                         args.scalar_limit)
+        print_results(results, args.fluid, args.backend)
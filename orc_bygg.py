@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+INKREMENTELL BYGGNAD AV RAPPORTARTEFAKTER
+Varje byggsteg (diagram, Word-rapport) har en nyckel som är en innehållshash av
+dess indata: källskript och beroende moduler, egenskapsdata (CoolProp-version),
+parametrar och hashar av de artefakter steget läser. Nyckel och utdatahashar
+sparas i output-mappen; ett steg körs bara om nyckeln ändrats eller om någon
+utdatafil saknas eller har ändrats sedan förra bygget.
+"""
+
+import argparse
+import ast
+import hashlib
+import importlib
+import json
+import os
+import time
+from dataclasses import dataclass
+from importlib.metadata import PackageNotFoundError, version
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+OUTPUT_DIR = os.path.join(REPO_DIR, 'outputs')
+STATUSFIL = '.byggstatus.json'
+
+
+@dataclass(frozen=True)
+class Byggsteg:
+    """Ett byggsteg och dess beroenden"""
+    name: str
+    module: str          # modul vars main(output_dir) bygger artefakterna
+    outputs: tuple       # filer i output-mappen som steget skapar
+    sources: tuple = ()  # övriga källfiler (relativt repo); modulen och allt den
+                         # importerar ur repot räknas alltid med (module_sources)
+    inputs: tuple = ()   # filer i output-mappen som steget läser
+    packages: tuple = ()  # paket vars version påverkar resultatet
+    params: tuple = ()   # (namn, värde)-par
+
+
+BYGGSTEG = (
+    Byggsteg(
+        name='diagram',
+        module='generate_diagrams',
+        outputs=('ORC_tryck_temperatur.png', 'ORC_termo_jamforelse.png'),
+        packages=('CoolProp', 'matplotlib', 'numpy'),
+    ),
+    Byggsteg(
+        name='rapport',
+        module='generate_rapport',
+        outputs=('ORC_Arbetsmedium_Analys_MED_DIAGRAM.docx',),
+        inputs=('ORC_tryck_temperatur.png', 'ORC_termo_jamforelse.png'),
+        packages=('python-docx',),
+    ),
+)
+
+
+def file_hash(path):
+    """SHA-256 av filinnehåll (None om filen saknas)"""
+    if not os.path.exists(path):
+        return None
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _package_version(name):
+    try:
+        return version(name)
+    except PackageNotFoundError:
+        return None
+
+
+def module_sources(module):
+    """
+    Källfilerna (relativt repo) för modulen och alla repomoduler den importerar,
+    direkt eller indirekt, även lata importer inne i funktioner
+    """
+    found = set()
+    pending = [module]
+    while pending:
+        name = pending.pop()
+        filename = name + '.py'
+        if filename in found or not os.path.exists(os.path.join(REPO_DIR, filename)):
+            continue
+        found.add(filename)
+        with open(os.path.join(REPO_DIR, filename), encoding='utf-8') as f:
+            tree = ast.parse(f.read(), filename)
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                pending.extend(alias.name.split('.')[0] for alias in node.names)
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                pending.append(node.module.split('.')[0])
+    return tuple(sorted(found))
+
+
+def step_key(step, output_dir=OUTPUT_DIR):
+    """Innehållshash av alla indata till ett byggsteg"""
+    sources = sorted(set(step.sources) | set(module_sources(step.module)))
+    deps = {
+        'sources': {f: file_hash(os.path.join(REPO_DIR, f)) for f in sources},
+        'inputs': {f: file_hash(os.path.join(output_dir, f)) for f in step.inputs},
+        'packages': {p: _package_version(p) for p in step.packages},
+        'params': [list(p) for p in step.params],
+    }
+    blob = json.dumps(deps, sort_keys=True).encode()
+    return hashlib.sha256(blob).hexdigest()
+
+
+def load_state(output_dir=OUTPUT_DIR):
+    path = os.path.join(output_dir, STATUSFIL)
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(state, output_dir=OUTPUT_DIR):
+    os.makedirs(output_dir, exist_ok=True)
+    path = os.path.join(output_dir, STATUSFIL)
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def stale_reason(step, state, output_dir=OUTPUT_DIR):
+    """Orsak till att steget måste byggas om, None om det är aktuellt"""
+    entry = state.get(step.name)
+    if entry is None:
+        return "aldrig byggt"
+    if entry.get('key') != step_key(step, output_dir):
+        return "indata ändrade"
+    for f in step.outputs:
+        current = file_hash(os.path.join(output_dir, f))
+        if current is None:
+            return f"{f} saknas"
+        if current != entry.get('outputs', {}).get(f):
+            return f"{f} ändrad"
+    return None
+
+
+def run_step(step, state, output_dir=OUTPUT_DIR):
+    """Kör steget och registrerar nyckel och utdatahashar i state"""
+    importlib.import_module(step.module).main(output_dir)
+    state[step.name] = {
+        'key': step_key(step, output_dir),
+        'outputs': {f: file_hash(os.path.join(output_dir, f)) for f in step.outputs},
+    }
+    save_state(state, output_dir)
+
+
+def build(steps=BYGGSTEG, output_dir=OUTPUT_DIR, force=False):
+    """
+    Bygger inaktuella steg i ordning
+    Returnerar lista med (namn, orsak) för byggda steg och (namn, None) för aktuella
+    """
+    state = load_state(output_dir)
+    log = []
+    for step in steps:
+        reason = "tvingad" if force else stale_reason(step, state, output_dir)
+        if reason is not None:
+            run_step(step, state, output_dir)
+        log.append((step.name, reason))
+    return log
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inkrementell byggnad av rapportartefakter")
+    parser.add_argument('--force', action='store_true', help="Bygg om alla steg")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    for name, reason in build(force=args.force):
+        print(f"  {name:<10} {'byggt (' + reason + ')' if reason else 'aktuellt'}")
+    print(f"Klart på {time.perf_counter() - t0:.3f} s")
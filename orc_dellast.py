@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+DELLASTKARTA FÖR TESLATURBINEN (OFF-DESIGN)
+calc_system_enhanced räknar bara designpunkten med fast η_turb. Här förberäknas
+en 2-D prestandakarta över värmekällans temperatur och arbetsmediets massflöde,
+där turbinverkningsgraden sjunker från den TesTur-skalade designpunkten.
+Vid drift slås kartan upp med bilinjär interpolation i stället för att
+cykeln löses om.
+
+Turbinverkningsgrad utanför designpunkten (fast varvtal, nätkopplad generator):
+  η_turb = η_d · f_m(φ) · f_v(ν)
+  φ = ṁ / ṁ_d                      massflödeskvot
+  ν = √(Δh_is,d / Δh_is)           hastighetskvot u/c0 relativt designpunkten
+  f_m = 1 - K_MASSFLODE·(1 - φ)²   kanalfyllnad och gränsskikt vid dellast
+  f_v = 2ν - ν²                    parabolisk verkningsgradskurva kring u/c0-optimum
+
+Kartan använder Rankine-modellen (tillståndspunkter), eftersom det isentropa
+entalpifallet Δh_is behövs för hastighetskvoten. I designpunkten ger kartan
+exakt calc_system_core(..., model='rankine').
+"""
+
+import argparse
+import os
+import time
+from functools import lru_cache
+
+import numpy as np
+
+from orc_karna import calc_system_core, calc_system_vectorized
+
+# Designpunkt (som scenario 1 i kalkylatorerna, η enligt TesTur-skalningen)
+T_HOT = 50.0      # °C förångning
+T_COLD = 20.0     # °C kondensering
+P_TARGET = 1.0    # kW
+ETA_TURB = 0.55
+ETA_GEN = 0.93
+ETA_PUMP = 0.65
+
+# Temperaturdifferens värmekälla → förångning [K]
+# (0 = som kalkylatorerna, där T_hot är värmekällans temperatur)
+DT_KALLA = 0.0
+
+# Dellastkorrelation
+K_MASSFLODE = 0.25
+
+# Kartans standardrutnät
+T_KALLA_OMRADE = (25.0, 85.0)   # °C
+T_KALLA_STEG = 1.0              # K
+FLODESKVOT = (0.2, 1.4)         # φ = ṁ/ṁ_d
+FLODESKVOT_PUNKTER = 49
+
+# Värmekällor i rapporten: namn → (T_min, T_max) [°C]
+VARMEKALLOR = {
+    'Värmepump': (30.0, 60.0),
+    'Solfångare': (40.0, 80.0),
+    'Ved/pellets': (60.0, 80.0),
+}
+
+# Fält i kartan: namn → enhet
+KARTFALT = {
+    'eta_turb': '-',
+    'P_el': 'W',
+    'P_pump': 'W',
+    'P_net': 'W',
+    'Q_evap': 'kW',
+    'eta_system': '-',
+}
+
+
+# ============================================================================
+# DESIGNPUNKT OCH EXAKT OFF-DESIGN-BERÄKNING
+# ============================================================================
+
+def design_point(fluid, T_hot=T_HOT, T_cold=T_COLD, P_target_kW=P_TARGET,
+                 eta_turb=ETA_TURB, eta_gen=ETA_GEN, eta_pump=ETA_PUMP,
+                 dT_kalla=DT_KALLA):
+    """Designpunkten som dict (massflöde, isentropt entalpifall m.m.)"""
+    res = calc_system_core(fluid, T_hot, T_cold, P_target_kW, eta_turb, eta_gen,
+                           eta_pump, model='rankine')
+    return {
+        'fluid': fluid,
+        'T_source': T_hot + dT_kalla,
+        'T_hot': T_hot,
+        'T_cold': T_cold,
+        'P_target_kW': P_target_kW,
+        'eta_turb': eta_turb,
+        'eta_gen': eta_gen,
+        'eta_pump': eta_pump,
+        'dT_kalla': dT_kalla,
+        'm_dot': res.m_dot,                  # kg/s
+        'dh_is': res.w_turb / eta_turb,      # kJ/kg
+        'b_disc': res.b_disc,                # mm
+    }
+
+
+def _specific(design, T_source):
+    """Specifika storheter per kg vid värmekällans temperatur (η_turb = 1)"""
+    res = calc_system_vectorized(design['fluid'], np.asarray(T_source) - design['dT_kalla'],
+                                 design['T_cold'], 1.0, 1.0, 1.0, design['eta_pump'],
+                                 backend='coolprop', model='rankine')
+    return {
+        'dh_is': res['w_turb'],                    # kJ/kg
+        'q_in': res['Q_evap'] / res['m_dot'],      # kJ/kg
+        'w_pump': res['P_pump'] / res['m_dot'],    # J/kg
+    }
+
+
+def turbine_efficiency(design, phi, dh_is):
+    """η_turb enligt dellastkorrelationen (NaN där den blir ≤ 0)"""
+    with np.errstate(invalid='ignore'):
+        nu = np.sqrt(design['dh_is'] / dh_is)
+        eta = design['eta_turb'] * (1 - K_MASSFLODE * (1 - phi)**2) * (2*nu - nu**2)
+    return np.where(eta > 0, eta, np.nan)
+
+
+def off_design(design, T_source, m_dot):
+    """
+    Exakt off-design-beräkning (löser cykeln) för arrayer av T_source [°C]
+    och m_dot [kg/s]; returnerar dict med arrayer enligt KARTFALT
+    """
+    T_source, m_dot = np.broadcast_arrays(np.asarray(T_source, dtype=float),
+                                          np.asarray(m_dot, dtype=float))
+    T_unique, inverse = np.unique(T_source, return_inverse=True)
+    spec = {key: values[inverse.reshape(T_source.shape)]
+            for key, values in _specific(design, T_unique).items()}
+    return _performance(design, m_dot, spec)
+
+
+def _performance(design, m_dot, spec):
+    eta_turb = turbine_efficiency(design, m_dot / design['m_dot'], spec['dh_is'])
+    with np.errstate(invalid='ignore'):
+        P_el = m_dot * eta_turb * spec['dh_is'] * design['eta_gen'] * 1000  # W
+        P_pump = m_dot * spec['w_pump']                                      # W
+        P_net = P_el - P_pump
+        Q_evap = m_dot * spec['q_in']                                        # kW
+        eta_system = P_net / (Q_evap * 1000)
+    return {'eta_turb': eta_turb, 'P_el': P_el, 'P_pump': P_pump, 'P_net': P_net,
+            'Q_evap': Q_evap, 'eta_system': eta_system}
+
+
+# ============================================================================
+# DELLASTKARTA
+# ============================================================================
+
+class DellastKarta:
+    """
+    Prestandakarta på rutnätet T_source × m_dot
+    fields: dict namn → array (n_T, n_m) enligt KARTFALT
+    """
+
+    def __init__(self, design, T_source, m_dot, fields):
+        self.design = dict(design)
+        self.T_source = np.asarray(T_source, dtype=float)   # stigande, °C
+        self.m_dot = np.asarray(m_dot, dtype=float)         # stigande, kg/s
+        self.fields = {key: np.asarray(values, dtype=float)
+                       for key, values in fields.items()}
+
+    @property
+    def shape(self):
+        return (len(self.T_source), len(self.m_dot))
+
+    def _cells(self, T_source, m_dot):
+        """Cellindex och vikter för bilinjär interpolation, samt mask utanför kartan"""
+        T, m = np.broadcast_arrays(np.asarray(T_source, dtype=float),
+                                   np.asarray(m_dot, dtype=float))
+        xs, ys = self.T_source, self.m_dot
+        i = np.clip(np.searchsorted(xs, T, side='right') - 1, 0, len(xs) - 2)
+        j = np.clip(np.searchsorted(ys, m, side='right') - 1, 0, len(ys) - 2)
+        tx = (T - xs[i]) / (xs[i + 1] - xs[i])
+        ty = (m - ys[j]) / (ys[j + 1] - ys[j])
+        outside = (T < xs[0]) | (T > xs[-1]) | (m < ys[0]) | (m > ys[-1])
+        return i, j, tx, ty, outside
+
+    def lookup(self, T_source, m_dot, field='P_net'):
+        """Bilinjär uppslagning av ett fält (NaN utanför kartan)"""
+        return self.evaluate(T_source, m_dot, (field,))[field]
+
+    def evaluate(self, T_source, m_dot, fields=None):
+        """Bilinjär uppslagning av flera fält: dict namn → array"""
+        i, j, tx, ty, outside = self._cells(T_source, m_dot)
+        w00 = (1 - tx) * (1 - ty)
+        w10 = tx * (1 - ty)
+        w01 = (1 - tx) * ty
+        w11 = tx * ty
+        out = {}
+        for key in fields or self.fields:
+            grid = self.fields[key]
+            values = (grid[i, j] * w00 + grid[i + 1, j] * w10
+                      + grid[i, j + 1] * w01 + grid[i + 1, j + 1] * w11)
+            out[key] = np.where(outside, np.nan, values)
+        return out
+
+    def save(self, path):
+        """Spara kartan som .npz"""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        design = {key: np.asarray(value) for key, value in self.design.items()}
+        np.savez_compressed(path, T_source=self.T_source, m_dot=self.m_dot,
+                            **{f'field_{k}': v for k, v in self.fields.items()},
+                            **{f'design_{k}': v for k, v in design.items()})
+        return path
+
+    @classmethod
+    def load(cls, path):
+        """Läs in en sparad karta"""
+        with np.load(path) as data:
+            design = {key[len('design_'):]: data[key].item()
+                      for key in data.files if key.startswith('design_')}
+            fields = {key[len('field_'):]: data[key]
+                      for key in data.files if key.startswith('field_')}
+            return cls(design, data['T_source'], data['m_dot'], fields)
+
+
+def build_map(fluid, T_source=None, phi=None, **design_kwargs):
+    """
+    Beräknar dellastkartan för mediet
+    T_source: värmekällans temperaturer [°C], phi: massflödeskvoter ṁ/ṁ_d
+    design_kwargs: designpunkt enligt design_point
+    """
+    design = design_point(fluid, **design_kwargs)
+    if T_source is None:
+        T_source = np.arange(T_KALLA_OMRADE[0], T_KALLA_OMRADE[1] + T_KALLA_STEG / 2,
+                             T_KALLA_STEG)
+    if phi is None:
+        phi = np.linspace(*FLODESKVOT, FLODESKVOT_PUNKTER)
+    T_source = np.asarray(T_source, dtype=float)
+    m_dot = np.asarray(phi, dtype=float) * design['m_dot']
+
+    # Cykeln löses en gång per temperatur; massflödet skalar bara resultatet
+    spec = {key: values[:, None] for key, values in _specific(design, T_source).items()}
+    fields = _performance(design, m_dot[None, :], spec)
+    return DellastKarta(design, T_source, m_dot, fields)
+
+
+@lru_cache(maxsize=32)
+def get_map(fluid, T_hot=T_HOT, T_cold=T_COLD, P_target_kW=P_TARGET,
+            eta_turb=ETA_TURB, eta_gen=ETA_GEN, eta_pump=ETA_PUMP, dT_kalla=DT_KALLA):
+    """Cachad dellastkarta (standardrutnät) per medium och designpunkt"""
+    return build_map(fluid, T_hot=T_hot, T_cold=T_cold, P_target_kW=P_target_kW,
+                     eta_turb=eta_turb, eta_gen=eta_gen, eta_pump=eta_pump,
+                     dT_kalla=dT_kalla)
+
+
+def part_load(fluid, T_source, m_dot, field='P_net', **design_kwargs):
+    """Uppslagning i den cachade kartan, t.ex. part_load('R1233zd(E)', 65, 0.03)"""
+    return get_map(fluid, **design_kwargs).lookup(T_source, m_dot, field)
+
+
+def max_interp_error(karta):
+    """
+    Max interpolationsfel i cellmittpunkterna mot exakt off-design-beräkning,
+    relativt fältets värde i designpunkten
+    """
+    T_mid = 0.5 * (karta.T_source[1:] + karta.T_source[:-1])
+    m_mid = 0.5 * (karta.m_dot[1:] + karta.m_dot[:-1])
+    T, m = np.meshgrid(T_mid, m_mid, indexing='ij')
+    exact = off_design(karta.design, T, m)
+    approx = karta.evaluate(T, m)
+    design = off_design(karta.design, karta.design['T_source'], karta.design['m_dot'])
+    return {key: float(np.nanmax(np.abs(approx[key] - exact[key])) / abs(design[key]))
+            for key in KARTFALT}
+
+
+# ============================================================================
+# UTSKRIFT
+# ============================================================================
+
+def print_map(karta, T_values=range(30, 85, 5), phi_values=(0.4, 0.6, 0.8, 1.0, 1.2)):
+    design = karta.design
+    m_values = np.asarray(phi_values) * design['m_dot']
+    T_grid, m_grid = np.meshgrid(np.asarray(T_values, dtype=float), m_values,
+                                 indexing='ij')
+    values = karta.evaluate(T_grid, m_grid, ('P_net', 'eta_turb'))
+
+    print("\n" + "="*78)
+    print(f"DELLASTKARTA: {design['fluid']} (design {design['T_hot']:.0f}°C → "
+          f"{design['T_cold']:.0f}°C, {design['P_target_kW']:.1f} kW)")
+    print("="*78)
+    print(f"ṁ_d = {design['m_dot']*1000:.1f} g/s, Δh_is,d = {design['dh_is']:.2f} kJ/kg, "
+          f"η_turb,d = {design['eta_turb']:.2f}, b_disc = {design['b_disc']:.3f} mm")
+    print(f"\nNettoeffekt [W] (η_turb) vid massflödeskvot φ = ṁ/ṁ_d")
+    print(f"{'T_källa':>8}" + "".join(f"{f'φ={phi:.1f}':>14}" for phi in phi_values))
+    print("-"*78)
+    for k, T in enumerate(T_values):
+        print(f"{T:>6.0f}°C" + "".join(
+            f"{values['P_net'][k, n]:>8.0f} ({values['eta_turb'][k, n]:.2f})"
+            for n in range(len(phi_values))))
+
+    print(f"\nVärmekällor vid designmassflöde:")
+    for name, (T_min, T_max) in VARMEKALLOR.items():
+        res = karta.evaluate([T_min, T_max], design['m_dot'])
+        print(f"  {name:<12} {T_min:.0f}-{T_max:.0f}°C: "
+              f"P_net {res['P_net'][0]:.0f}-{res['P_net'][1]:.0f} W, "
+              f"η_sys {res['eta_system'][0]*100:.2f}-{res['eta_system'][1]*100:.2f}%")
+    print("="*78 + "\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Dellastkarta för Teslaturbinen")
+    parser.add_argument('--fluid', default='R1233zd(E)')
+    parser.add_argument('--T-hot', type=float, default=T_HOT, help="Design T_hot [°C]")
+    parser.add_argument('--T-cold', type=float, default=T_COLD, help="T_cold [°C]")
+    parser.add_argument('--power', type=float, default=P_TARGET, help="Design P [kW]")
+    parser.add_argument('--save', default=None, help="Spara kartan som .npz")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    karta = build_map(args.fluid, T_hot=args.T_hot, T_cold=args.T_cold,
+                      P_target_kW=args.power)
+    t_build = time.perf_counter() - t0
+    print_map(karta)
+
+    errors = max_interp_error(karta)
+    print(f"Rutnät {karta.shape[0]}×{karta.shape[1]} byggt på {t_build:.2f} s, "
+          f"max interpolationsfel (rel. design): "
+          + ", ".join(f"{key} {err:.1e}" for key, err in errors.items()))
+
+    # Uppslagning jämfört med att lösa om cykeln
+    rng = np.random.default_rng(0)
+    T = rng.uniform(30, 80, 10_000)
+    m = rng.uniform(0.4, 1.2, 10_000) * karta.design['m_dot']
+    t0 = time.perf_counter()
+    karta.lookup(T, m)
+    t_lookup = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    off_design(karta.design, np.round(T, 1), m)
+    t_solve = time.perf_counter() - t0
+    print(f"10 000 driftpunkter: uppslagning {t_lookup*1000:.2f} ms, "
+          f"omlösning {t_solve*1000:.0f} ms")
+    if args.save:
+        print(f"Karta sparad: {karta.save(args.save)}")
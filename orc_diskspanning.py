@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+SPÄNNINGAR I ROTERANDE DISKAR OCH BRUSTMARGINAL
+Analytisk lösning för en roterande ringskiva med konstant tjocklek och fria
+kanter (plant spänningstillstånd), a = innerradie (navhål/utlopp),
+b = ytterradie, ω = vinkelhastighet:
+
+  σ_θ(a)   = (3+ν)/4 · ρω² · [b² + (1-ν)/(3+ν) · a²]    tangentialspänning vid navhålet
+  σ_θ(b)   = (3+ν)/4 · ρω² · [a² + (1-ν)/(3+ν) · b²]    tangentialspänning vid periferin
+  σ_r,max  = (3+ν)/8 · ρω² · (b - a)²                  radialspänning vid r = √(ab)
+
+σ_θ(a) är störst och σ_r = 0 vid hålkanten, så σ_θ(a) är också
+jämförelsespänningen (von Mises/Tresca). Spänningarna är oberoende av
+tjockleken; den ger diskens massa och rörelseenergi.
+
+Brustvarvtal: medeltangentialspänningen ρω²(a² + ab + b²)/3 når brottgränsen.
+
+Kontroll vid överfart (OVERVARV × driftvarvtal): säkerhetsfaktor mot
+sträckgränsen ≥ SF_STRACK och brustvarvtal ≥ BRUST_MIN × överfartsvarvtalet.
+Allt är vektoriserat över varvtal och geometri, så varje rotorkandidat i ett
+svep kan sållas innan den går vidare till CAD/FEM.
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from orc_gransskikt import RADIEKVOT
+from orc_rotor import D_REF, RPM_REF, TJOCKLEK_REF
+
+# Material: densitet [kg/m³], tvärkontraktionstal, sträck- och brottgräns [MPa]
+MATERIAL = {
+    '316L': {'rho': 8000.0, 'nu': 0.3, 'yield': 170.0, 'uts': 485.0},
+}
+STANDARDMATERIAL = '316L'
+
+# Överfartsprov och krav
+OVERVARV = 1.2      # överfartsvarvtal / driftvarvtal
+SF_STRACK = 1.5     # minsta säkerhetsfaktor mot sträckgräns vid överfart
+BRUST_MIN = 1.4     # minsta brustvarvtal / överfartsvarvtal
+
+# Kolumner från disc_stress: namn → enhet
+SPANNINGSKOLUMNER = {
+    'sigma_theta_bore': 'MPa', 'sigma_theta_rim': 'MPa', 'sigma_r_max': 'MPa',
+    'sigma_max': 'MPa', 'SF_yield': '-', 'SF_overspeed': '-', 'rpm_yield': 'rpm',
+    'rpm_burst': 'rpm', 'burst_margin': '-', 'm_disc': 'kg', 'E_disc': 'J',
+    'overspeed_ok': '-',
+}
+
+
+def disc_stress(D=D_REF, rpm=RPM_REF, t_disc=TJOCKLEK_REF, d_bore=None,
+                material=STANDARDMATERIAL):
+    """
+    Spänningar och marginaler för en roterande ringskiva
+    D, d_bore, t_disc [mm] (d_bore None = RADIEKVOT · D), rpm.
+    Alla argument broadcastas. Returnerar dict enligt SPANNINGSKOLUMNER.
+    """
+    props = MATERIAL[material]
+    rho, nu = props['rho'], props['nu']
+    D, rpm, t_disc = np.broadcast_arrays(*(np.asarray(x, dtype=float)
+                                           for x in (D, rpm, t_disc)))
+    d_bore = RADIEKVOT * D if d_bore is None else np.broadcast_to(
+        np.asarray(d_bore, dtype=float), D.shape)
+
+    a = d_bore / 2000                                # m
+    b = D / 2000                                     # m
+    omega = 2 * np.pi * rpm / 60
+    load = rho * omega**2 / 1e6                      # MPa/m²
+
+    sigma_theta_bore = (3 + nu) / 4 * load * (b**2 + (1 - nu) / (3 + nu) * a**2)
+    sigma_theta_rim = (3 + nu) / 4 * load * (a**2 + (1 - nu) / (3 + nu) * b**2)
+    sigma_r_max = (3 + nu) / 8 * load * (b - a)**2
+    sigma_max = np.maximum(sigma_theta_bore, sigma_r_max)
+
+    # Spänningarna växer med ω², så gränsvarvtalen skalas med roten ur kvoten
+    with np.errstate(divide='ignore'):
+        SF_yield = props['yield'] / sigma_max
+        rpm_yield = rpm * np.sqrt(SF_yield)
+    omega_burst = np.sqrt(3 * props['uts'] * 1e6 / (rho * (a**2 + a * b + b**2)))
+    rpm_burst = omega_burst * 60 / (2 * np.pi)
+
+    mass = rho * np.pi * (b**2 - a**2) * t_disc / 1000
+    energy = 0.25 * mass * (a**2 + b**2) * omega**2  # ½·Iω², I = ½m(a² + b²)
+
+    SF_overspeed = SF_yield / OVERVARV**2
+    with np.errstate(divide='ignore', invalid='ignore'):
+        burst_margin = rpm_burst / rpm
+    return {
+        'sigma_theta_bore': sigma_theta_bore, 'sigma_theta_rim': sigma_theta_rim,
+        'sigma_r_max': sigma_r_max, 'sigma_max': sigma_max,
+        'SF_yield': SF_yield, 'SF_overspeed': SF_overspeed,
+        'rpm_yield': rpm_yield, 'rpm_burst': rpm_burst, 'burst_margin': burst_margin,
+        'm_disc': mass, 'E_disc': energy,
+        'overspeed_ok': (SF_overspeed >= SF_STRACK) & (burst_margin >= BRUST_MIN * OVERVARV),
+    }
+
+
+def max_rpm(D=D_REF, d_bore=None, material=STANDARDMATERIAL):
+    """Högsta driftvarvtal som klarar överfartskraven (samma broadcasting som disc_stress)"""
+    limits = disc_stress(D, 1.0, TJOCKLEK_REF, d_bore, material)
+    return np.minimum(limits['rpm_yield'] / (OVERVARV * np.sqrt(SF_STRACK)),
+                      limits['rpm_burst'] / (BRUST_MIN * OVERVARV))
+
+
+def print_stress(stress, D, rpm, t_disc, n_discs=None):
+    stress = {key: float(value) for key, value in stress.items()}
+    print(f"\n--- Disk {D:.0f} mm × {t_disc:.3f} mm vid {rpm:.0f} rpm "
+          f"({STANDARDMATERIAL}) ---")
+    print(f"σ_θ vid navhålet:    {stress['sigma_theta_bore']:>8.1f} MPa")
+    print(f"σ_θ vid periferin:   {stress['sigma_theta_rim']:>8.1f} MPa")
+    print(f"σ_r max:             {stress['sigma_r_max']:>8.1f} MPa")
+    print(f"SF mot sträckgräns:  {stress['SF_yield']:>8.2f} "
+          f"(vid {OVERVARV:.0%} överfart {stress['SF_overspeed']:.2f}, krav {SF_STRACK})")
+    print(f"Sträckgräns nås vid: {stress['rpm_yield']:>8.0f} rpm")
+    print(f"Brustvarvtal:        {stress['rpm_burst']:>8.0f} rpm "
+          f"({stress['burst_margin']:.2f} × drift, krav {BRUST_MIN * OVERVARV:.2f})")
+    energy = f"{stress['E_disc']:.1f} J per disk"
+    if n_discs:
+        energy += f", {stress['E_disc'] * n_discs / 1000:.1f} kJ för {n_discs} diskar"
+    print(f"Massa/rörelseenergi: {stress['m_disc'] * 1000:>8.1f} g, {energy}")
+    print("Överfartsprov:       " + ("OK" if stress['overspeed_ok'] else "[!] UNDERKÄND"))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Spänningar i Teslaturbinens diskar")
+    parser.add_argument('--diameter', type=float, default=D_REF, help="Diskdiameter [mm]")
+    parser.add_argument('--rpm', type=float, default=RPM_REF)
+    parser.add_argument('--thickness', type=float, default=TJOCKLEK_REF, help="Disktjocklek [mm]")
+    parser.add_argument('--bore', type=float, default=None,
+                        help=f"Navhålets diameter [mm] (standard {RADIEKVOT} × D)")
+    parser.add_argument('--discs', type=int, default=75, help="Antal diskar (för rörelseenergin)")
+    args = parser.parse_args()
+
+    print_stress(disc_stress(args.diameter, args.rpm, args.thickness, args.bore),
+                 args.diameter, args.rpm, args.thickness, args.discs)
+
+    # Högsta tillåtna driftvarvtal per diameter
+    diameters = np.arange(100.0, 410.0, 50.0)
+    limits = max_rpm(diameters, None if args.bore is None else args.bore)
+    print(f"\nHögsta driftvarvtal som klarar överfartsprovet ({STANDARDMATERIAL}):")
+    for D, n in zip(diameters, limits):
+        print(f"  D = {D:>4.0f} mm: {n:>7.0f} rpm (periferihastighet "
+              f"{np.pi * D / 1000 * n / 60:.0f} m/s)")
+
+    # Sållning av ett rutnät (samma storlek som i orc_rotor)
+    D, rpm = (x.ravel() for x in np.meshgrid(np.arange(100.0, 310.0, 1.0),
+                                              np.arange(3000.0, 60000.0, 10.0)))
+    t0 = time.perf_counter()
+    ok = disc_stress(D, rpm)['overspeed_ok']
+    elapsed = time.perf_counter() - t0
+    print(f"\n{len(D):,} geometri/varvtal-kombinationer sållade på {elapsed * 1000:.0f} ms "
+          f"({ok.sum():,} godkända)\n")
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Gemensam egenskapsmodul för ORC-beräkningarna
+Memoiserar saturerade CoolProp-egenskaper per (medium, temperatur, ångkvalitet)
+och erbjuder batch-utvärdering av hela temperaturvektorer
+
+CoolProp importeras först vid första egenskapsanropet (importen tar ~1 s),
+så att moduler som bara behöver t.ex. calc_disc_spacing startar snabbt.
+Under LRU-cachen ligger en persistent diskcache (orc_egenskapscache) som
+delas mellan körningar och processer.
+"""
+
+import sys
+from functools import lru_cache
+
+import numpy as np
+
+from orc_instrumentering import instrument_state, props_si
+
+# Max antal saturerade tillstånd som hålls i minnet (LRU)
+CACHE_STORLEK = 8192
+
+# Egenskaper som hämtas per saturerat tillstånd (CoolProp-nycklar, SI-enheter)
+#   P [Pa], D [kg/m³], H [J/kg], S [J/kg·K], V [Pa·s]
+# V läses bara för ånga (Q=1); NaN för vätska och för medier utan viskositetsmodell
+SAT_EGENSKAPER = ('P', 'D', 'H', 'S', 'V')
+
+# Egenskaper som returneras av get_saturation_batch (SI-enheter)
+#   p [Pa], rho [kg/m³], h [J/kg], s [J/kg·K], mu [Pa·s]; _l = vätska, _v = ånga
+BATCH_EGENSKAPER = ('p', 'rho_l', 'rho_v', 'h_l', 'h_v', 's_l', 's_v', 'mu_v')
+
+# En återanvänd AbstractState per medium (slipper tolka mediesträngen per anrop)
+_abstract_states = {}
+
+# Räknare för get_saturation_batch, som inte går via LRU-cachen:
+# träff = temperatur från diskcachen eller redan beräknad i samma anrop
+_batch_stats = {'hits': 0, 'misses': 0}
+
+
+def get_abstract_state(fluid):
+    """Återanvänd CoolProp AbstractState (HEOS) för mediet"""
+    state = _abstract_states.get(fluid)
+    if state is None:
+        import CoolProp
+        state = instrument_state(CoolProp.AbstractState('HEOS', fluid), fluid)
+        _abstract_states[fluid] = state
+    return state
+
+
+# ============================================================================
+# ENSKILDA TILLSTÅND (LRU-CACHE)
+# ============================================================================
+
+def disk_cache():
+    """Persistent egenskapscache för processen (None om avstängd)"""
+    from orc_egenskapscache import get_cache
+    return get_cache()
+
+
+def _viscosity(state):
+    """Viskositet [Pa·s] för tillståndet, NaN om mediet saknar viskositetsmodell"""
+    try:
+        return state.viscosity()
+    except ValueError:
+        return np.nan
+
+
+@lru_cache(maxsize=CACHE_STORLEK)
+def _sat_state(fluid, T_K, Q):
+    disk = disk_cache()
+    if disk is not None:
+        values = disk.get(fluid, 'sat', T_K, Q)
+        if values is not None:
+            return values
+
+    from CoolProp import QT_INPUTS
+    state = get_abstract_state(fluid)
+    state.update(QT_INPUTS, Q, T_K)
+    values = (state.p(), state.rhomass(), state.hmass(), state.smass(),
+              _viscosity(state) if Q == 1 else np.nan)
+    if disk is not None:
+        disk.put(fluid, 'sat', T_K, Q, values)
+    return values
+
+
+@lru_cache(maxsize=256)
+def _critical(fluid):
+    disk = disk_cache()
+    if disk is not None:
+        values = disk.get(fluid, 'crit', 0, 0)
+        if values is not None:
+            return values
+
+    values = (props_si('Tcrit', fluid), props_si('pcrit', fluid))
+    if disk is not None:
+        disk.put(fluid, 'crit', 0, 0, values)
+    return values
+
+
+def get_sat_state(fluid, T_K, Q):
+    """
+    Saturerat tillstånd vid temperatur T_K [K] och ångkvalitet Q (0 = vätska, 1 = ånga)
+    Returnerar dict med SI-värden enligt SAT_EGENSKAPER
+    """
+    # Avrundning så att 50 + 273.15 och 323.15 träffar samma cachepost
+    values = _sat_state(fluid, round(float(T_K), 9), int(Q))
+    return dict(zip(SAT_EGENSKAPER, values))
+
+
+def get_critical(fluid):
+    """Kritisk temperatur [K] och kritiskt tryck [Pa]"""
+    return _critical(fluid)
+
+
+@lru_cache(maxsize=1)
+def coolprop_version():
+    """Installerad CoolProp-version (från paketmetadata om CoolProp inte redan är importerad)"""
+    module = sys.modules.get('CoolProp')
+    if module is not None:
+        return module.__version__
+    from importlib.metadata import version
+    return version('CoolProp')
+
+
+# ============================================================================
+# BATCH-UTVÄRDERING
+# ============================================================================
+
+def get_saturation_batch(fluid, T_K):
+    """
+    Saturerade egenskaper för en hel temperaturvektor T_K [K]
+
+    Returnerar dict med NumPy-arrayer (samma form som T_K) enligt BATCH_EGENSKAPER.
+    Punkter där CoolProp inte konvergerar (t.ex. över kritisk punkt) blir NaN.
+    Temperaturer som finns i diskcachen hämtas därifrån; nya skrivs i en transaktion.
+    """
+    T = np.asarray(T_K, dtype=float)
+    out = {key: np.full(T.shape, np.nan) for key in BATCH_EGENSKAPER}
+
+    disk = disk_cache()
+    finite = [float(t) for t in T.ravel() if np.isfinite(t)]
+    cached = disk.get_many(fluid, 'batch', finite, 0) if disk is not None else {}
+    computed = {}
+
+    for i, T_i in np.ndenumerate(T):
+        key = float(T_i)
+        values = cached.get(key) or computed.get(key)
+        if values is None:
+            values = _batch_state(fluid, key)
+            _batch_stats['misses'] += 1
+            if np.isfinite(key):
+                computed[key] = values
+        else:
+            _batch_stats['hits'] += 1
+        for name, value in zip(BATCH_EGENSKAPER, values):
+            out[name][i] = value
+
+    if disk is not None and computed:
+        disk.put_many(fluid, 'batch', computed.items(), 0)
+    return out
+
+
+def _batch_state(fluid, T_K):
+    """Ett batch-tillstånd (vätska och ånga vid T_K) som tuple enligt BATCH_EGENSKAPER"""
+    from CoolProp import QT_INPUTS
+    state = get_abstract_state(fluid)
+    try:
+        # Vätskesidan (Q=0)
+        state.update(QT_INPUTS, 0, T_K)
+        p, rho_l, h_l, s_l = state.p(), state.rhomass(), state.hmass(), state.smass()
+
+        # Ångsidan (Q=1)
+        state.update(QT_INPUTS, 1, T_K)
+        return (p, rho_l, state.rhomass(), h_l, state.hmass(), s_l, state.smass(),
+                _viscosity(state))
+    except ValueError:
+        return (np.nan,) * len(BATCH_EGENSKAPER)
+
+
+# ============================================================================
+# CACHESTATISTIK
+# ============================================================================
+
+def cache_info():
+    """Träffar, missar och storlek för egenskapscachen (och batch-anropens träffar/missar)"""
+    info = _sat_state.cache_info()
+    total = info.hits + info.misses
+    return {
+        'hits': info.hits,
+        'misses': info.misses,
+        'size': info.currsize,
+        'maxsize': info.maxsize,
+        'hit_rate': info.hits / total if total else 0.0,
+        'batch_hits': _batch_stats['hits'],
+        'batch_misses': _batch_stats['misses'],
+    }
+
+
+def cache_clear():
+    """Tömmer egenskapscachen (och nollställer räknarna)"""
+    _sat_state.cache_clear()
+    _critical.cache_clear()
+    _batch_stats.update(hits=0, misses=0)
+
+
+def print_cache_info():
+    """Skriv ut cachestatistik"""
+    info = cache_info()
+    batch_total = info['batch_hits'] + info['batch_misses']
+    if info['hits'] + info['misses'] or not batch_total:
+        print(f"Egenskapscache: {info['hits']} träffar, {info['misses']} missar "
+              f"({info['hit_rate']:.0%} träffgrad, {info['size']}/{info['maxsize']} tillstånd)")
+    if batch_total:
+        print(f"Batchanrop:     {info['batch_hits']} träffar, {info['batch_misses']} "
+              f"beräknade ({info['batch_hits'] / batch_total:.0%} träffgrad)")
+    disk = disk_cache()
+    if disk is not None and disk.hits + disk.misses:
+        disk.flush()
+        stats = disk.stats()
+        print(f"Diskcache:      {stats['hits']} träffar, {stats['misses']} missar "
+              f"({stats['hit_rate']:.0%} träffgrad, {stats['writes']} nya tillstånd)")
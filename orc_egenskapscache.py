@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+PERSISTENT EGENSKAPSCACHE (SQLITE)
+Andra nivån under LRU-cachen i orc_egenskaper: beräknade CoolProp-tillstånd
+sparas på disk per (CoolProp-version, medium, tillståndstyp, indata) och
+återanvänds mellan körningar. WAL-läge gör att flera processer (t.ex. en
+processpool) kan läsa och skriva samtidigt, och cachen töms automatiskt när
+CoolProp-versionen ändras.
+
+Styrs med miljövariabeln ORC_EGENSKAPSCACHE:
+  ej satt      → CACHE_FIL i användarens cachemapp
+                 ($XDG_CACHE_HOME eller ~/.cache, orc_malung/egenskapscache.sqlite),
+                 aldrig i källträdet
+  sökväg       → egen cachefil
+  0 / off / av → avstängd
+"""
+
+import argparse
+import atexit
+import os
+import sqlite3
+from array import array
+
+from orc_egenskaper import coolprop_version
+
+CACHE_FIL = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'),
+                         'orc_malung', 'egenskapscache.sqlite')
+MILJOVARIABEL = 'ORC_EGENSKAPSCACHE'
+AVSTANGD = ('0', 'off', 'av', 'false', 'no', 'nej')
+
+# Antal enskilda tillstånd som buffras innan de skrivs i en transaktion
+SKRIVBUFFERT = 256
+
+# Max antal parametrar per IN-fråga (SQLite-gränsen är 999 i äldre versioner)
+_IN_GRANS = 900
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS tillstand (
+    version TEXT NOT NULL,
+    fluid   TEXT NOT NULL,
+    kind    TEXT NOT NULL,
+    x2      REAL NOT NULL,
+    x1      REAL NOT NULL,
+    data    BLOB NOT NULL,
+    PRIMARY KEY (version, fluid, kind, x2, x1)
+) WITHOUT ROWID;
+"""
+
+
+def _pack(values):
+    return array('d', values).tobytes()
+
+
+def _unpack(blob):
+    values = array('d')
+    values.frombytes(blob)
+    return tuple(values)
+
+
+class EgenskapsCache:
+    """
+    SQLite-cache för tillstånd: (medium, typ, x1, x2) → tuple av flyttal
+    typ anger vilka indata x1, x2 är och vilka egenskaper som lagras
+    (t.ex. 'sat' = (T, Q) → SAT_EGENSKAPER).
+    """
+
+    def __init__(self, path=CACHE_FIL, version=None):
+        self.path = path
+        self.version = version or coolprop_version()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self._pending = []
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=60, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._invalidate_old_versions()
+
+    def _invalidate_old_versions(self):
+        """Tömmer cachen om den skapades med en annan CoolProp-version"""
+        conn = self._conn
+        query = "SELECT value FROM meta WHERE key = 'coolprop_version'"
+        row = conn.execute(query).fetchone()
+        if row is not None and row[0] == self.version:
+            return
+
+        # Skrivlås och ny kontroll (en annan process kan just ha tömt cachen)
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(query).fetchone()
+            if row is None or row[0] != self.version:
+                conn.execute("DELETE FROM tillstand WHERE version != ?", (self.version,))
+                conn.execute("INSERT OR REPLACE INTO meta VALUES ('coolprop_version', ?)",
+                             (self.version,))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    # ------------------------------------------------------------------------
+    # Läsning
+    # ------------------------------------------------------------------------
+
+    def get(self, fluid, kind, x1, x2):
+        """Ett tillstånd, None om det inte finns i cachen"""
+        try:
+            row = self._conn.execute(
+                "SELECT data FROM tillstand WHERE version = ? AND fluid = ? "
+                "AND kind = ? AND x2 = ? AND x1 = ?",
+                (self.version, fluid, kind, x2, x1)).fetchone()
+        except sqlite3.Error:
+            row = None
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return _unpack(row[0])
+
+    def get_many(self, fluid, kind, x1_values, x2):
+        """Alla cachade tillstånd för x1_values vid fast x2: dict x1 → tuple"""
+        keys = sorted(set(x1_values))
+        found = {}
+        try:
+            for start in range(0, len(keys), _IN_GRANS):
+                chunk = keys[start:start + _IN_GRANS]
+                marks = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    "SELECT x1, data FROM tillstand WHERE version = ? AND fluid = ? "
+                    f"AND kind = ? AND x2 = ? AND x1 IN ({marks})",
+                    (self.version, fluid, kind, x2, *chunk))
+                for x1, blob in rows:
+                    found[x1] = _unpack(blob)
+        except sqlite3.Error:
+            pass
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    # ------------------------------------------------------------------------
+    # Skrivning
+    # ------------------------------------------------------------------------
+
+    def put(self, fluid, kind, x1, x2, values):
+        """Buffrar ett tillstånd (skrivs vid SKRIVBUFFERT poster eller flush)"""
+        self._pending.append((self.version, fluid, kind, x2, x1, _pack(values)))
+        if len(self._pending) >= SKRIVBUFFERT:
+            self.flush()
+
+    def put_many(self, fluid, kind, rows, x2):
+        """Skriver (x1, values)-par vid fast x2 i en transaktion"""
+        self._pending.extend((self.version, fluid, kind, x2, x1, _pack(values))
+                             for x1, values in rows)
+        self.flush()
+
+    def flush(self):
+        """Skriver buffrade tillstånd; befintliga poster lämnas orörda"""
+        if not self._pending:
+            return
+        rows, self._pending = self._pending, []
+        conn = self._conn
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany("INSERT OR IGNORE INTO tillstand VALUES (?, ?, ?, ?, ?, ?)", rows)
+            conn.execute("COMMIT")
+            self.writes += len(rows)
+        except sqlite3.Error:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+
+    # ------------------------------------------------------------------------
+    # Underhåll
+    # ------------------------------------------------------------------------
+
+    def clear(self):
+        """Tar bort alla tillstånd i cachefilen"""
+        self._pending = []
+        self._conn.execute("DELETE FROM tillstand")
+
+    def size(self):
+        return self._conn.execute("SELECT COUNT(*) FROM tillstand").fetchone()[0]
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'path': self.path,
+            'hits': self.hits,
+            'misses': self.misses,
+            'writes': self.writes,
+            'hit_rate': self.hits / total if total else 0.0,
+        }
+
+    def close(self):
+        self.flush()
+        self._conn.close()
+
+
+# ============================================================================
+# PROCESSGLOBAL CACHE
+# ============================================================================
+
+# En anslutning per process (SQLite-anslutningar får inte delas över fork)
+_cache = None
+_cache_pid = None
+_cache_path = None
+
+
+def cache_path():
+    """Cachefilen enligt ORC_EGENSKAPSCACHE, None om cachen är avstängd"""
+    value = os.environ.get(MILJOVARIABEL, '').strip()
+    if value.lower() in AVSTANGD:
+        return None
+    return value or CACHE_FIL
+
+
+def get_cache():
+    """Processens EgenskapsCache, None om den är avstängd eller inte kan öppnas"""
+    global _cache, _cache_pid, _cache_path
+    path = cache_path()
+    if _cache_pid == os.getpid() and _cache_path == path:
+        return _cache
+
+    _cache_pid, _cache_path = os.getpid(), path
+    _cache = None
+    if path is not None:
+        try:
+            _cache = EgenskapsCache(path)
+        except sqlite3.Error as e:
+            print(f"Egenskapscache avstängd ({path}): {e}")
+    return _cache
+
+
+def flush():
+    """Skriver processens buffrade tillstånd (anropas även vid avslut)"""
+    if _cache is not None and _cache_pid == os.getpid():
+        _cache.flush()
+
+
+atexit.register(flush)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Persistent egenskapscache")
+    parser.add_argument('--clear', action='store_true', help="Töm cachefilen")
+    args = parser.parse_args()
+
+    cache = get_cache()
+    if cache is None:
+        print(f"Egenskapscachen är avstängd ({MILJOVARIABEL})")
+    else:
+        if args.clear:
+            cache.clear()
+        print(f"{cache.path}: {cache.size()} tillstånd (CoolProp {cache.version})")
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Tabellerade saturationsegenskaper för snabba designsvep
+Monotona kubiska splines (PCHIP) från trippelpunkt till kritisk punkt,
+sparade på disk och med kontrollerat maximalt relativfel mot CoolProp
+"""
+
+import math
+import os
+import time
+from bisect import bisect_right
+
+import numpy as np
+
+from orc_egenskaper import BATCH_EGENSKAPER, get_saturation_batch
+from orc_egenskaper import coolprop_version as installed_coolprop_version
+from orc_instrumentering import props_si
+
+# Medier som tabelleras som standard
+TABELL_MEDIER = ('R245fa', 'R1233zd(E)')
+
+# Standardkatalog för sparade tabeller
+TABELL_KATALOG = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                              'egenskapstabeller')
+
+# Egenskaper som interpoleras logaritmiskt (spänner över flera dekader)
+LOG_EGENSKAPER = ('p', 'rho_v', 'mu_v')
+
+# Avstånd under kritisk punkt där tabellen slutar [K]
+T_MARGINAL = 0.1
+
+
+def _table_path(fluid, directory=None):
+    safe = fluid.replace('(', '').replace(')', '')
+    return os.path.join(directory or TABELL_KATALOG, f"{safe}_sat.npz")
+
+
+class SatTabell:
+    """
+    Splinetabell för ett mediums mättnadskurva
+
+    Oberoende variabel är x = (T_crit - T)^(1/3), vilket rätar ut det
+    singulära beteendet nära kritisk punkt så att få stödpunkter räcker.
+    """
+
+    def __init__(self, fluid, T_crit, x, coef, errors=None, coolprop_version=None):
+        self.fluid = fluid
+        self.T_crit = float(T_crit)
+        self.x = np.asarray(x, dtype=float)        # stigande stödpunkter
+        self.coef = np.asarray(coef, dtype=float)  # (n_intervall, n_egenskaper, 4)
+        self.errors = dict(errors or {})
+        self.coolprop_version = coolprop_version or installed_coolprop_version()
+        self.T_min = self.T_crit - self.x[-1]**3
+        self.T_max = self.T_crit - self.x[0]**3
+        self._log = np.array([key in LOG_EGENSKAPER for key in BATCH_EGENSKAPER])
+        # Python-listor för skalär uppslagning (snabbare än NumPy-indexering)
+        self._x_list = self.x.tolist()
+        self._coef_list = self.coef.tolist()
+
+    @property
+    def n_points(self):
+        return len(self.x)
+
+    def _check_range(self, T_min, T_max):
+        if T_min < self.T_min - 1e-9 or T_max > self.T_max + 1e-9:
+            raise ValueError(
+                f"{self.fluid}: T utanför tabellen "
+                f"({self.T_min:.2f}-{self.T_max:.2f} K)")
+
+    def state(self, T_K):
+        """Skalär uppslagning: dict med SI-värden enligt BATCH_EGENSKAPER"""
+        self._check_range(T_K, T_K)
+        x = (self.T_crit - T_K)**(1/3)
+        i = min(max(bisect_right(self._x_list, x) - 1, 0), len(self._x_list) - 2)
+        dx = x - self._x_list[i]
+        out = {}
+        for key, is_log, (c0, c1, c2, c3) in zip(BATCH_EGENSKAPER, self._log,
+                                                 self._coef_list[i]):
+            value = ((c0*dx + c1)*dx + c2)*dx + c3
+            out[key] = math.exp(value) if is_log else value
+        return out
+
+    def evaluate(self, T_K):
+        """Vektoriserad uppslagning: dict med arrayer enligt BATCH_EGENSKAPER"""
+        T = np.asarray(T_K, dtype=float)
+        self._check_range(T.min(), T.max())
+        x = np.cbrt(self.T_crit - T)
+        i = np.clip(np.searchsorted(self.x, x, side='right') - 1, 0, len(self.x) - 2)
+        dx = (x - self.x[i])[..., None]
+        c = self.coef[i]  # (..., n_egenskaper, 4)
+        values = ((c[..., 0]*dx + c[..., 1])*dx + c[..., 2])*dx + c[..., 3]
+        values[..., self._log] = np.exp(values[..., self._log])
+        return {key: values[..., k] for k, key in enumerate(BATCH_EGENSKAPER)}
+
+    def save(self, path=None):
+        """Spara tabellen som .npz"""
+        path = path or _table_path(self.fluid)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        np.savez_compressed(
+            path, fluid=self.fluid, T_crit=self.T_crit, x=self.x, coef=self.coef,
+            error_keys=np.array(list(self.errors)),
+            error_values=np.array(list(self.errors.values()), dtype=float),
+            coolprop_version=self.coolprop_version)
+        return path
+
+    @classmethod
+    def load(cls, path):
+        """Läs in en sparad tabell"""
+        with np.load(path) as data:
+            errors = dict(zip(data['error_keys'].tolist(),
+                              data['error_values'].tolist()))
+            return cls(str(data['fluid']), float(data['T_crit']), data['x'],
+                       data['coef'], errors, str(data['coolprop_version']))
+
+
+# ============================================================================
+# BYGGE OCH FELKONTROLL
+# ============================================================================
+
+def _fit(fluid, T_crit, x):
+    from scipy.interpolate import PchipInterpolator
+    T = T_crit - x**3
+    sat = get_saturation_batch(fluid, T)
+    coef = np.empty((len(x) - 1, len(BATCH_EGENSKAPER), 4))
+    for k, key in enumerate(BATCH_EGENSKAPER):
+        y = np.log(sat[key]) if key in LOG_EGENSKAPER else sat[key]
+        if key == 'mu_v' and np.all(np.isnan(y)):
+            # Mediet saknar viskositetsmodell: μ blir NaN i hela tabellen
+            coef[:, k, :] = np.nan
+            continue
+        if not np.all(np.isfinite(y)):
+            raise ValueError(f"{fluid}: CoolProp saknar {key} i tabellområdet")
+        coef[:, k, :] = PchipInterpolator(x, y).c.T
+    return coef
+
+
+def _max_rel_errors(table):
+    """Max relativfel i intervallmittpunkterna (där splinefelet är störst)"""
+    x_mid = 0.5 * (table.x[1:] + table.x[:-1])
+    T_mid = table.T_crit - x_mid**3
+    reference = get_saturation_batch(table.fluid, T_mid)
+    approx = table.evaluate(T_mid)
+    return {key: float(np.max(np.abs(approx[key] / reference[key] - 1)))
+            for key in BATCH_EGENSKAPER if not np.all(np.isnan(reference[key]))}
+
+
+def build_table(fluid, rel_tol=1e-6, n_start=250, n_max=16000, T_margin=T_MARGINAL):
+    """
+    Bygger splinetabell för mediet
+
+    Antalet stödpunkter dubblas tills max relativfel mot CoolProp i alla
+    intervallmittpunkter understiger rel_tol (eller n_max nås).
+    """
+    T_crit = props_si('Tcrit', fluid)
+    T_triple = props_si('Ttriple', fluid)
+    x_min = T_margin**(1/3)
+    x_max = (T_crit - T_triple)**(1/3)
+
+    n = n_start
+    while True:
+        x = np.linspace(x_min, x_max, n)
+        table = SatTabell(fluid, T_crit, x, _fit(fluid, T_crit, x))
+        table.errors = _max_rel_errors(table)
+        if max(table.errors.values()) <= rel_tol or n >= n_max:
+            return table
+        n = min(2 * n, n_max)
+
+
+def print_error_report(table, rel_tol=None):
+    """Skriv ut felrapport för en byggd tabell"""
+    print(f"\n{table.fluid}: {table.n_points} stödpunkter, "
+          f"{table.T_min - 273.15:.2f} till {table.T_max - 273.15:.2f}°C")
+    print(f"{'Egenskap':<10} {'Max rel. fel':>14}")
+    print("-" * 26)
+    for key, err in table.errors.items():
+        print(f"{key:<10} {err:>14.2e}")
+    if rel_tol is not None:
+        worst = max(table.errors.values())
+        status = "OK" if worst <= rel_tol else "ÖVER GRÄNS"
+        print(f"Gräns {rel_tol:.0e}: {status}")
+
+
+# ============================================================================
+# UPPSLAGNING
+# ============================================================================
+
+_loaded = {}
+
+
+def load_table(fluid, directory=None, rel_tol=1e-6):
+    """
+    Hämta tabell för mediet (minne → disk → bygg)
+    En sparad tabell byggs om om den skapades med en annan CoolProp-version.
+    """
+    table = _loaded.get(fluid)
+    if table is not None:
+        return table
+
+    path = _table_path(fluid, directory)
+    if os.path.exists(path):
+        table = SatTabell.load(path)
+        if table.coolprop_version != installed_coolprop_version():
+            table = None
+    if table is None:
+        table = build_table(fluid, rel_tol=rel_tol)
+        table.save(path)
+
+    _loaded[fluid] = table
+    return table
+
+
+def get_props(fluid, T_hot, T_cold):
+    """Som get_props i kalkylatorerna, men från splinetabellen"""
+    table = load_table(fluid)
+    vap = table.state(T_hot + 273.15)
+    liq = table.state(T_cold + 273.15)
+
+    p_high = vap['p'] / 1e5  # bar
+    p_low = liq['p'] / 1e5  # bar
+    h_vap = vap['h_v'] / 1000  # kJ/kg
+    h_liq = liq['h_l'] / 1000  # kJ/kg
+
+    return {
+        'p_high': p_high,
+        'p_low': p_low,
+        'h_vap': h_vap,
+        'h_liq': h_liq,
+        'hfg': h_vap - h_liq,
+        'rho_vap': vap['rho_v'],
+        'rho_liq': liq['rho_l'],
+        'mu_vap': vap['mu_v'] * 1e6,  # μPa·s
+        'PR': p_high / p_low
+    }
+
+
+# ============================================================================
+# HUVUDPROGRAM: BYGG TABELLER OCH RAPPORTERA FEL
+# ============================================================================
+
+if __name__ == "__main__":
+    from CoolProp.CoolProp import PropsSI
+
+    rel_tol = 1e-6
+
+    print("\n" + "="*70)
+    print("BYGGER SPLINETABELLER FÖR SATURATIONSEGENSKAPER")
+    print("="*70)
+
+    for fluid in TABELL_MEDIER:
+        t0 = time.perf_counter()
+        table = build_table(fluid, rel_tol=rel_tol)
+        path = table.save()
+        _loaded[fluid] = table
+        print_error_report(table, rel_tol)
+        print(f"Byggtid: {time.perf_counter() - t0:.2f} s → {path}")
+
+    # Uppslagningstid jämfört med CoolProp
+    print("\n" + "="*70)
+    print("UPPSLAGNINGSTID (get_props, 50°C → 20°C)")
+    print("="*70)
+    n = 10000
+    for fluid in TABELL_MEDIER:
+        t0 = time.perf_counter()
+        for _ in range(n):
+            get_props(fluid, 50, 20)
+        t_table = (time.perf_counter() - t0) / n
+        t0 = time.perf_counter()
+        for _ in range(100):
+            PropsSI('P', 'T', 323.15, 'Q', 1, fluid)
+        t_propssi = (time.perf_counter() - t0) / 100
+        print(f"{fluid:<12} tabell: {t_table*1e6:6.1f} μs/anrop   "
+              f"PropsSI: {t_propssi*1e6:6.1f} μs/egenskap")
+    print("="*70 + "\n")
@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+"""
+GRÄNSSKIKTSMODELL FÖR RADIELLT INFLÖDE MELLAN TESLADISKAR
+calc_disc_spacing skalar TesTurs diskavstånd med √μ (tumregel). Här löses
+spiralflödet mellan två medroterande diskar i stället med en 1-D-modell
+som marscherar inåt i radien, vektoriserad över alla spalter:
+
+  Rörelsemängdsmoment per spalt, väggskjuvning τ = μ·f·(v_θ - ωr) per vägg:
+    ṁ · dL/dr = 4π · μ · f · r² · (v_θ - ωr),       L = v_θ · r
+    f = √((6/b)² + (1/δ)²),                          δ = √(ν/ω)
+  f går från parabolisk profil (6/b när b ≲ δ) till ett Ekmanskikt på varje
+  disk (1/δ när b ≫ δ); skjuvningen sätts då av skiktets tjocklek, inte gapet.
+  Dimensionslöst, r̃ = r/r_o och u = L/(ω·r_o²):
+    du/dr̃ = K · r̃ · (u - r̃²),      K = 4π·μ·f·r_o²/ṁ_spalt
+                                    = 24π·μ·r_o²/(b·ṁ_spalt) · √(1 + (b/6δ)²)
+  Radiell jämvikt (tryckfallet genom rotorn):
+    Δp/ρ = U_o² · I,                                 I = ∫ u²/r̃³ dr̃ (r̃_i → 1)
+
+Energin per kg är det isentropa entalpifallet Δh_is = c0²/2. Munstycket får
+det som rotorns tryckfall inte tar: V_o² = c0² - 2·U_o²·I, och strålen har
+den radiella komponenten V_r = ṁ_spalt/(ρ·2π·r_o·b). Det ger randvärdet
+u(1) = √(V_o² - V_r²)/U_o. Rotorns verkningsgrad är
+  η_rotor = T·ω / (ṁ · Δh_is) = 2·ν²·(u(1) - u(r̃_i)),    ν = U_o/c0
+Diskkanterna blockerar strålen, så η = η_rotor · b/(b + κ·t).
+
+Med givet massflöde per spalt finns inget inre optimum: kopplingen planar
+ut mot Ekmangränsen medan blockeringen fortsätter att minska, så gapet
+växer obegränsat. Optimeringen gäller därför ett givet massflöde ṁ genom
+ett paket med längden L, ṁ_spalt = ṁ·(b + t)/L. Litet b ger god koppling
+men stor blockering, stort b ger få spalter med stort flöde var (K → 0),
+och däremellan ligger ett optimalt gap. Belastningen anges som
+Re_L = ṁ/(2π·μ·L); spaltens Reynoldstal är Re = ṁ_spalt/(2π·r_o·μ) =
+Re_L·(b + t)/r_o och K = 12·(r_o/b)/Re · √(1 + (b/6δ)²) (TesTur: b/δ ≈ 4,5).
+optimal_gap flaggar optimum som hamnar på sökområdets kant.
+
+Kalibrering: med full blockering (κ = 1) och laminär koppling hamnar
+TesTurs optimum vid 4,2 mm i stället för de uppmätta 0,234 mm. Kopplingen
+(K · KOPPLING) och blockeringen (κ = BLOCKERING) är därför modellparametrar.
+TesTur ger bara ett villkor, optimum vid B_REF, så en av dem anpassas:
+blockeringen (calibrate_blockage). Att i stället försvaga kopplingen kräver
+KOPPLING ≈ 0,02 och ger η ≈ 0,2 vid TesTur, långt under η_turb = 0,55 som
+resten av kalkylatorerna räknar med. Kalibreringen gäller en punkt (luft,
+Re_L ≈ 4600), så modellen ersätter inte calc_disc_spacing: gap_for_cycle
+redovisar kvoten mot √μ-gapet och flaggar när den ligger utanför
+AVVIKELSE_MAX.
+
+Ekvationen är linjär i u: u = u(1)·a(r̃) + c(r̃), så
+lösningen beror bara på de dimensionslösa grupperna K och r̃_i. Den
+marscheras en gång per (kvantiserat K, r̃_i) och cachas. Varvtal, fluid och
+munstyckshastighet kommer in algebraiskt via ν och V_r/c0.
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from orc_karna import calc_system_core
+from orc_rotor import (B_REF, D_REF, MU_REF, N_DISKAR_REF, RPM_REF, TJOCKLEK_REF,
+                       isentropic_drop, reference)
+
+# Utloppsradie / ytterradie (TesTurs utloppshål är inte uppmätta,
+# 0,3-0,4 är typiskt för Teslaturbiner)
+RADIEKVOT = 0.35
+
+# Marschen: noder per lösning, jämnt fördelade i ζ = ln(1 + λ(1 - r̃²)), λ = K/2,
+# så att randskiktet vid r̃ = 1 (tjocklek ~1/K) alltid är upplöst (jämnt antal)
+NODER = 400
+
+# Cachens upplösning i K (punkter per dekad, ≈ 0,2 % relativt)
+KVANT = 1000
+
+# Gapen som provas vid optimering, som b/δ
+GAP_B_DELTA = np.geomspace(0.3, 300.0, 241)
+
+# Kopplingens multiplikator på K (1 = laminär teori, hålls fast)
+KOPPLING = 1.0
+
+# Andel av disktjockleken som blockerar strålen, η = η_rotor·b/(b + κ·t)
+# (anpassad så att TesTurs optimum blir B_REF, se calibrate_blockage)
+BLOCKERING = 0.0037
+
+# Största tillåtna kvot mellan modellens gap och √μ-gapet (och omvänt)
+# innan resultatet flaggas som avvikande från referensen
+AVVIKELSE_MAX = 2.0
+
+# Kolumner från gap_performance: namn → enhet
+GAPKOLUMNER = {
+    'b_disc': 'mm', 'Re': '-', 'K': '-', 'b_delta': '-', 'V_r': 'm/s', 'nu': '-',
+    'torque_gap': 'N·m', 'P_gap': 'W', 'eta_rotor': '-', 'eta': '-',
+}
+
+# Extra kolumn från optimal_gap: -1/+1 = optimum på sökområdets nedre/övre kant
+# (eller inget giltigt gap, NaN), 0 = inre optimum
+KANTKOLUMN = 'at_edge'
+
+# Extra kolumner från gap_for_cycle: kvoten b_opt / b(√μ) och flagga
+# (1 = utanför AVVIKELSE_MAX, 0 = inom, NaN = √μ-gap saknas)
+KVOTKOLUMN = 'ref_ratio'
+AVVIKELSEKOLUMN = 'deviates'
+
+_losningar = {}   # (kvantiserat log10 K, r̃_i) → (a, c, J_aa, J_ac, J_cc) vid r̃_i
+
+
+# ============================================================================
+# DIMENSIONSLÖS LÖSNING
+# ============================================================================
+
+def _march(K, r_inner, n_nodes=NODER):
+    """
+    Marscherar u = u(1)·a + c inåt från r̃ = 1 till r̃_i för alla K samtidigt
+
+    I s = r̃² blir ekvationen ds-linjär med konstant koefficient,
+    d(u - s)/ds = λ(u - s) - 1, så varje steg integreras exakt med
+    integrerande faktor (stabilt för alla K, till skillnad från RK4 som
+    kräver K·Δr̃ < 2,8). Tryckintegralerna J = ∫ produkt/(2s²) ds tas med
+    Simpson i ζ. Returnerar array (5, len(K)) med a, c, J_aa, J_ac, J_cc.
+    """
+    lam = K / 2
+    zeta = np.linspace(0.0, 1.0, n_nodes + 1)[:, None] * np.log1p(lam * (1 - r_inner**2))
+    s = 1 - np.expm1(zeta) / lam                     # noder, s = 1 → r̃_i²
+
+    a = np.empty_like(s)
+    v = np.empty_like(s)                             # v = c - s
+    a[0], v[0] = 1.0, -1.0
+    for j in range(n_nodes):
+        decay = np.exp(lam * (s[j + 1] - s[j]))
+        a[j + 1] = a[j] * decay
+        v[j + 1] = v[j] * decay + (1 - decay) / lam
+    c = v + s
+
+    # ds/dζ = -e^ζ/λ; integralen går från r̃_i till 1, dvs. motsatt marschen
+    weight = np.exp(zeta) / lam / (2 * s**2)
+    simpson = np.ones(n_nodes + 1)
+    simpson[1:-1:2], simpson[2:-1:2] = 4, 2
+    dzeta = zeta[1] / 3
+    integral = lambda f: np.sum(simpson[:, None] * f * weight, axis=0) * dzeta
+    return np.array([a[-1], c[-1], integral(a * a), integral(a * c), integral(c * c)])
+
+
+def _coefficients(K, r_inner=RADIEKVOT):
+    """
+    Lösningens koefficienter vid r̃_i för en array av K (cachade per
+    kvantiserat K). Returnerar array (5, ...) med a, c, J_aa, J_ac, J_cc.
+    """
+    K = np.asarray(K, dtype=float)
+    keys = np.round(np.log10(K) * KVANT).astype(np.int64)
+    unique, inverse = np.unique(keys, return_inverse=True)
+    missing = np.array([key for key in unique if (key, r_inner) not in _losningar],
+                       dtype=np.int64)
+    if len(missing):
+        for key, column in zip(missing, _march(10.0 ** (missing / KVANT), r_inner).T):
+            _losningar[(key, r_inner)] = column
+
+    values = np.array([_losningar[(key, r_inner)] for key in unique]).T
+    return values[:, inverse.reshape(K.shape)]
+
+
+def clear_cache():
+    _losningar.clear()
+
+
+def disc_flow(K, nu, vr_c0=0.0, r_inner=RADIEKVOT):
+    """
+    Dimensionslös spaltlösning: K, ν = U_o/c0 och V_r/c0 (broadcastas)
+    Returnerar dict med u_out = u(1), u_in = u(r̃_i), tryckintegralen I och
+    η_rotor (NaN där rotorns tryckfall ensamt överstiger Δh_is)
+    """
+    K, nu, vr_c0 = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (K, nu, vr_c0)))
+    a, c, J_aa, J_ac, J_cc = _coefficients(K, r_inner)
+
+    # u(1)² + 2·I(u(1)) = (1 - (V_r/c0)²)/ν², I kvadratisk i u(1)
+    A = 1 + 2 * J_aa
+    B = 4 * J_ac
+    C = 2 * J_cc - (1 - vr_c0**2) / nu**2
+    with np.errstate(invalid='ignore'):
+        u_out = (-B + np.sqrt(B**2 - 4 * A * C)) / (2 * A)
+    u_out = np.where(u_out > 0, u_out, np.nan)
+    u_in = u_out * a + c
+    return {
+        'u_out': u_out, 'u_in': u_in,
+        'I': u_out**2 * J_aa + 2 * u_out * J_ac + J_cc,
+        'eta_rotor': 2 * nu**2 * (u_out - u_in),
+    }
+
+
+# ============================================================================
+# DIMENSIONERANDE STORHETER
+# ============================================================================
+
+def gap_performance(b, m_dot_gap, mu_vap, rho_vap, dh_is, D=D_REF, rpm=RPM_REF,
+                    t_disc=TJOCKLEK_REF, r_inner=RADIEKVOT, coupling=KOPPLING,
+                    blockage=BLOCKERING):
+    """
+    Moment, effekt och verkningsgrad för en spalt
+    b [mm], m_dot_gap [kg/s], mu_vap [μPa·s], rho_vap [kg/m³], dh_is [J/kg],
+    D [mm], rpm, t_disc [mm]. Alla argument broadcastas (t.ex. gap × varvtal).
+    coupling och blockage är modellparametrarna KOPPLING och BLOCKERING.
+    Returnerar dict med kolumner enligt GAPKOLUMNER.
+    """
+    b, m_dot_gap, mu, rho, dh_is, D, rpm, t_disc = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in
+          (b, m_dot_gap, mu_vap, rho_vap, dh_is, D, rpm, t_disc)))
+    r_o = D / 2000                                   # m
+    mu = mu * 1e-6                                   # Pa·s
+    omega = 2 * np.pi * rpm / 60
+    c0 = np.sqrt(2 * dh_is)
+
+    b_delta = b / 1000 / np.sqrt(mu / (rho * omega))
+    K = (coupling * 24 * np.pi * mu * r_o**2 / (b / 1000 * m_dot_gap)
+         * np.sqrt(1 + (b_delta / 6)**2))
+    V_r = m_dot_gap / (rho * 2 * np.pi * r_o * b / 1000)
+    nu = omega * r_o / c0
+    flow = disc_flow(K, nu, V_r / c0, r_inner)
+
+    torque = m_dot_gap * omega * r_o**2 * (flow['u_out'] - flow['u_in'])
+    return {
+        'b_disc': b, 'Re': m_dot_gap / (2 * np.pi * r_o * mu), 'K': K,
+        'b_delta': b_delta, 'V_r': V_r,
+        'nu': nu, 'torque_gap': torque, 'P_gap': torque * omega,
+        'eta_rotor': flow['eta_rotor'], 'eta': flow['eta_rotor'] * b / (b + blockage * t_disc),
+    }
+
+
+def pack_performance(b, load, mu_vap, rho_vap, dh_is, D=D_REF, rpm=RPM_REF,
+                     t_disc=TJOCKLEK_REF, r_inner=RADIEKVOT, coupling=KOPPLING,
+                     blockage=BLOCKERING):
+    """
+    Som gap_performance, men för ett paket med belastningen load = ṁ/L
+    [kg/(s·m)]: varje spalt (med sin disk) tar ṁ_spalt = load · (b + t)
+    """
+    m_dot_gap = np.asarray(load, dtype=float) * (np.asarray(b) + np.asarray(t_disc)) / 1000
+    return gap_performance(b, m_dot_gap, mu_vap, rho_vap, dh_is, D, rpm, t_disc, r_inner,
+                           coupling, blockage)
+
+
+def optimal_gap(load, mu_vap, rho_vap, dh_is, D=D_REF, rpm=RPM_REF,
+                t_disc=TJOCKLEK_REF, r_inner=RADIEKVOT, b_delta=GAP_B_DELTA,
+                coupling=KOPPLING, blockage=BLOCKERING):
+    """
+    Gapet med högst η (inkl. blockering) för paketbelastningen load = ṁ/L
+    [kg/(s·m)], per kombination av indata
+    Gapen provas som b = b_delta · δ längs en extra axel. Returnerar dict med
+    kolumner enligt GAPKOLUMNER vid optimum, plus KANTKOLUMN.
+    """
+    args = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in
+                                 (load, mu_vap, rho_vap, dh_is, D, rpm, t_disc)))
+    omega = 2 * np.pi * args[5] / 60
+    delta = np.sqrt(args[1] * 1e-6 / (args[2] * omega)) * 1000   # mm
+    b = delta[..., None] * np.asarray(b_delta)
+    result = pack_performance(b, *(x[..., None] for x in args), r_inner=r_inner,
+                              coupling=coupling, blockage=blockage)
+
+    eta = np.where(np.isfinite(result['eta']), result['eta'], -np.inf)
+    best = np.argmax(eta, axis=-1)
+    out = {key: np.take_along_axis(values, best[..., None], axis=-1)[..., 0]
+           for key, values in result.items()}
+    edge = np.where(best == 0, -1.0, np.where(best == len(b_delta) - 1, 1.0, 0.0))
+    out[KANTKOLUMN] = np.where(np.isfinite(out['eta']), edge, np.nan)
+    return out
+
+
+def pack_reynolds(m_dot, L_pack, mu_vap):
+    """Paketets belastning Re_L = ṁ/(2π·μ·L) (L_pack [mm], mu_vap [μPa·s])"""
+    return m_dot / (2 * np.pi * np.asarray(mu_vap) * 1e-6 * np.asarray(L_pack) / 1000)
+
+
+def pack_load(Re_L, mu_vap):
+    """Massflöde per paketlängd ṁ/L [kg/(s·m)] för belastningen Re_L"""
+    return np.asarray(Re_L, dtype=float) * 2 * np.pi * np.asarray(mu_vap) * 1e-6
+
+
+def reference_reynolds():
+    """TesTurs belastning Re_L (massflöde enligt orc_rotor.reference, N diskar à t, b)"""
+    L_pack = N_DISKAR_REF * TJOCKLEK_REF + (N_DISKAR_REF - 1) * B_REF
+    return float(pack_reynolds(reference()['m_dot'], L_pack, MU_REF))
+
+
+def reference_point(coupling=KOPPLING, blockage=BLOCKERING, b_delta=GAP_B_DELTA):
+    """
+    Modellen vid TesTur (luft 5,5 bar, 20°C, TesTurs belastning)
+    Returnerar (prestanda vid B_REF, optimum enligt optimal_gap).
+    """
+    from orc_instrumentering import props_si
+    rho_air = props_si('D', 'P', 5.5e5, 'T', 293.15, 'Air')
+    load = pack_load(reference_reynolds(), MU_REF)
+    dh_is = reference()['dh_is']
+    at_ref = pack_performance(B_REF, load, MU_REF, rho_air, dh_is,
+                              coupling=coupling, blockage=blockage)
+    best = optimal_gap(load, MU_REF, rho_air, dh_is, b_delta=b_delta,
+                       coupling=coupling, blockage=blockage)
+    return ({key: float(value) for key, value in at_ref.items()},
+            {key: float(value) for key, value in best.items()})
+
+
+def calibrate_blockage(coupling=KOPPLING):
+    """
+    Blockeringsandelen κ som lägger TesTurs optimum på B_REF (ger BLOCKERING)
+    Söks i log κ på ett tätare gapnät än GAP_B_DELTA.
+    """
+    from scipy.optimize import brentq
+    b_delta = np.geomspace(GAP_B_DELTA[0], GAP_B_DELTA[-1], 2001)
+    miss = lambda log_k: np.log(reference_point(coupling, 10.0 ** log_k, b_delta)[1]['b_disc']
+                                / B_REF)
+    return float(10.0 ** brentq(miss, -4.0, 0.0, xtol=1e-3))
+
+
+def gap_for_cycle(res, D=D_REF, rpm=RPM_REF, t_disc=TJOCKLEK_REF, Re_L=None,
+                  r_inner=RADIEKVOT):
+    """
+    Optimalt gap för cykeln i ett ORCResultat, jämfört med calc_disc_spacing
+    Paketet belastas så att Re_L blir som angivet (standard: TesTurs). Utöver
+    optimal_gaps kolumner ges KVOTKOLUMN (b_opt / res.b_disc) och
+    AVVIKELSEKOLUMN, som flaggar gap som avviker mer än AVVIKELSE_MAX från
+    √μ-skalningen (modellen är bara kalibrerad mot TesTur).
+    """
+    load = pack_load(reference_reynolds() if Re_L is None else Re_L, res.mu_vap)
+    out = optimal_gap(load, res.mu_vap, res.rho_vap, isentropic_drop(res), D, rpm,
+                      t_disc, r_inner)
+    ratio = out['b_disc'] / res.b_disc
+    out[KVOTKOLUMN] = ratio
+    deviates = np.abs(np.log(ratio)) > np.log(AVVIKELSE_MAX)
+    out[AVVIKELSEKOLUMN] = np.where(np.isfinite(ratio), deviates.astype(float), np.nan)
+    return out
+
+
+def _edge_mark(flag):
+    """Markering i tabellerna för optimum på sökområdets kant"""
+    return "" if flag == 0 else "  [kant]"
+
+
+def _deviation_mark(flag):
+    """Markering i tabellerna för gap som avviker från √μ-skalningen"""
+    return "  [avviker]" if flag == 1 else ""
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gränsskiktsmodell för Teslaturbinens spalter")
+    parser.add_argument('--model', default='rankine', choices=['hfg', 'rankine'])
+    parser.add_argument('--rpm', type=float, default=RPM_REF)
+    parser.add_argument('--diameter', type=float, default=D_REF, help="Diskdiameter [mm]")
+    args = parser.parse_args()
+
+    # TesTur själv: luft 5,5 bar, 20°C
+    Re_ref = reference_reynolds()
+    testur, best = reference_point()
+    print(f"Kalibrering: KOPPLING = {KOPPLING:g}, BLOCKERING = {BLOCKERING:g} "
+          f"(optimum vid B_REF = {B_REF} mm)")
+    print(f"TesTur: Re_L = {Re_ref:.0f} (Re = {testur['Re']:.1f}), K = {testur['K']:.0f}, "
+          f"ν = {testur['nu']:.3f}, η_rotor = {testur['eta_rotor']:.3f}, "
+          f"η = {testur['eta']:.3f} vid b = {B_REF} mm; optimum b = {best['b_disc']:.3f} mm "
+          f"(η = {best['eta']:.3f}){_edge_mark(best[KANTKOLUMN])}")
+
+    print(f"\n--- Optimalt gap mot paketbelastning (R1233zd(E) 50→20°C, "
+          f"{args.diameter:.0f} mm, {args.rpm:.0f} rpm) ---")
+    res = calc_system_core('R1233zd(E)', 50, 20, 1.0, model=args.model)
+    dh_is = isentropic_drop(res)
+    Re_L = np.geomspace(Re_ref / 10, Re_ref * 10, 9)
+    t0 = time.perf_counter()
+    table = optimal_gap(pack_load(Re_L, res.mu_vap), res.mu_vap, res.rho_vap, dh_is,
+                        args.diameter, args.rpm)
+    elapsed = time.perf_counter() - t0
+    print(f"{'Re_L':>8} {'b_opt [mm]':>11} {'b/b√μ':>6} {'b/δ':>6} {'Re':>7} {'K':>7} "
+          f"{'η_rotor':>8} {'η':>7} {'P_spalt [W]':>12}")
+    for i in range(len(Re_L)):
+        print(f"{Re_L[i]:>8.0f} {table['b_disc'][i]:>11.3f} "
+              f"{table['b_disc'][i] / res.b_disc:>6.2f} {table['b_delta'][i]:>6.1f} "
+              f"{table['Re'][i]:>7.1f} {table['K'][i]:>7.1f} "
+              f"{table['eta_rotor'][i]:>8.3f} {table['eta'][i]:>7.3f} "
+              f"{table['P_gap'][i]:>12.2f}{_edge_mark(table[KANTKOLUMN][i])}")
+    print(f"({len(Re_L) * len(GAP_B_DELTA)} gap utvärderade på {elapsed * 1000:.0f} ms; "
+          f"[kant] = optimum på sökområdets kant b/δ = "
+          f"{GAP_B_DELTA[0]:g}-{GAP_B_DELTA[-1]:g})")
+
+    print(f"\n--- Modellens gap mot √μ-skalningen (Re_L = TesTurs) ---")
+    print(f"{'Medium':<12} {'T':>9} {'b √μ [mm]':>10} {'η':>7} {'b modell [mm]':>14} {'η':>7} "
+          f"{'kvot':>6}")
+    for fluid, T_hot, T_cold in (('R1233zd(E)', 50, 20), ('R1233zd(E)', 80, 10),
+                                 ('R245fa', 50, 20)):
+        res = calc_system_core(fluid, T_hot, T_cold, 1.0, model=args.model)
+        gap = gap_for_cycle(res, args.diameter, args.rpm)
+        scaled = pack_performance(res.b_disc, pack_load(Re_ref, res.mu_vap),
+                                  res.mu_vap, res.rho_vap, isentropic_drop(res),
+                                  args.diameter, args.rpm)
+        print(f"{fluid:<12} {f'{T_hot}→{T_cold}°C':>9} {res.b_disc:>10.3f} "
+              f"{float(scaled['eta']):>7.3f} {float(gap['b_disc']):>14.3f} "
+              f"{float(gap['eta']):>7.3f} {float(gap[KVOTKOLUMN]):>6.2f}"
+              f"{_edge_mark(float(gap[KANTKOLUMN]))}"
+              f"{_deviation_mark(float(gap[AVVIKELSEKOLUMN]))}")
+    print(f"[avviker] = modellens gap skiljer sig mer än en faktor {AVVIKELSE_MAX:g} från "
+          f"√μ-skalningen (modellen är kalibrerad enbart mot TesTur)")
+    print()
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+INSTRUMENTERING AV COOLPROP-ANROP (OPT-IN)
+Räknar och tidtar varje anrop till CoolProp per (medium, utdata, indatapar):
+AbstractState.update() och varje egenskap som läses efteråt, samt PropsSI.
+Sammanfattningen visar antal anrop, antal unika indata (skillnaden är
+onödiga upprepningar), total och percentil-latens samt träffgrad för
+egenskapscacharna.
+
+All CoolProp-åtkomst i kalkylatorerna, orc_termo_data och generate_diagrams
+går via orc_egenskaper/orc_rankine, som hämtar sina AbstractState-objekt
+genom instrument_state och PropsSI genom props_si.
+
+Aktiveras med miljövariabeln ORC_INSTRUMENTERING:
+  ej satt / 0 / off → avstängd (ingen extra kostnad)
+  1 / on / text     → sammanfattning skrivs ut vid avslut
+  fil.json          → sammanfattning sparas som JSON vid avslut
+eller för ett skript: python orc_instrumentering.py orc_kalkylator.py
+
+Räknarna är per process; arbetsprocesser i pooler rapporterar inte.
+"""
+
+import argparse
+import atexit
+import json
+import os
+import runpy
+import sys
+import time
+from array import array
+
+import numpy as np
+
+MILJOVARIABEL = 'ORC_INSTRUMENTERING'
+AVSTANGD = ('', '0', 'off', 'av', 'false', 'no', 'nej')
+PERCENTILER = (50, 90, 99)
+
+_enabled = False
+_report = None      # 'text' eller sökväg till JSON-fil
+_latencies = {}     # (medium, utdata, indatapar) → array('d') med latenser [s]
+_inputs = {}        # (medium, utdata, indatapar) → set av indata
+_pair_names = None
+
+
+def _pair_name(input_pair):
+    """CoolProp-indatapar som text, t.ex. 1 → 'QT'"""
+    global _pair_names
+    if _pair_names is None:
+        import CoolProp
+        _pair_names = {getattr(CoolProp, name): name[:-len('_INPUTS')]
+                       for name in dir(CoolProp) if name.endswith('_INPUTS')}
+    return _pair_names.get(input_pair, str(input_pair))
+
+
+def enabled():
+    return _enabled
+
+
+def enable(report='text'):
+    """
+    Slår på instrumenteringen (report: 'text', sökväg till .json eller None)
+    Bör anropas före första egenskapsanropet; redan skapade AbstractState
+    släpps så att de skapas om instrumenterade.
+    """
+    global _enabled, _report
+    if not _enabled:
+        atexit.register(_report_at_exit)
+    _enabled, _report = True, report
+    states = getattr(sys.modules.get('orc_egenskaper'), '_abstract_states', None)
+    if states is not None:
+        states.clear()
+
+
+def reset():
+    """Nollställer räknarna"""
+    _latencies.clear()
+    _inputs.clear()
+
+
+def record(fluid, output, input_pair, seconds, inputs=None):
+    key = (fluid, output, input_pair)
+    samples = _latencies.get(key)
+    if samples is None:
+        samples = _latencies[key] = array('d')
+        _inputs[key] = set()
+    samples.append(seconds)
+    if inputs is not None:
+        _inputs[key].add(inputs)
+
+
+# ============================================================================
+# OMSLAG KRING COOLPROP
+# ============================================================================
+
+class InstrumenteradState:
+    """AbstractState som tidtar update() och varje egenskap som läses"""
+
+    def __init__(self, state, fluid):
+        self._state = state
+        self._fluid = fluid
+        self._pair = None
+
+    def update(self, input_pair, value_1, value_2):
+        self._pair = _pair_name(input_pair)
+        t0 = time.perf_counter()
+        try:
+            self._state.update(input_pair, value_1, value_2)
+        finally:
+            record(self._fluid, 'update', self._pair, time.perf_counter() - t0,
+                   (value_1, value_2))
+
+    def __getattr__(self, name):
+        method = getattr(self._state, name)
+        if not callable(method):
+            return method
+
+        def timed(*args):
+            t0 = time.perf_counter()
+            try:
+                return method(*args)
+            finally:
+                record(self._fluid, name, self._pair, time.perf_counter() - t0)
+        return timed
+
+
+def instrument_state(state, fluid):
+    """Omsluter state om instrumenteringen är på, annars oförändrat"""
+    return InstrumenteradState(state, fluid) if _enabled else state
+
+
+def props_si(output, *args):
+    """PropsSI(output, [namn1, värde1, namn2, värde2,] medium), tidtagen om påslagen"""
+    from CoolProp.CoolProp import PropsSI
+    if not _enabled:
+        return PropsSI(output, *args)
+    fluid = args[-1]
+    pair = f"{args[0]}{args[2]}" if len(args) == 5 else 'konstant'
+    t0 = time.perf_counter()
+    try:
+        return PropsSI(output, *args)
+    finally:
+        record(fluid, output, pair, time.perf_counter() - t0, args[:-1])
+
+
+# ============================================================================
+# SAMMANFATTNING
+# ============================================================================
+
+def cache_stats():
+    """Träffgrad för egenskapscacharna i de moduler som är laddade"""
+    stats = {}
+    egenskaper = sys.modules.get('orc_egenskaper')
+    if egenskaper is not None:
+        info = egenskaper.cache_info()
+        hits, misses = info.pop('batch_hits'), info.pop('batch_misses')
+        stats['sat_lru'] = info
+        stats['sat_batch'] = {'hits': hits, 'misses': misses,
+                              'hit_rate': hits / (hits + misses) if hits + misses else 0.0}
+    rankine = sys.modules.get('orc_rankine')
+    if rankine is not None:
+        for name in ('_flash', 'solve_cycle'):
+            info = getattr(rankine, name).cache_info()
+            total = info.hits + info.misses
+            stats[name.lstrip('_') + '_lru'] = {
+                'hits': info.hits, 'misses': info.misses, 'size': info.currsize,
+                'maxsize': info.maxsize, 'hit_rate': info.hits / total if total else 0.0}
+    diskcache = sys.modules.get('orc_egenskapscache')
+    if diskcache is not None and diskcache._cache_pid == os.getpid() \
+            and diskcache._cache is not None:
+        stats['disk'] = diskcache._cache.stats()
+    return stats
+
+
+def summary():
+    """Sammanfattning som dict (JSON-serialiserbar), anrop sorterade efter total tid"""
+    calls = []
+    for (fluid, output, pair), samples in _latencies.items():
+        values = np.frombuffer(samples, dtype=float) if len(samples) else np.zeros(1)
+        entry = {
+            'fluid': fluid, 'output': output, 'input_pair': pair,
+            'count': len(samples),
+            'unique_inputs': len(_inputs[(fluid, output, pair)]) or None,
+            'total_s': float(values.sum()),
+            'mean_us': float(values.mean() * 1e6),
+            'max_us': float(values.max() * 1e6),
+        }
+        for q, value in zip(PERCENTILER, np.percentile(values, PERCENTILER)):
+            entry[f'p{q}_us'] = float(value * 1e6)
+        calls.append(entry)
+    calls.sort(key=lambda entry: -entry['total_s'])
+    return {
+        'total_calls': sum(entry['count'] for entry in calls),
+        'total_s': sum(entry['total_s'] for entry in calls),
+        'calls': calls,
+        'caches': cache_stats(),
+    }
+
+
+def print_summary(data=None, top=30):
+    data = data or summary()
+    print("\n" + "="*104)
+    print(f"COOLPROP-ANROP: {data['total_calls']} anrop, "
+          f"{data['total_s'] * 1000:.1f} ms totalt")
+    print("="*104)
+    print(f"{'Medium':<14} {'Utdata':<12} {'Indata':<8} {'Anrop':>8} {'Unika':>8} "
+          f"{'Totalt [ms]':>12} {'Medel [μs]':>11}"
+          + "".join(f"{f'p{q} [μs]':>11}" for q in PERCENTILER))
+    print("-"*104)
+    for entry in data['calls'][:top]:
+        unique = entry['unique_inputs']
+        print(f"{entry['fluid']:<14} {entry['output']:<12} {entry['input_pair']:<8} "
+              f"{entry['count']:>8} {'' if unique is None else unique:>8} "
+              f"{entry['total_s'] * 1000:>12.2f} {entry['mean_us']:>11.1f}"
+              + "".join(f"{entry[f'p{q}_us']:>11.1f}" for q in PERCENTILER))
+    if len(data['calls']) > top:
+        print(f"... {len(data['calls']) - top} rader till")
+
+    if data['caches']:
+        print("\nCacher:")
+        for name, info in data['caches'].items():
+            print(f"  {name:<16} {info['hits']:>8} träffar {info['misses']:>8} missar "
+                  f"({info['hit_rate']:.0%})")
+    print("="*104 + "\n")
+
+
+def write_json(path, data=None):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data or summary(), f, indent=2, ensure_ascii=False)
+    return path
+
+
+def _report_at_exit():
+    if not _latencies or _report is None:
+        return
+    if str(_report).endswith('.json'):
+        print(f"CoolProp-instrumentering sparad: {write_json(_report)}")
+    else:
+        print_summary()
+
+
+_value = os.environ.get(MILJOVARIABEL, '').strip()
+if _value.lower() not in AVSTANGD:
+    enable(_value if _value.endswith('.json') else 'text')
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Kör ett skript med instrumenterade CoolProp-anrop")
+    parser.add_argument('--json', default=None, help="Spara sammanfattningen som JSON")
+    parser.add_argument('script', help="Skript att köra, t.ex. orc_kalkylator.py")
+    parser.add_argument('args', nargs=argparse.REMAINDER)
+    args = parser.parse_args()
+
+    # Slå på i modulen under sitt riktiga namn (det är den orc_egenskaper importerar)
+    from orc_instrumentering import enable
+    enable(args.json or 'text')
+    sys.argv = [args.script] + args.args
+    sys.path.insert(0, os.path.dirname(os.path.abspath(args.script)))
+    runpy.run_path(args.script, run_name='__main__')
@@ -4,7 +4,9 @@ FÖRBÄTTRAD ORC KALKYLATOR - Integrerad med TesTur-data
 Inkluderar validering mot TesTur-prestanda och projektunderlag
 """
 
-from CoolProp.CoolProp import PropsSI
+from orc_egenskaper import print_cache_info
+from orc_karna import get_props, calc_disc_spacing, calc_system_core, DT_KB, CYKELMODELLER, TESTUR_REF
+import argparse
 import sys
 
 # Fixa encoding för Windows
@@ -18,18 +20,7 @@ if sys.platform == 'win32':
 # TESTUR REFERENSDATA FÖR VALIDERING
 # ============================================================================
 
-TESTUR_REF = {
-    'medium': 'Luft vid 20°C',
-    'viskositet': 18.2,  # μPa·s
-    'diskavstand': 0.234,  # mm
-    'diameter': 254,  # mm
-    'antal_diskar': 75,
-    'effekt_verifierad': 1200,  # W
-    'rpm_drift': 10000,
-    'tryck_in': 5.5,  # bar (från video K7qZvq1CMFg)
-    'tryck_ut': 1.0,  # bar
-    'tryckforhallande': 5.5,
-}
+# TESTUR_REF finns i beräkningskärnan (orc_karna)
 
 def print_testur_ref():
     """Skriv ut TesTur referensdata"""
@@ -51,180 +42,165 @@ def print_testur_ref():
 # TERMODYNAMISKA FUNKTIONER
 # ============================================================================
 
-def get_props(fluid, T_hot, T_cold):
-    """Hämtar termodynamiska egenskaper vid drifttemperaturer"""
-    T_h = T_hot + 273.15
-    T_c = T_cold + 273.15
-    
-    # Högtryckssida (förångning)
-    p_high = PropsSI('P', 'T', T_h, 'Q', 1, fluid) / 1e5  # bar
-    h_vap = PropsSI('H', 'T', T_h, 'Q', 1, fluid) / 1000  # kJ/kg
-    rho_vap = PropsSI('D', 'T', T_h, 'Q', 1, fluid)  # kg/m³
-    mu_vap = PropsSI('V', 'T', T_h, 'Q', 1, fluid) * 1e6  # μPa·s
-    
-    # Lågtryckssida (kondensering)
-    p_low = PropsSI('P', 'T', T_c, 'Q', 0, fluid) / 1e5  # bar
-    h_liq = PropsSI('H', 'T', T_c, 'Q', 0, fluid) / 1000  # kJ/kg
-    rho_liq = PropsSI('D', 'T', T_c, 'Q', 0, fluid)  # kg/m³
-    
-    hfg = h_vap - h_liq
-    
-    return {
-        'p_high': p_high,
-        'p_low': p_low,
-        'h_vap': h_vap,
-        'h_liq': h_liq,
-        'hfg': hfg,
-        'rho_vap': rho_vap,
-        'rho_liq': rho_liq,
-        'mu_vap': mu_vap,
-        'PR': p_high / p_low
-    }
-
-def calc_disc_spacing(mu_medium, mu_ref=18.2, b_ref=0.234):
-    """
-    Beräknar optimalt diskavstånd från viskositet
-    Baserat på gränsskiktsteori och TesTur-data
-    
-    Formel: b₂ / b₁ = √(μ₂ / μ₁)
-    """
-    scaling_factor = (mu_medium / mu_ref)**0.5
-    b_calc = b_ref * scaling_factor
-    return b_calc, scaling_factor
+# get_props och calc_disc_spacing finns i beräkningskärnan (orc_karna)
 
 # ============================================================================
-# HUVUDBERÄKNINGSFUNKTION
+# RESULTATRENDERING
 # ============================================================================
 
-def calc_system_enhanced(fluid_name, fluid_coolprop, T_hot, T_cold, P_target_kW, 
-                        eta_turb=0.55, eta_gen=0.93, eta_pump=0.65,
-                        show_testur_comparison=True):
+def render_system_enhanced(fluid_name, res, show_testur_comparison=True, rotor=None,
+                           stress=None):
     """
-    Beräknar komplett ORC-system med TesTur-validering
+    Formaterar ett ORCResultat som kalkylatorns textrapport
+    rotor: dict från orc_rotor.rotor_for_cycle (None = ingen rotordel)
+    stress: dict från orc_diskspanning.disc_stress för rotorns diskar, med
+    högsta tillåtna driftvarvtal under 'rpm_max' (skrivs bara ut med rotorn)
+    Returnerar texten (ingen utskrift)
     """
+    lines = []
+    out = lines.append
     
-    print(f"\n{'='*70}")
-    print(f"ORC SYSTEMBERÄKNING: {fluid_name}")
-    print(f"{'='*70}")
+    out(f"\n{'='*70}")
+    out(f"ORC SYSTEMBERÄKNING: {fluid_name}")
+    out(f"{'='*70}")
     
-    # Termodynamiska egenskaper
-    props = get_props(fluid_coolprop, T_hot, T_cold)
-    
-    print(f"\n--- DRIFTFÖRHÅLLANDEN ---")
-    print(f"Förångning:        {T_hot}°C vid {props['p_high']:.2f} bar")
-    print(f"Kondensering:      {T_cold}°C vid {props['p_low']:.2f} bar")
-    print(f"Tryckförhållande:  {props['PR']:.2f}:1", end="")
+    out(f"\n--- DRIFTFÖRHÅLLANDEN ---")
+    out(f"Förångning:        {res.T_hot}°C vid {res.p_high:.2f} bar")
+    out(f"Kondensering:      {res.T_cold}°C vid {res.p_low:.2f} bar")
     
     # Jämför med TesTur
+    pr_text = ""
     if show_testur_comparison:
-        pr_ratio = props['PR'] / TESTUR_REF['tryckforhallande']
+        pr_ratio = res.PR / TESTUR_REF['tryckforhallande']
         if 0.3 < pr_ratio < 0.7:
-            print(" (✓ Liknande TesTur, bra för Tesla-turbin)")
+            pr_text = " (✓ Liknande TesTur, bra för Tesla-turbin)"
         elif pr_ratio >= 0.7:
-            print(" (⚠ Högre än TesTur, kan ge högre effekt)")
+            pr_text = " (⚠ Högre än TesTur, kan ge högre effekt)"
         else:
-            print(" (⚠ Lägre än TesTur, kan begränsa effekt)")
-    else:
-        print()
+            pr_text = " (⚠ Lägre än TesTur, kan begränsa effekt)"
+    out(f"Tryckförhållande:  {res.PR:.2f}:1{pr_text}")
     
-    print(f"Förångningsvärme:  {props['hfg']:.1f} kJ/kg")
-    print(f"Viskositet ånga:   {props['mu_vap']:.1f} μPa·s", end="")
+    out(f"Förångningsvärme:  {res.hfg:.1f} kJ/kg")
     
     # Jämför viskositet med TesTur
+    mu_text = ""
     if show_testur_comparison:
-        mu_ratio = props['mu_vap'] / TESTUR_REF['viskositet']
-        print(f" ({mu_ratio:.1%} av TesTur luft)")
-    else:
-        print()
-    
-    # Carnot verkningsgrad
-    T_h_K = T_hot + 273.15
-    T_c_K = T_cold + 273.15
-    eta_carnot = 1 - (T_c_K / T_h_K)
-    
-    print(f"\n--- VERKNINGSGRADER ---")
-    print(f"Carnot (teoretisk max): {eta_carnot*100:.2f}%")
-    print(f"Turbin isentropisk:     {eta_turb*100:.1f}%")
-    print(f"Generator:              {eta_gen*100:.1f}%")
-    print(f"Total förväntad:        {eta_carnot*eta_turb*eta_gen*100:.2f}%")
-    
-    # Massflöde för måleffekt
-    P_target_W = P_target_kW * 1000
-    m_dot = P_target_W / (eta_turb * eta_gen * props['hfg'] * 1000)
-    
-    print(f"\n--- MASSFLÖDE ---")
-    print(f"För {P_target_kW} kW eleffekt:")
-    print(f"  Massflöde behövt: {m_dot*1000:.1f} g/s ({m_dot:.5f} kg/s)")
-    
-    # Värmeväxlare
-    Q_evap = m_dot * props['hfg']  # kW
-    Q_cond = Q_evap + (P_target_W / 1000)  # kW
-    
-    print(f"\n--- VÄRMEVÄXLARE ---")
-    print(f"Förångare värmebehov:  {Q_evap:.2f} kW")
-    print(f"Kondensor kylbehov:    {Q_cond:.2f} kW")
-    
-    # Pump
-    delta_p = (props['p_high'] - props['p_low']) * 1e5  # Pa
-    P_pump = m_dot * delta_p / (props['rho_liq'] * eta_pump)
-    
-    print(f"\n--- PUMP ---")
-    print(f"Tryckskillnad:     {delta_p/1000:.0f} kPa")
-    print(f"Pumpeffekt:        {P_pump:.1f} W ({P_pump/P_target_W*100:.2f}% av eleffekt)")
-    
-    # Diskavstånd (skalning från TesTur)
-    b_calc, scaling = calc_disc_spacing(props['mu_vap'])
-    
-    print(f"\n--- TESLA-TURBIN DIMENSIONERING ---")
-    print(f"Viskositetsskalning från TesTur:")
-    print(f"  μ_medium / μ_TesTur = {props['mu_vap']:.1f} / {TESTUR_REF['viskositet']} = {scaling:.3f}")
-    print(f"  Skalningsfaktor √(μ_ratio) = {scaling**2:.3f}^0.5 = {scaling:.3f}")
-    print(f"\nOptimalt diskavstånd:  {b_calc:.3f} mm")
-    print(f"  (från TesTur {TESTUR_REF['diskavstand']} mm × {scaling:.3f})")
-    print(f"\nToleransintervall:     {b_calc*0.95:.3f} - {b_calc*1.05:.3f} mm (±5%)")
-    print(f"Rekommenderad start:   {round(b_calc, 2):.2f} mm")
+        mu_ratio = res.mu_vap / TESTUR_REF['viskositet']
+        mu_text = f" ({mu_ratio:.1%} av TesTur luft)"
+    out(f"Viskositet ånga:   {res.mu_vap:.1f} μPa·s{mu_text}")
+    
+    out(f"\n--- VERKNINGSGRADER ---")
+    out(f"Carnot (teoretisk max): {res.eta_carnot*100:.2f}%")
+    out(f"Turbin isentropisk:     {res.eta_turb*100:.1f}%")
+    out(f"Generator:              {res.eta_gen*100:.1f}%")
+    out(f"Total förväntad:        {res.eta_carnot*res.eta_turb*res.eta_gen*100:.2f}%")
+    if res.model == 'rankine':
+        out(f"Rankine-cykel:          {res.eta_rankine*100:.2f}% (h₃-h₄)/(h₃-h₂)")
+    
+    out(f"\n--- MASSFLÖDE ---")
+    out(f"För {res.P_target_kW} kW eleffekt:")
+    out(f"  Massflöde behövt: {res.m_dot*1000:.1f} g/s ({res.m_dot:.5f} kg/s)")
+    if res.model == 'rankine':
+        out(f"  Turbinarbete:     {res.w_turb:.2f} kJ/kg (isentrop expansion × η_turb)")
+        out(f"  Turbinutlopp:     {res.T_turb_out:.1f}°C vid {res.p_low:.2f} bar")
+        if res.dT_superheat > 0:
+            out(f"  Överhettning:     {res.dT_superheat:.1f} K")
+    
+    out(f"\n--- VÄRMEVÄXLARE ---")
+    out(f"Förångare värmebehov:  {res.Q_evap:.2f} kW")
+    out(f"Kondensor kylbehov:    {res.Q_cond:.2f} kW")
+    
+    out(f"\n--- PUMP ---")
+    out(f"Tryckskillnad:     {res.delta_p/1000:.0f} kPa")
+    out(f"Pumpeffekt:        {res.P_pump:.1f} W ({res.P_pump/res.P_target_W*100:.2f}% av eleffekt)")
+    
+    b_calc, scaling = res.b_disc, res.scaling
+    
+    out(f"\n--- TESLA-TURBIN DIMENSIONERING ---")
+    out(f"Viskositetsskalning från TesTur:")
+    out(f"  μ_medium / μ_TesTur = {res.mu_vap:.1f} / {TESTUR_REF['viskositet']} = {scaling:.3f}")
+    out(f"  Skalningsfaktor √(μ_ratio) = {scaling**2:.3f}^0.5 = {scaling:.3f}")
+    out(f"\nOptimalt diskavstånd:  {b_calc:.3f} mm")
+    out(f"  (från TesTur {TESTUR_REF['diskavstand']} mm × {scaling:.3f})")
+    out(f"\nToleransintervall:     {b_calc*0.95:.3f} - {b_calc*1.05:.3f} mm (±5%)")
+    out(f"Rekommenderad start:   {round(b_calc, 2):.2f} mm")
     
     # TesTur geometri som referens
     if show_testur_comparison:
-        print(f"\nÖvrig TesTur-geometri (använd som referens):")
-        print(f"  Disktjocklek:      0,254 mm (th/b ≈ {0.254/b_calc:.2f})")
-        print(f"  Antal diskar:      {TESTUR_REF['antal_diskar']}")
-        print(f"  Diameter:          {TESTUR_REF['diameter']} mm")
-        print(f"  Munstycken:        12 st (verifierad konfiguration)")
-        print(f"  RPM drift:         ~{TESTUR_REF['rpm_drift']} (vid {TESTUR_REF['effekt_verifierad']}W)")
-    
-    # Köldbärare (sommardrift)
-    Q_KB = Q_cond  # kW
-    c_p_water = 4.18  # kJ/kg·K
-    dT_KB = 5  # K temperaturökning i köldbärare
-    m_dot_KB = Q_KB / (c_p_water * dT_KB)  # kg/s
-    
-    print(f"\n--- KÖLDBÄRARE (sommardrift vid {T_cold}°C) ---")
-    print(f"Värmebortförsel:   {Q_KB:.2f} kW")
-    print(f"Köldbärare flöde:  {m_dot_KB*1000:.0f} g/s = {m_dot_KB*60:.1f} L/min")
-    print(f"  (vid ΔT={dT_KB}K, {T_cold}°C → {T_cold+dT_KB}°C)")
-    
-    # Nettoeffekt
-    P_net = P_target_W - P_pump
-    eta_system = P_net / (Q_evap * 1000)
-    
-    print(f"\n--- SYSTEMSAMMANFATTNING ---")
-    print(f"Måleffekt (brutto):    {P_target_kW:.1f} kW")
-    print(f"Pumpförlust:           {P_pump/1000:.3f} kW")
-    print(f"Nettoeffekt:           {P_net/1000:.2f} kW")
-    print(f"Systemverkningsgrad:   {eta_system*100:.2f}%")
-    
-    print(f"\n{'='*70}\n")
+        out(f"\nÖvrig TesTur-geometri (använd som referens):")
+        out(f"  Disktjocklek:      0,254 mm (th/b ≈ {0.254/b_calc:.2f})")
+        out(f"  Antal diskar:      {TESTUR_REF['antal_diskar']}")
+        out(f"  Diameter:          {TESTUR_REF['diameter']} mm")
+        out(f"  Munstycken:        12 st (verifierad konfiguration)")
+        out(f"  RPM drift:         ~{TESTUR_REF['rpm_drift']} (vid {TESTUR_REF['effekt_verifierad']}W)")
+
+    if rotor is not None:
+        out(f"\nRotor med TesTur-diameter och varvtal (orc_rotor):")
+        out(f"  Antal diskar:      {rotor['n_discs']:.0f} ({rotor['n_gaps']:.0f} spalter)")
+        out(f"  Paketlängd:        {rotor['L_pack']:.1f} mm")
+        out(f"  Periferihastighet: {rotor['u_tip']:.0f} m/s (u/c0 = {rotor['u_c0']:.2f})")
+        out(f"  Inloppsarea:       {rotor['A_flow']*1e4:.1f} cm² (V_r = {rotor['V_r']:.2f} m/s)")
+        out(f"  Effekt per disk:   {rotor['P_disc']:.1f} W")
+
+    if rotor is not None and stress is not None:
+        out(f"  Spänning navhål:   {stress['sigma_theta_bore']:.0f} MPa vid "
+            f"{rotor['rpm']:.0f} rpm (316L, SF {stress['SF_yield']:.2f} mot sträckgräns)")
+        out(f"  Brustvarvtal:      {stress['rpm_burst']:.0f} rpm")
+        if not stress['overspeed_ok']:
+            out(f"  [!] Klarar inte överfartsprovet, högst {stress['rpm_max']:.0f} rpm "
+                f"vid D = {rotor['D']:.0f} mm")
+    
+    out(f"\n--- KÖLDBÄRARE (sommardrift vid {res.T_cold}°C) ---")
+    out(f"Värmebortförsel:   {res.Q_KB:.2f} kW")
+    out(f"Köldbärare flöde:  {res.m_dot_KB*1000:.0f} g/s = {res.m_dot_KB*60:.1f} L/min")
+    out(f"  (vid ΔT={DT_KB}K, {res.T_cold}°C → {res.T_cold+DT_KB}°C)")
+    
+    out(f"\n--- SYSTEMSAMMANFATTNING ---")
+    out(f"Måleffekt (brutto):    {res.P_target_kW:.1f} kW")
+    out(f"Pumpförlust:           {res.P_pump/1000:.3f} kW")
+    out(f"Nettoeffekt:           {res.P_net/1000:.2f} kW")
+    out(f"Systemverkningsgrad:   {res.eta_system*100:.2f}%")
+    
+    out(f"\n{'='*70}\n")
+    
+    return "\n".join(lines)
+
+# ============================================================================
+# HUVUDBERÄKNINGSFUNKTION
+# ============================================================================
+
+def calc_system_enhanced(fluid_name, fluid_coolprop, T_hot, T_cold, P_target_kW, 
+                        eta_turb=0.55, eta_gen=0.93, eta_pump=0.65,
+                        show_testur_comparison=True, model='hfg', dT_superheat=0.0):
+    """
+    Beräknar komplett ORC-system med TesTur-validering
+    Beräkningen görs i calc_system_core, här skrivs bara resultatet ut
+    model: 'hfg' (original) eller 'rankine' (tillståndspunkter, orc_rankine)
+    """
+    res = calc_system_core(fluid_coolprop, T_hot, T_cold, P_target_kW,
+                           eta_turb, eta_gen, eta_pump,
+                           model=model, dT_superheat=dT_superheat)
+    rotor = stress = None
+    if show_testur_comparison:
+        # Rotorn för detta medium med TesTurs diameter, varvtal och disktjocklek
+        from orc_rotor import rotor_for_cycle
+        from orc_diskspanning import disc_stress, max_rpm
+        rotor = {key: float(value) for key, value in rotor_for_cycle(res).items()}
+        # Diskspänningar för just den rotorn
+        stress = {key: float(value) for key, value in
+                  disc_stress(rotor['D'], rotor['rpm'], rotor['t_disc']).items()}
+        stress['rpm_max'] = float(max_rpm(rotor['D']))
+    print(render_system_enhanced(fluid_name, res, show_testur_comparison, rotor, stress))
     
     return {
-        'm_dot': m_dot,
-        'Q_evap': Q_evap,
-        'Q_cond': Q_cond,
-        'P_pump': P_pump,
-        'b_disc': b_calc,
-        'eta_system': eta_system,
-        'mu_vap': props['mu_vap'],
-        'PR': props['PR']
+        'm_dot': res.m_dot,
+        'Q_evap': res.Q_evap,
+        'Q_cond': res.Q_cond,
+        'P_pump': res.P_pump,
+        'b_disc': res.b_disc,
+        'eta_system': res.eta_system,
+        'mu_vap': res.mu_vap,
+        'PR': res.PR
     }
 
 # ============================================================================
@@ -233,6 +209,14 @@ def calc_system_enhanced(fluid_name, fluid_coolprop, T_hot, T_cold, P_target_kW,
 
 if __name__ == "__main__":
     
+    parser = argparse.ArgumentParser(description="ORC Malung - förbättrad kalkylator")
+    parser.add_argument('--model', default='hfg', choices=CYKELMODELLER,
+                        help="Cykelmodell: hfg (original) eller rankine (tillståndspunkter)")
+    parser.add_argument('--superheat', type=float, default=0.0,
+                        help="Överhettning vid turbininloppet [K] (rankine)")
+    args = parser.parse_args()
+    cycle = {'model': args.model, 'dT_superheat': args.superheat}
+    
     print("\n" + "="*70)
     print(" "*15 + "ORC MALUNG - FÖRBÄTTRAD KALKYLATOR")
     print(" "*10 + "Integrerad med TesTur-data och projektunderlag")
@@ -245,26 +229,26 @@ if __name__ == "__main__":
     print("\n\n### SCENARIO 1: R1233zd(E) GRUNDDIMENSIONERING ###")
     print("Drift: 50°C → 20°C, Mål: 1 kW")
     print("(Jämförs automatiskt med TesTur-data)")
-    result_1 = calc_system_enhanced("R1233zd(E)", "R1233zd(E)", 50, 20, 1.0)
+    result_1 = calc_system_enhanced("R1233zd(E)", "R1233zd(E)", 50, 20, 1.0, **cycle)
     
     # Scenario 2: R1233zd(E) högre effekt
     print("\n### SCENARIO 2: R1233zd(E) HÖGRE EFFEKT ###")
     print("Drift: 50°C → 20°C, Mål: 2 kW")
     result_2 = calc_system_enhanced("R1233zd(E)", "R1233zd(E)", 50, 20, 2.0, 
-                                   show_testur_comparison=False)
+                                   show_testur_comparison=False, **cycle)
     
     # Scenario 3: R1233zd(E) maximal prestanda
     print("\n### SCENARIO 3: R1233zd(E) MAXIMAL PRESTANDA (SOMMARDRIFT) ###")
     print("Drift: 80°C → 10°C, Mål: 2 kW")
     print("(Solfångare 80°C + Köldbärare 10°C)")
     result_3 = calc_system_enhanced("R1233zd(E)", "R1233zd(E)", 80, 10, 2.0,
-                                   show_testur_comparison=False)
+                                   show_testur_comparison=False, **cycle)
     
     # Scenario 4: R245fa jämförelse
     print("\n### SCENARIO 4: R245fa JÄMFÖRELSE ###")
     print("Drift: 50°C → 20°C, Mål: 1 kW")
     result_4 = calc_system_enhanced("R245fa", "R245fa", 50, 20, 1.0,
-                                   show_testur_comparison=False)
+                                   show_testur_comparison=False, **cycle)
     
     # Sammanfattande jämförelsetabell
     print("\n" + "="*70)
@@ -331,4 +315,6 @@ if __name__ == "__main__":
     print("- Charlie Solis kommentarer (ORC-erfarenhet)")
     print("- Viskositet_och_Diskavstand_KORRIGERAD.md")
     print("- CoolProp 7.1.0 termodynamisk databas")
-    print("="*70 + "\n")
+    print("="*70)
+    print_cache_info()
+    print()
@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+"""
+BERÄKNINGSKÄRNA FÖR ORC-SYSTEMET
+Samma beräkningar som calc_system_enhanced, utan utskrifter
+(används av kalkylatorn, designsvep och batchkörningar).
+Finns både skalärt (calc_system_core) och vektoriserat (calc_system_vectorized).
+"""
+
+from dataclasses import dataclass, asdict
+
+import numpy as np
+
+from orc_egenskaper import get_sat_state, get_saturation_batch
+
+# ============================================================================
+# TERMODYNAMISKA FUNKTIONER
+# ============================================================================
+
+def get_props(fluid, T_hot, T_cold):
+    """Hämtar termodynamiska egenskaper vid drifttemperaturer"""
+    T_h = T_hot + 273.15
+    T_c = T_cold + 273.15
+
+    # Högtryckssida (förångning)
+    vap = get_sat_state(fluid, T_h, 1)
+    p_high = vap['P'] / 1e5  # bar
+    h_vap = vap['H'] / 1000  # kJ/kg
+    rho_vap = vap['D']  # kg/m³
+    mu_vap = vap['V'] * 1e6  # μPa·s
+
+    # Lågtryckssida (kondensering)
+    liq = get_sat_state(fluid, T_c, 0)
+    p_low = liq['P'] / 1e5  # bar
+    h_liq = liq['H'] / 1000  # kJ/kg
+    rho_liq = liq['D']  # kg/m³
+
+    hfg = h_vap - h_liq
+
+    return {
+        'p_high': p_high,
+        'p_low': p_low,
+        'h_vap': h_vap,
+        'h_liq': h_liq,
+        'hfg': hfg,
+        'rho_vap': rho_vap,
+        'rho_liq': rho_liq,
+        'mu_vap': mu_vap,
+        'PR': p_high / p_low
+    }
+
+def get_props_backend(backend):
+    """
+    Väljer egenskapskälla för kärnan
+    'coolprop' = CoolProp via egenskapscachen, 'tabell' = splinetabeller
+    """
+    if backend == 'coolprop':
+        return get_props
+    if backend == 'tabell':
+        from orc_egenskapstabeller import get_props as get_props_tabell
+        return get_props_tabell
+    raise ValueError(f"Okänd egenskapskälla: {backend}")
+
+# TesTur-turbinen (referens för validering och rotordimensionering)
+TESTUR_REF = {
+    'medium': 'Luft vid 20°C',
+    'viskositet': 18.2,  # μPa·s
+    'diskavstand': 0.234,  # mm
+    'diameter': 254,  # mm
+    'antal_diskar': 75,
+    'disktjocklek': 0.254,  # mm
+    'effekt_verifierad': 1200,  # W
+    'rpm_drift': 10000,
+    'tryck_in': 5.5,  # bar (från video K7qZvq1CMFg)
+    'tryck_ut': 1.0,  # bar
+    'tryckforhallande': 5.5,
+}
+
+def calc_disc_spacing(mu_medium, mu_ref=18.2, b_ref=0.234):
+    """
+    Beräknar optimalt diskavstånd från viskositet
+    Baserat på gränsskiktsteori och TesTur-data
+
+    Formel: b₂ / b₁ = √(μ₂ / μ₁)
+    """
+    scaling_factor = (mu_medium / mu_ref)**0.5
+    b_calc = b_ref * scaling_factor
+    return b_calc, scaling_factor
+
+# ============================================================================
+# SYSTEMBERÄKNING
+# ============================================================================
+
+# Köldbärare (sommardrift)
+C_P_WATER = 4.18  # kJ/kg·K
+DT_KB = 5  # K temperaturökning i köldbärare
+
+# Cykelmodeller
+#   'hfg'     = ṁ = P / (η_turb·η_gen·hfg), hela förångningsvärmen som arbete (original)
+#   'rankine' = tillståndspunkter med isentrop expansion (orc_rankine)
+CYKELMODELLER = ('hfg', 'rankine')
+
+@dataclass(frozen=True)
+class ORCResultat:
+    """Resultat från calc_system_core (enheter enligt kommentarerna)"""
+    # Indata
+    fluid: str
+    T_hot: float             # °C
+    T_cold: float            # °C
+    P_target_kW: float       # kW
+    eta_turb: float
+    eta_gen: float
+    eta_pump: float
+    # Termodynamiska egenskaper
+    p_high: float            # bar
+    p_low: float             # bar
+    PR: float                # -
+    h_vap: float             # kJ/kg
+    h_liq: float             # kJ/kg
+    hfg: float               # kJ/kg
+    rho_vap: float           # kg/m³
+    rho_liq: float           # kg/m³
+    mu_vap: float            # μPa·s
+    # Systemstorheter
+    eta_carnot: float        # -
+    m_dot: float             # kg/s
+    Q_evap: float            # kW
+    Q_cond: float            # kW
+    delta_p: float           # Pa
+    P_pump: float            # W
+    b_disc: float            # mm
+    scaling: float           # √(μ/μ_ref)
+    Q_KB: float              # kW
+    m_dot_KB: float          # kg/s
+    P_net: float             # W
+    eta_system: float        # -
+    # Cykelmodell (Rankine-fälten är NaN i hfg-modellen)
+    model: str = 'hfg'
+    dT_superheat: float = 0.0        # K
+    eta_rankine: float = float('nan')  # -
+    w_turb: float = float('nan')       # kJ/kg
+    T_turb_out: float = float('nan')   # °C
+
+    @property
+    def P_target_W(self):
+        return self.P_target_kW * 1000
+
+    def as_dict(self):
+        return asdict(self)
+
+def calc_system_core(fluid_coolprop, T_hot, T_cold, P_target_kW,
+                     eta_turb=0.55, eta_gen=0.93, eta_pump=0.65,
+                     backend='coolprop', model='hfg', dT_superheat=0.0):
+    """
+    Beräknar komplett ORC-system utan sidoeffekter
+    Returnerar ORCResultat med egenskaper och alla systemstorheter
+
+    model: 'hfg' (original) eller 'rankine' (tillståndspunkter, se orc_rankine)
+    dT_superheat: överhettning vid turbininloppet [K], bara i Rankine-modellen
+    """
+    if model not in CYKELMODELLER:
+        raise ValueError(f"Okänd cykelmodell: {model}")
+    props = get_props_backend(backend)(fluid_coolprop, T_hot, T_cold)
+
+    # Carnot verkningsgrad
+    T_h_K = T_hot + 273.15
+    T_c_K = T_cold + 273.15
+    eta_carnot = 1 - (T_c_K / T_h_K)
+
+    P_target_W = P_target_kW * 1000
+    delta_p = (props['p_high'] - props['p_low']) * 1e5  # Pa
+    rankine = {}
+
+    if model == 'rankine':
+        from orc_rankine import solve_cycle
+        cycle = solve_cycle(fluid_coolprop, T_hot, T_cold, eta_turb, eta_pump,
+                            dT_superheat)
+
+        # Massflöde för måleffekt (verkligt turbinarbete per kg)
+        m_dot = P_target_W / (eta_gen * cycle.w_turb)
+
+        # Värmeväxlare (förvärmning + förångning + överhettning / kondensering)
+        Q_evap = m_dot * cycle.q_in / 1000  # kW
+        Q_cond = m_dot * cycle.q_out / 1000  # kW
+
+        # Pump (verkligt pumparbete inkl. η_pump)
+        P_pump = m_dot * cycle.w_pump
+
+        rankine = {
+            'eta_rankine': cycle.eta_rankine,
+            'w_turb': cycle.w_turb / 1000,
+            'T_turb_out': cycle.states[3].T - 273.15,
+        }
+    else:
+        # Massflöde för måleffekt
+        m_dot = P_target_W / (eta_turb * eta_gen * props['hfg'] * 1000)
+
+        # Värmeväxlare
+        Q_evap = m_dot * props['hfg']  # kW
+        Q_cond = Q_evap + (P_target_W / 1000)  # kW
+
+        # Pump
+        P_pump = m_dot * delta_p / (props['rho_liq'] * eta_pump)
+
+    # Diskavstånd (skalning från TesTur)
+    b_calc, scaling = calc_disc_spacing(props['mu_vap'])
+
+    # Köldbärare (sommardrift)
+    Q_KB = Q_cond  # kW
+    m_dot_KB = Q_KB / (C_P_WATER * DT_KB)  # kg/s
+
+    # Nettoeffekt
+    P_net = P_target_W - P_pump
+    eta_system = P_net / (Q_evap * 1000)
+
+    return ORCResultat(
+        fluid=fluid_coolprop, T_hot=T_hot, T_cold=T_cold, P_target_kW=P_target_kW,
+        eta_turb=eta_turb, eta_gen=eta_gen, eta_pump=eta_pump,
+        **props,
+        eta_carnot=eta_carnot, m_dot=m_dot, Q_evap=Q_evap, Q_cond=Q_cond,
+        delta_p=delta_p, P_pump=P_pump, b_disc=b_calc, scaling=scaling,
+        Q_KB=Q_KB, m_dot_KB=m_dot_KB, P_net=P_net, eta_system=eta_system,
+        model=model, dT_superheat=dT_superheat, **rankine)
+
+# ============================================================================
+# VEKTORISERAD SYSTEMBERÄKNING
+# ============================================================================
+
+def _saturation_arrays(fluid, T_K, backend):
+    """Saturerade egenskaper för en temperaturvektor, NaN utanför giltigt område"""
+    if backend == 'coolprop':
+        return get_saturation_batch(fluid, T_K)
+    if backend == 'tabell':
+        from orc_egenskapstabeller import load_table
+        table = load_table(fluid)
+        valid = (T_K >= table.T_min) & (T_K <= table.T_max)
+        out = {key: np.full(T_K.shape, np.nan) for key in table.evaluate([table.T_min])}
+        if valid.any():
+            for key, values in table.evaluate(T_K[valid]).items():
+                out[key][valid] = values
+        return out
+    raise ValueError(f"Okänd egenskapskälla: {backend}")
+
+def get_props_vectorized(fluid, T_hot, T_cold, backend='tabell'):
+    """
+    Som get_props, men för arrayer av T_hot och T_cold [°C]
+    Varje unik temperatur utvärderas bara en gång
+    """
+    T_h, T_c = np.broadcast_arrays(np.asarray(T_hot, dtype=float) + 273.15,
+                                   np.asarray(T_cold, dtype=float) + 273.15)
+    T_unique, inverse = np.unique(np.concatenate([T_h.ravel(), T_c.ravel()]),
+                                  return_inverse=True)
+    sat = _saturation_arrays(fluid, T_unique, backend)
+    i_h = inverse[:T_h.size].reshape(T_h.shape)
+    i_c = inverse[T_h.size:].reshape(T_c.shape)
+
+    p_high = sat['p'][i_h] / 1e5  # bar
+    p_low = sat['p'][i_c] / 1e5  # bar
+    h_vap = sat['h_v'][i_h] / 1000  # kJ/kg
+    h_liq = sat['h_l'][i_c] / 1000  # kJ/kg
+
+    return {
+        'p_high': p_high,
+        'p_low': p_low,
+        'h_vap': h_vap,
+        'h_liq': h_liq,
+        'hfg': h_vap - h_liq,
+        'rho_vap': sat['rho_v'][i_h],
+        'rho_liq': sat['rho_l'][i_c],
+        'mu_vap': sat['mu_v'][i_h] * 1e6,  # μPa·s
+        'PR': p_high / p_low
+    }
+
+def _rankine_arrays(fluids, T_hot, T_cold, eta_turb, eta_pump, dT_superheat):
+    """
+    Specifika cykelstorheter (J/kg) per punkt via orc_rankine.solve_cycle
+    Varje unik kombination löses bara en gång (och cachas i solve_cycle)
+    """
+    from orc_rankine import solve_cycle
+
+    keys = ('w_turb', 'w_pump', 'q_in', 'q_out', 'eta_rankine', 'T_turb_out')
+    out = {key: np.full(T_hot.shape, np.nan) for key in keys}
+    fluid_names, fluid_index = np.unique(fluids, return_inverse=True)
+    rows = np.stack([fluid_index.reshape(T_hot.shape), T_hot, T_cold, eta_turb,
+                     eta_pump, dT_superheat], axis=-1).reshape(-1, 6)
+    unique_rows, inverse = np.unique(rows, axis=0, return_inverse=True)
+
+    values = np.full((len(unique_rows), len(keys)), np.nan)
+    for j, (i_fluid, t_hot, t_cold, e_turb, e_pump, dt_sh) in enumerate(unique_rows):
+        if t_cold >= t_hot:
+            continue
+        try:
+            cycle = solve_cycle(str(fluid_names[int(i_fluid)]), t_hot, t_cold,
+                                e_turb, e_pump, dt_sh)
+        except ValueError:
+            continue  # Utanför mediets giltighetsområde
+        values[j] = (cycle.w_turb, cycle.w_pump, cycle.q_in, cycle.q_out,
+                     cycle.eta_rankine, cycle.states[3].T - 273.15)
+
+    for k, key in enumerate(keys):
+        out[key] = values[inverse.ravel(), k].reshape(T_hot.shape)
+    return out
+
+def calc_system_vectorized(fluid_coolprop, T_hot, T_cold, P_target_kW,
+                           eta_turb=0.55, eta_gen=0.93, eta_pump=0.65,
+                           backend='tabell', model='hfg', dT_superheat=0.0):
+    """
+    Vektoriserad calc_system_core: alla indata kan vara arrayer (broadcastas)
+    fluid_coolprop kan vara ett medium eller en array med mediumnamn
+    model/dT_superheat som i calc_system_core
+
+    Returnerar dict med arrayer (samma namn som fälten i ORCResultat).
+    Punkter utan drivande temperaturskillnad eller utanför mediets
+    giltighetsområde blir NaN.
+    """
+    if model not in CYKELMODELLER:
+        raise ValueError(f"Okänd cykelmodell: {model}")
+    (T_hot, T_cold, P_target_kW, eta_turb, eta_gen, eta_pump,
+     dT_superheat) = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in
+          (T_hot, T_cold, P_target_kW, eta_turb, eta_gen, eta_pump, dT_superheat)))
+
+    # Egenskaper per medium
+    fluids = np.asarray(fluid_coolprop)
+    if fluids.ndim == 0:
+        props = get_props_vectorized(str(fluids), T_hot, T_cold, backend)
+    else:
+        fluids = np.broadcast_to(fluids, T_hot.shape)
+        props = None
+        for fluid in np.unique(fluids):
+            mask = fluids == fluid
+            part = get_props_vectorized(str(fluid), T_hot[mask], T_cold[mask], backend)
+            if props is None:
+                props = {key: np.full(T_hot.shape, np.nan) for key in part}
+            for key, values in part.items():
+                props[key][mask] = values
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        # Ingen drivande temperaturskillnad → ogiltig punkt
+        hfg = np.where(T_cold < T_hot, props['hfg'], np.nan)
+
+        # Carnot verkningsgrad
+        eta_carnot = 1 - (T_cold + 273.15) / (T_hot + 273.15)
+
+        P_target_W = P_target_kW * 1000
+        delta_p = (props['p_high'] - props['p_low']) * 1e5  # Pa
+        rankine = {}
+
+        if model == 'rankine':
+            cycle = _rankine_arrays(np.broadcast_to(fluids, T_hot.shape), T_hot,
+                                    T_cold, eta_turb, eta_pump, dT_superheat)
+            m_dot = P_target_W / (eta_gen * cycle['w_turb'])
+            Q_evap = m_dot * cycle['q_in'] / 1000  # kW
+            Q_cond = m_dot * cycle['q_out'] / 1000  # kW
+            P_pump = m_dot * cycle['w_pump']
+            rankine = {
+                'eta_rankine': cycle['eta_rankine'],
+                'w_turb': cycle['w_turb'] / 1000,  # kJ/kg
+                'T_turb_out': cycle['T_turb_out'],
+            }
+        else:
+            # Massflöde för måleffekt
+            m_dot = P_target_W / (eta_turb * eta_gen * hfg * 1000)
+
+            # Värmeväxlare
+            Q_evap = m_dot * hfg  # kW
+            Q_cond = Q_evap + P_target_kW  # kW
+
+            # Pump
+            P_pump = m_dot * delta_p / (props['rho_liq'] * eta_pump)
+
+        # Diskavstånd (skalning från TesTur)
+        b_calc, scaling = calc_disc_spacing(props['mu_vap'])
+
+        # Köldbärare (sommardrift)
+        Q_KB = Q_cond  # kW
+        m_dot_KB = Q_KB / (C_P_WATER * DT_KB)  # kg/s
+
+        # Nettoeffekt
+        P_net = P_target_W - P_pump
+        eta_system = P_net / (Q_evap * 1000)
+
+    return {
+        'T_hot': T_hot, 'T_cold': T_cold, 'P_target_kW': P_target_kW,
+        'eta_turb': eta_turb, 'eta_gen': eta_gen, 'eta_pump': eta_pump,
+        **props,
+        'hfg': hfg,
+        'eta_carnot': eta_carnot, 'm_dot': m_dot, 'Q_evap': Q_evap, 'Q_cond': Q_cond,
+        'delta_p': delta_p, 'P_pump': P_pump, 'b_disc': b_calc, 'scaling': scaling,
+        'Q_KB': Q_KB, 'm_dot_KB': m_dot_KB, 'P_net': P_net, 'eta_system': eta_system,
+        'dT_superheat': dT_superheat, **rankine
+    }
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+KOLUMNLAGRING (PARQUET / ARROW) FÖR ÅNGTABELLER OCH DESIGNSVEP
+Fulla float64-kolumner med stabila ASCII-namn; enhet och visningsnamn
+sparas som fältmetadata, medium/CoolProp-version m.m. som tabellmetadata.
+
+Format väljs av filändelsen:
+  .parquet  komprimerat, för utbyte och arkivering
+  .arrow    Arrow IPC utan komprimering, läses minnesmappat (noll kopiering)
+  .npz      NumPy-fallback när pyarrow saknas (enheter i metadata-JSON)
+"""
+
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+from orc_egenskaper import coolprop_version, get_saturation_batch
+
+# Ångtabellens kolumner: ASCII-namn → (enhet, visningsnamn som i CSV-tabellerna)
+SAT_KOLUMNER = {
+    'T_C': ('°C', 'T [°C]'),
+    'p_bar': ('bar', 'p [bar]'),
+    'rho_l': ('kg/m³', 'ρ_vätska [kg/m³]'),
+    'rho_v': ('kg/m³', 'ρ_ånga [kg/m³]'),
+    'h_l': ('kJ/kg', 'h_vätska [kJ/kg]'),
+    'h_v': ('kJ/kg', 'h_ånga [kJ/kg]'),
+    'hfg': ('kJ/kg', 'hfg [kJ/kg]'),
+    's_l': ('kJ/kg·K', 's_vätska [kJ/kg·K]'),
+    's_v': ('kJ/kg·K', 's_ånga [kJ/kg·K]'),
+    'mu_v': ('μPa·s', 'μ_ånga [μPa·s]'),
+}
+
+# Enheter för svepkolumnerna (samma enheter som ORCResultat)
+SVEP_ENHETER = {
+    'fluid': '', 'T_hot': '°C', 'T_cold': '°C', 'P_target_kW': 'kW',
+    'eta_turb': '-', 'eta_gen': '-', 'eta_pump': '-',
+    'p_high': 'bar', 'p_low': 'bar', 'PR': '-', 'hfg': 'kJ/kg', 'mu_vap': 'μPa·s',
+    'eta_carnot': '-', 'm_dot': 'kg/s', 'Q_evap': 'kW', 'Q_cond': 'kW', 'P_pump': 'W',
+    'b_disc': 'mm', 'm_dot_KB': 'kg/s', 'P_net': 'W', 'eta_system': '-',
+    'eta_rankine': '-', 'w_turb': 'kJ/kg', 'T_turb_out': '°C',
+    'LMTD_evap': 'K', 'UA_evap': 'W/K', 'A_evap': 'm²',
+    'LMTD_cond': 'K', 'UA_cond': 'W/K', 'A_cond': 'm²',
+    'm_dot_source': 'kg/s', 'm_dot_coolant': 'kg/s', 'hx_ok': '-',
+    'dT_pinch_evap': 'K', 'dT_pinch_cond': 'K',
+}
+
+FORMAT = ('.parquet', '.arrow', '.npz')
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("pyarrow krävs för Parquet/Arrow (pip install pyarrow), "
+                          "använd .npz annars")
+    return pyarrow
+
+
+def _format(path):
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in FORMAT:
+        raise ValueError(f"Okänt format {ext!r}, välj något av {FORMAT}")
+    return ext
+
+
+# ============================================================================
+# SKRIVNING
+# ============================================================================
+
+def to_arrow(columns, units=None, labels=None, metadata=None):
+    """Arrow-tabell med enhet/visningsnamn per fält och metadata för tabellen"""
+    pa = _pyarrow()
+    units = units or {}
+    labels = labels or {}
+    fields, arrays = [], []
+    for name, values in columns.items():
+        values = np.asarray(values)
+        array = pa.array(values.astype(str) if values.dtype.kind in 'OU' else values)
+        field_meta = {'unit': units.get(name, '')}
+        if name in labels:
+            field_meta['label'] = labels[name]
+        fields.append(pa.field(name, array.type, metadata=field_meta))
+        arrays.append(array)
+    schema = pa.schema(fields, metadata={k: str(v) for k, v in (metadata or {}).items()})
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def write_table(path, columns, units=None, labels=None, metadata=None):
+    """Skriver kolumner (dict namn → array) i formatet som filändelsen anger"""
+    ext = _format(path)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    if ext == '.npz':
+        meta = {'units': units or {}, 'labels': labels or {}, 'metadata': metadata or {}}
+        np.savez(path, __meta__=np.array(json.dumps(meta)),
+                 **{name: np.asarray(values) for name, values in columns.items()})
+        return path
+
+    pa = _pyarrow()
+    table = to_arrow(columns, units, labels, metadata)
+    if ext == '.parquet':
+        pa.parquet.write_table(table, path, compression='zstd')
+    else:
+        with pa.OSFile(path, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    return path
+
+
+class KolumnSkrivare:
+    """
+    Strömmande skrivning av kolumner i record batches
+
+    .arrow och .parquet skrivs batch för batch (en row group per batch i
+    Parquet), så minnet begränsas till en batch oavsett filens storlek.
+    .npz kan inte strömmas; där samlas batcharna och skrivs vid close().
+    """
+
+    def __init__(self, path, units=None, labels=None, metadata=None):
+        self.path = path
+        self.ext = _format(path)
+        self.units = units
+        self.labels = labels
+        self.metadata = metadata
+        self.rows = 0
+        self._writer = None
+        self._sink = None
+        self._parts = []
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    def write(self, columns):
+        """Skriver en batch (dict namn → array, samma kolumner varje gång)"""
+        if self.ext == '.npz':
+            self._parts.append({name: np.asarray(v) for name, v in columns.items()})
+        else:
+            pa = _pyarrow()
+            table = to_arrow(columns, self.units, self.labels, self.metadata)
+            if self._writer is None:
+                if self.ext == '.parquet':
+                    self._writer = pa.parquet.ParquetWriter(self.path, table.schema,
+                                                            compression='zstd')
+                else:
+                    self._sink = pa.OSFile(self.path, 'wb')
+                    self._writer = pa.ipc.new_file(self._sink, table.schema)
+            self._writer.write_table(table)
+        self.rows += len(next(iter(columns.values())))
+
+    def close(self):
+        if self.ext == '.npz':
+            if self._parts:
+                columns = {name: np.concatenate([part[name] for part in self._parts])
+                           for name in self._parts[0]}
+                write_table(self.path, columns, self.units, self.labels, self.metadata)
+            self._parts = []
+        elif self._writer is not None:
+            self._writer.close()
+            if self._sink is not None:
+                self._sink.close()
+            self._writer = self._sink = None
+        return self.path
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ============================================================================
+# LÄSNING
+# ============================================================================
+
+def read_arrow(path, columns=None):
+    """
+    Arrow-tabell från .parquet eller .arrow
+    .arrow minnesmappas, så kolumnerna pekar direkt in i filen
+    """
+    pa = _pyarrow()
+    if _format(path) == '.parquet':
+        return pa.parquet.read_table(path, columns=columns, memory_map=True)
+    source = pa.memory_map(path, 'r')
+    table = pa.ipc.open_file(source).read_all()
+    return table.select(columns) if columns else table
+
+
+def read_table(path, columns=None):
+    """
+    Läser kolumner som dict namn → NumPy-array, plus metadata
+    Returnerar (columns, info) där info har 'units', 'labels' och 'metadata'
+    """
+    if _format(path) == '.npz':
+        with np.load(path) as data:
+            meta = (json.loads(str(data['__meta__'])) if '__meta__' in data.files
+                    else {'units': {}, 'labels': {}, 'metadata': {}})
+            names = columns or [f for f in data.files if f != '__meta__']
+            return {name: data[name] for name in names}, meta
+
+    pa = _pyarrow()
+    table = read_arrow(path, columns)
+    out = {}
+    units, labels = {}, {}
+    for name, field in zip(table.column_names, table.schema):
+        column = table.column(name)
+        numeric = pa.types.is_floating(field.type) or pa.types.is_integer(field.type)
+        if numeric and column.num_chunks == 1 and column.null_count == 0:
+            # Noll kopiering: arrayen delar minne med (den minnesmappade) tabellen
+            out[name] = column.chunk(0).to_numpy(zero_copy_only=True)
+        else:
+            out[name] = column.to_numpy()
+        field_meta = {k.decode(): v.decode() for k, v in (field.metadata or {}).items()}
+        units[name] = field_meta.get('unit', '')
+        if 'label' in field_meta:
+            labels[name] = field_meta['label']
+    metadata = {k.decode(): v.decode() for k, v in (table.schema.metadata or {}).items()}
+    return out, {'units': units, 'labels': labels, 'metadata': metadata}
+
+
+def read_frame(path, columns=None, labels=False):
+    """DataFrame från kolumnfil (visningsnamn som kolumnrubriker om labels=True)"""
+    import pandas as pd
+    data, info = read_table(path, columns)
+    frame = pd.DataFrame(data, copy=False)
+    if labels:
+        frame = frame.rename(columns=info['labels'])
+    frame.attrs.update(info)
+    return frame
+
+
+# ============================================================================
+# ÅNGTABELLER
+# ============================================================================
+
+def saturation_columns(fluid, temps_celsius):
+    """Ångtabellens kolumner i full precision (enheter enligt SAT_KOLUMNER)"""
+    temps = np.asarray(temps_celsius, dtype=float)
+    sat = get_saturation_batch(fluid, temps + 273.15)
+    return {
+        'T_C': temps,
+        'p_bar': sat['p'] / 1e5,
+        'rho_l': sat['rho_l'],
+        'rho_v': sat['rho_v'],
+        'h_l': sat['h_l'] / 1000,
+        'h_v': sat['h_v'] / 1000,
+        'hfg': (sat['h_v'] - sat['h_l']) / 1000,
+        's_l': sat['s_l'] / 1000,
+        's_v': sat['s_v'] / 1000,
+        'mu_v': sat['mu_v'] * 1e6,
+    }
+
+
+def saturation_path(fluid, directory, ext='.arrow'):
+    """Filnamn enligt CSV-tabellerna, t.ex. R1233zdE_saturated.arrow"""
+    name = fluid.replace('(', '').replace(')', '')
+    return os.path.join(directory, f"{name}_saturated{ext}")
+
+
+def write_saturation_table(fluid, temps_celsius, path):
+    """Beräknar och skriver ångtabell för mediet"""
+    columns = saturation_columns(fluid, temps_celsius)
+    return write_table(
+        path, columns,
+        units={name: unit for name, (unit, _) in SAT_KOLUMNER.items()},
+        labels={name: label for name, (_, label) in SAT_KOLUMNER.items()},
+        metadata={'fluid': fluid, 'coolprop_version': coolprop_version(),
+                  'kind': 'saturation'},
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Jämför CSV, Parquet och Arrow för ångtabeller")
+    parser.add_argument('--fluid', default='R1233zd(E)')
+    parser.add_argument('--points', type=int, default=1_000_000)
+    parser.add_argument('--directory', default='/tmp')
+    args = parser.parse_args()
+
+    # Högupplöst tabell: fyll med interpolerade kolumner från ett grövre rutnät
+    coarse = np.linspace(10, 80, 701)
+    base = saturation_columns(args.fluid, coarse)
+    temps = np.linspace(10, 80, args.points)
+    columns = {name: np.interp(temps, coarse, values) for name, values in base.items()}
+
+    print(f"\n{args.fluid}: {args.points:,} rader × {len(columns)} kolumner")
+    print(f"{'Format':<10} {'Skriv [s]':>10} {'Läs [s]':>10} {'Storlek [MB]':>13}")
+    for ext in ('.csv',) + FORMAT:
+        path = os.path.join(args.directory, f"kolumnlagring_test{ext}")
+        t0 = time.perf_counter()
+        if ext == '.csv':
+            import pandas as pd
+            pd.DataFrame(columns).to_csv(path, index=False)
+        else:
+            write_table(path, columns)
+        t_write = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        if ext == '.csv':
+            pd.read_csv(path)
+        else:
+            read_table(path)
+        t_read = time.perf_counter() - t0
+        print(f"{ext:<10} {t_write:>10.3f} {t_read:>10.3f} "
+              f"{os.path.getsize(path) / 1e6:>13.1f}")
+        os.remove(path)
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+OPTIMERING AV FÖRÅNGNINGS-/KONDENSERINGSTEMPERATUR OCH MEDIUMVAL
+Maximerar systemverkningsgrad eller nettoeffekt under projektets begränsningar:
+
+  - eta_system:         P_net / Q_evap
+  - P_net:              nettoeffekt från en värmekälla med ändligt flöde; den
+                        utnyttjbara värmen C · (T_källa - DT_KALLA - T_hot) minskar
+                        när förångningen höjs, så optimum ligger inne i fönstret
+
+  - Designtryck:        p_hög ≤ 3 bar (designgränsen i generate_diagrams.py)
+  - Tryckförhållande:   0,3 < PR / PR_TesTur < 0,7 (samma fönster som kalkylatorn)
+  - Diskavstånd:        b ≥ b_min (tillverkningsbart gap; prövas inte för medier
+                        utan viskositetsmodell i CoolProp)
+
+Gradientfri begränsad sökning (COBYLA) med varmstart från föregående medium
+och memoiserade kärnanrop, så att mål och bivillkor delar samma utvärdering.
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from orc_karna import TESTUR_REF, calc_system_core
+
+# Begränsningar
+P_MAX_BAR = 3.0          # bar, designgräns
+PR_FONSTER = (0.3, 0.7)  # × TESTUR_REF['tryckforhallande']
+B_MIN_MM = 0.18          # mm, minsta diskavstånd
+DT_MIN = 10.0            # K, minsta skillnad förångning - kondensering
+
+# Sökområde (driftfönstret i projektet)
+T_HOT_GRANSER = (30.0, 80.0)   # °C
+T_COLD_GRANSER = (5.0, 30.0)   # °C
+
+MALFUNKTIONER = ('eta_system', 'P_net')
+
+# Värmekällan för P_net: framledning, värmekapacitetsflöde och minsta ΔT mot förångningen
+T_KALLA = 80.0    # °C (ved/pellets)
+C_KALLA = 1.0     # kW/K (≈ 0,24 kg/s vatten)
+DT_KALLA = 5.0    # K
+
+
+def _evaluator(fluid, P_target_kW, model, kernel_kwargs):
+    """Memoiserad kärna: (T_hot, T_cold) → ORCResultat (None om ogiltig punkt)"""
+    memo = {}
+
+    def evaluate(x):
+        key = (round(float(x[0]), 6), round(float(x[1]), 6))
+        if key not in memo:
+            T_hot, T_cold = key
+            try:
+                res = calc_system_core(fluid, T_hot, T_cold, P_target_kW,
+                                       model=model, **kernel_kwargs)
+            except ValueError:
+                res = None
+            memo[key] = res
+        return memo[key]
+
+    return evaluate, memo
+
+
+def usable_heat(T_hot, T_source=T_KALLA, C_source=C_KALLA):
+    """Värme [kW] som källan avger när den kyls till förångningen + DT_KALLA"""
+    return C_source * max(T_source - DT_KALLA - T_hot, 0.0)
+
+
+def _objective_value(res, objective, T_source, C_source):
+    if objective == 'eta_system':
+        return res.eta_system
+    # Nettoeffekt [kW] ur den värme källan kan lämna vid denna förångning
+    return res.eta_system * usable_heat(res.T_hot, T_source, C_source)
+
+
+def _constraints(res, b_min, p_max, pr_window):
+    """Bivillkor som ≥ 0 när de är uppfyllda (normerade, okänt diskavstånd = uppfyllt)"""
+    pr_ratio = res.PR / TESTUR_REF['tryckforhallande']
+    return np.array([
+        (p_max - res.p_high) / p_max,
+        (pr_ratio - pr_window[0]) / pr_window[0],
+        (pr_window[1] - pr_ratio) / pr_window[1],
+        0.0 if np.isnan(res.b_disc) else (res.b_disc - b_min) / b_min,
+        (res.T_hot - res.T_cold - DT_MIN) / DT_MIN,
+    ])
+
+
+def optimize_fluid(fluid, objective='eta_system', x0=None, P_target_kW=1.0,
+                   T_source=T_KALLA, C_source=C_KALLA, model='rankine', b_min=B_MIN_MM,
+                   p_max=P_MAX_BAR, pr_window=PR_FONSTER,
+                   T_hot_bounds=T_HOT_GRANSER, T_cold_bounds=T_COLD_GRANSER,
+                   **kernel_kwargs):
+    """
+    Optimerar (T_hot, T_cold) för ett medium
+    T_source [°C] och C_source [kW/K] beskriver värmekällan (målfunktionen P_net).
+    Returnerar dict med optimum, ORCResultat, bivillkorsstatus och antal utvärderingar
+    """
+    from scipy.optimize import minimize
+
+    if objective not in MALFUNKTIONER:
+        raise ValueError(f"Okänd målfunktion: {objective}")
+
+    evaluate, memo = _evaluator(fluid, P_target_kW, model, kernel_kwargs)
+    if x0 is None:
+        x0 = (0.5 * sum(T_hot_bounds), 0.5 * sum(T_cold_bounds))
+
+    def f(x):
+        res = evaluate(x)
+        if res is None or not np.isfinite(res.eta_system):
+            return 1e3
+        return -_objective_value(res, objective, T_source, C_source)
+
+    def g(x):
+        res = evaluate(x)
+        if res is None:
+            return -np.ones(5)
+        return _constraints(res, b_min, p_max, pr_window)
+
+    t0 = time.perf_counter()
+    opt = minimize(f, np.asarray(x0, dtype=float), method='COBYLA',
+                   bounds=[T_hot_bounds, T_cold_bounds],
+                   constraints=[{'type': 'ineq', 'fun': g}],
+                   options={'rhobeg': 5.0, 'tol': 1e-3, 'maxiter': 500})
+    elapsed = time.perf_counter() - t0
+
+    res = evaluate(opt.x)
+    feasible = res is not None and bool(np.all(g(opt.x) >= -1e-4))
+    return {
+        'fluid': fluid,
+        'T_hot': float(opt.x[0]),
+        'T_cold': float(opt.x[1]),
+        'objective': objective,
+        'value': _objective_value(res, objective, T_source, C_source) if res else np.nan,
+        'feasible': feasible,
+        'result': res,
+        'n_eval': len(memo),
+        'time_s': elapsed,
+    }
+
+
+def optimize_fluids(fluids=('R1233zd(E)', 'R245fa'), objective='eta_system', **kwargs):
+    """
+    Optimerar varje medium och rangordnar dem (bästa först)
+    Varje medium varmstartas från föregående mediums optimum. Medier utan
+    giltig driftpunkt (inget resultat eller NaN) hamnar sist.
+    """
+    results = []
+    x0 = kwargs.pop('x0', None)
+    for fluid in fluids:
+        best = optimize_fluid(fluid, objective, x0=x0, **kwargs)
+        results.append(best)
+        if best['feasible']:
+            x0 = (best['T_hot'], best['T_cold'])
+    valid = [r for r in results if r['result'] is not None and np.isfinite(r['value'])]
+    valid.sort(key=lambda r: (not r['feasible'], -r['value']))
+    return valid + [r for r in results if r not in valid]
+
+
+def print_optimum(results, objective):
+    unit = "%" if objective == 'eta_system' else "kW"
+    scale = 100 if objective == 'eta_system' else 1
+    print("\n" + "="*78)
+    print(f"OPTIMERING: max {objective} (p_hög ≤ {P_MAX_BAR} bar, "
+          f"PR {PR_FONSTER[0]}-{PR_FONSTER[1]} × TesTur, b ≥ {B_MIN_MM} mm)")
+    print("="*78)
+    print(f"{'Medium':<12} {'T_hot':>7} {'T_cold':>7} {'p_hög':>7} {'PR':>6} "
+          f"{'b_disc':>7} {objective:>11} {'OK':>4} {'n':>5} {'tid':>7}")
+    print(f"{'':12} {'[°C]':>7} {'[°C]':>7} {'[bar]':>7} {'[-]':>6} {'[mm]':>7} "
+          f"{'['+unit+']':>11} {'':>4} {'':>5} {'[s]':>7}")
+    print("-"*78)
+    valid = [r for r in results if r['result'] is not None and np.isfinite(r['value'])]
+    for r in valid:
+        res = r['result']
+        b_disc = f"{'-':>7}" if np.isnan(res.b_disc) else f"{res.b_disc:>7.3f}"
+        print(f"{r['fluid']:<12} {r['T_hot']:>7.2f} {r['T_cold']:>7.2f} "
+              f"{res.p_high:>7.3f} {res.PR:>6.2f} {b_disc} "
+              f"{r['value']*scale:>11.3f} {'ja' if r['feasible'] else 'NEJ':>4} "
+              f"{r['n_eval']:>5} {r['time_s']:>7.3f}")
+    if any(np.isnan(r['result'].b_disc) for r in valid):
+        print("b_disc -: viskositetsmodell saknas i CoolProp, diskavståndet är inte prövat")
+    invalid = [r['fluid'] for r in results if r not in valid]
+    if invalid:
+        print(f"Ingen giltig driftpunkt: {', '.join(invalid)}")
+    print("="*78 + "\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Optimering av ORC-driftpunkt och medium")
+    parser.add_argument('--objective', default='eta_system', choices=MALFUNKTIONER)
+    parser.add_argument('--model', default='rankine', choices=['hfg', 'rankine'])
+    parser.add_argument('--fluids', nargs='+', default=['R1233zd(E)', 'R245fa'])
+    parser.add_argument('--T-source', type=float, default=T_KALLA,
+                        help="Värmekällans framledning [°C] (för målfunktionen P_net)")
+    parser.add_argument('--C-source', type=float, default=C_KALLA,
+                        help="Värmekällans värmekapacitetsflöde [kW/K] (för P_net)")
+    args = parser.parse_args()
+
+    results = optimize_fluids(args.fluids, args.objective, model=args.model,
+                              T_source=args.T_source, C_source=args.C_source)
+    print_optimum(results, args.objective)
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+RANKINE-CYKEL MED TILLSTÅNDSPUNKTER
+Ersätter hfg-genvägen (ṁ = P / (η_turb·η_gen·hfg)) med en riktig cykel:
+
+  1  Pumpinlopp:     mättad vätska vid T_cold (p_låg)
+  2  Pumputlopp:     p_hög, isentrop kompression + η_pump       (p,s)-flash
+  3  Turbininlopp:   p_hög, mättad ånga vid T_hot (+ ev. överhettning)
+  4  Turbinutlopp:   p_låg, isentrop expansion + η_turb          (p,s)/(p,h)-flash
+
+Referens (ORC_Berakningsformler.txt, formel 2):
+  η_rankine = (h_in_turbin - h_ut_turbin) / (h_in_turbin - h_ut_pump)
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+
+from orc_egenskaper import disk_cache, get_abstract_state, get_sat_state
+
+CACHE_STORLEK = 8192
+
+
+@dataclass(frozen=True)
+class Tillstand:
+    """Termodynamiskt tillstånd (SI-enheter)"""
+    T: float    # K
+    p: float    # Pa
+    h: float    # J/kg
+    s: float    # J/kg·K
+    rho: float  # kg/m³
+
+
+@dataclass(frozen=True)
+class RankineCykel:
+    """Lösta tillståndspunkter och specifika storheter per kg arbetsmedium"""
+    states: tuple   # (1, 2, 3, 4) som Tillstand
+    w_turb: float   # J/kg turbinarbete
+    w_pump: float   # J/kg pumparbete
+    q_in: float     # J/kg tillförd värme (förångare)
+    q_out: float    # J/kg bortförd värme (kondensor)
+
+    @property
+    def eta_rankine(self):
+        """(h3 - h4) / (h3 - h2) enligt formelsamlingen"""
+        return self.w_turb / self.q_in
+
+    @property
+    def eta_net(self):
+        """Nettoverkningsgrad (turbinarbete minus pumparbete)"""
+        return (self.w_turb - self.w_pump) / self.q_in
+
+
+@lru_cache(maxsize=CACHE_STORLEK)
+def _flash(fluid, input_pair, value_1, value_2):
+    disk = disk_cache()
+    kind = f'flash{input_pair}'
+    if disk is not None:
+        values = disk.get(fluid, kind, value_1, value_2)
+        if values is not None:
+            return Tillstand(*values)
+
+    state = get_abstract_state(fluid)
+    state.update(input_pair, value_1, value_2)
+    values = (state.T(), state.p(), state.hmass(), state.smass(), state.rhomass())
+    if disk is not None:
+        disk.put(fluid, kind, value_1, value_2, values)
+    return Tillstand(*values)
+
+
+def _sat(fluid, T_K, Q):
+    sat = get_sat_state(fluid, T_K, Q)
+    return Tillstand(T_K, sat['P'], sat['H'], sat['S'], sat['D'])
+
+
+@lru_cache(maxsize=CACHE_STORLEK)
+def solve_cycle(fluid, T_hot, T_cold, eta_turb=0.55, eta_pump=0.65, dT_superheat=0.0):
+    """
+    Löser Rankine-cykeln för förångning vid T_hot och kondensering vid T_cold [°C]
+    dT_superheat [K] är överhettning vid turbininloppet (0 = mättad ånga)
+    """
+    from CoolProp import HmassP_INPUTS, PSmass_INPUTS, PT_INPUTS
+
+    T_h = round(T_hot + 273.15, 9)
+    T_c = round(T_cold + 273.15, 9)
+
+    # 1: Pumpinlopp (mättad vätska)
+    s1 = _sat(fluid, T_c, 0)
+    p_low = s1.p
+
+    # 3: Turbininlopp (mättad eller överhettad ånga)
+    s3 = _sat(fluid, T_h, 1)
+    p_high = s3.p
+    if dT_superheat > 0:
+        s3 = _flash(fluid, PT_INPUTS, p_high, T_h + dT_superheat)
+
+    # 2: Pumputlopp (isentrop kompression, korrigerad med η_pump)
+    s2s = _flash(fluid, PSmass_INPUTS, p_high, s1.s)
+    h2 = s1.h + (s2s.h - s1.h) / eta_pump
+    s2 = _flash(fluid, HmassP_INPUTS, h2, p_high)
+
+    # 4: Turbinutlopp (isentrop expansion, korrigerad med η_turb)
+    s4s = _flash(fluid, PSmass_INPUTS, p_low, s3.s)
+    h4 = s3.h - eta_turb * (s3.h - s4s.h)
+    s4 = _flash(fluid, HmassP_INPUTS, h4, p_low)
+
+    return RankineCykel(
+        states=(s1, s2, s3, s4),
+        w_turb=s3.h - s4.h,
+        w_pump=s2.h - s1.h,
+        q_in=s3.h - s2.h,
+        q_out=s4.h - s1.h,
+    )
+
+
+def cache_info():
+    """Träffar och missar för cykel- och flash-cacherna"""
+    return {'cycle': solve_cycle.cache_info()._asdict(),
+            'flash': _flash.cache_info()._asdict()}
+
+
+def print_cycle(fluid, cycle):
+    """Skriv ut tillståndspunkterna"""
+    names = ('Pumpinlopp', 'Pumputlopp', 'Turbininlopp', 'Turbinutlopp')
+    print(f"\n--- RANKINE-CYKEL: {fluid} ---")
+    print(f"{'Punkt':<16} {'T [°C]':>8} {'p [bar]':>9} {'h [kJ/kg]':>11} {'s [kJ/kg·K]':>12}")
+    for i, (name, st) in enumerate(zip(names, cycle.states), start=1):
+        print(f"{i} {name:<14} {st.T - 273.15:>8.2f} {st.p/1e5:>9.3f} "
+              f"{st.h/1000:>11.2f} {st.s/1000:>12.4f}")
+    print(f"Turbinarbete:  {cycle.w_turb/1000:.2f} kJ/kg")
+    print(f"Pumparbete:    {cycle.w_pump/1000:.3f} kJ/kg")
+    print(f"η_rankine:     {cycle.eta_rankine*100:.2f}% (netto {cycle.eta_net*100:.2f}%)")
+
+
+if __name__ == "__main__":
+    for fluid in ('R1233zd(E)', 'R245fa'):
+        print_cycle(fluid, solve_cycle(fluid, 50, 20))
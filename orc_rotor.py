@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+ROTORGEOMETRI FÖR TESLATURBINEN
+calc_disc_spacing ger bara diskavståndet; här dimensioneras hela rotorn för
+ett arbetsmedium och massflöde, med TesTur-rotorn som referens:
+
+  b       = b_TesTur · √(μ / μ_TesTur)              diskavstånd (calc_disc_spacing)
+  u       = π · D · n / 60                          periferihastighet
+  ṁ_spalt = 24π · μ · r_o² / (b · K_TesTur)         massflöde per spalt
+  n_spalt = ⌈ṁ / ṁ_spalt⌉,  n_disk = n_spalt + 1
+  L       = n_disk · t + n_spalt · b                paketlängd
+  A       = n_spalt · π · D · b                     genomströmningsarea vid inloppet
+  V_r     = ṁ / (ρ_ånga · A)                        radiell inloppshastighet
+  P_disk  = P_axel / n_disk
+
+K = 24πμr_o²/(b·ṁ_spalt) är gränsskiktets flödestal (se orc_gransskikt):
+samma K som TesTur ger samma hastighetsprofil mellan diskarna. TesTurs
+massflöde är inte uppmätt utan uppskattas ur effekten och luftens isentropa
+entalpifall (5,5 → 1 bar, 20°C) med η_turb = 0,55.
+
+Hastighetskvoten u/c0 (c0 = √(2Δh_is)) jämförs med TesTurs på samma sätt
+som i dellastkartan: ν = (u/c0) / (u/c0)_TesTur, f_v = max(2ν - ν², 0).
+
+Rotorn dimensioneras för cykelns massflöde (ORCResultat.m_dot) och
+axeleffekten P_el / η_gen. Δh_is för u/c0 tas alltid från en isentrop
+expansion p_hög → p_låg (orc_rankine), även för resultat från hfg-modellen.
+
+Allt är vektoriserat, så geometrirutnät med tusentals rotorvarianter
+rangordnas på millisekunder.
+"""
+
+import argparse
+import time
+from functools import lru_cache
+
+import numpy as np
+
+from orc_karna import TESTUR_REF, calc_disc_spacing, calc_system_core
+
+# TesTur-rotorn (geometri enligt TESTUR_REF)
+D_REF = float(TESTUR_REF['diameter'])            # mm
+N_DISKAR_REF = TESTUR_REF['antal_diskar']
+B_REF = TESTUR_REF['diskavstand']                # mm
+TJOCKLEK_REF = TESTUR_REF['disktjocklek']        # mm
+RPM_REF = float(TESTUR_REF['rpm_drift'])
+P_REF = float(TESTUR_REF['effekt_verifierad'])   # W axeleffekt
+MU_REF = TESTUR_REF['viskositet']                # μPa·s
+
+# TesTurs drifttillstånd för uppskattning av massflödet
+T_IN_REF = 20.0     # °C
+ETA_REF = 0.55      # isentropisk verkningsgrad (som η_turb i kalkylatorerna)
+
+# Periferihastighet vid TesTurs högsta varvtal (15000 rpm, ORC_Berakningsformler 11)
+U_MAX = np.pi * D_REF / 1000 * 15000 / 60       # m/s
+
+# Standardrutnät för rotorvarianter
+DIAMETRAR = np.arange(100.0, 310.0, 10.0)        # mm
+VARVTAL = np.arange(3000.0, 20500.0, 500.0)      # rpm
+TJOCKLEKAR = (0.2, TJOCKLEK_REF, 0.5, 0.8)       # mm
+
+# Kolumner från rotor_geometry: namn → enhet
+ROTORKOLUMNER = {
+    'D': 'mm', 'rpm': 'rpm', 't_disc': 'mm', 'b_disc': 'mm',
+    'm_dot_gap': 'kg/s', 'n_gaps': '-', 'n_discs': '-', 'L_pack': 'mm',
+    'u_tip': 'm/s', 'A_flow': 'm²', 'V_r': 'm/s', 'P_disc': 'W',
+    'u_c0': '-', 'f_v': '-',
+}
+
+
+@lru_cache(maxsize=1)
+def reference():
+    """
+    TesTurs uppskattade driftpunkt som dict: massflöde, flödestal K och u/c0
+    (luft 5,5 → 1 bar isentropt, P_REF = η · ṁ · Δh_is)
+    """
+    from orc_instrumentering import props_si
+
+    p_in = TESTUR_REF['tryck_in'] * 1e5
+    p_out = TESTUR_REF['tryck_ut'] * 1e5
+    T_in = T_IN_REF + 273.15
+    h_in = props_si('H', 'P', p_in, 'T', T_in, 'Air')
+    s_in = props_si('S', 'P', p_in, 'T', T_in, 'Air')
+    dh_is = h_in - props_si('H', 'P', p_out, 'S', s_in, 'Air')
+
+    m_dot = P_REF / (ETA_REF * dh_is)
+    n_gaps = N_DISKAR_REF - 1
+    m_dot_gap = m_dot / n_gaps
+    r_o = D_REF / 2000
+    K = 24 * np.pi * MU_REF * 1e-6 * r_o**2 / (B_REF / 1000 * m_dot_gap)
+    u_tip = np.pi * D_REF / 1000 * RPM_REF / 60
+    return {
+        'dh_is': dh_is, 'm_dot': m_dot, 'm_dot_gap': m_dot_gap, 'K': K,
+        'u_tip': u_tip, 'u_c0': u_tip / np.sqrt(2 * dh_is),
+    }
+
+
+def rotor_geometry(m_dot, mu_vap, rho_vap, P_shaft_W, dh_is=None, D=D_REF, rpm=RPM_REF,
+                   t_disc=TJOCKLEK_REF, b=None):
+    """
+    Rotorgeometri för ett massflöde m_dot [kg/s] av ånga med viskositet
+    mu_vap [μPa·s] och densitet rho_vap [kg/m³] vid turbininloppet
+
+    P_shaft_W: axeleffekt [W], dh_is: isentropt entalpifall [J/kg] (för u/c0)
+    D [mm], rpm, t_disc [mm], b [mm] (None = calc_disc_spacing)
+    Alla argument broadcastas, så D/rpm/t_disc kan vara hela rutnät.
+    Returnerar dict med kolumner enligt ROTORKOLUMNER.
+    """
+    ref = reference()
+    m_dot, mu_vap, rho_vap, P_shaft_W, D, rpm, t_disc = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in
+          (m_dot, mu_vap, rho_vap, P_shaft_W, D, rpm, t_disc)))
+    b = calc_disc_spacing(mu_vap, MU_REF, B_REF)[0] if b is None \
+        else np.broadcast_to(np.asarray(b, dtype=float), D.shape)
+
+    r_o = D / 2000                                   # m
+    m_dot_gap = 24 * np.pi * mu_vap * 1e-6 * r_o**2 / (b / 1000 * ref['K'])
+    n_gaps = np.ceil(m_dot / m_dot_gap)
+    n_discs = n_gaps + 1
+    A_flow = n_gaps * np.pi * (D / 1000) * (b / 1000)
+    u_tip = np.pi * D / 1000 * rpm / 60
+
+    if dh_is is None:
+        u_c0 = np.full(D.shape, np.nan)
+    else:
+        u_c0 = u_tip / np.sqrt(2 * np.asarray(dh_is, dtype=float))
+    nu = u_c0 / ref['u_c0']
+
+    return {
+        'D': D, 'rpm': rpm, 't_disc': t_disc, 'b_disc': b,
+        'm_dot_gap': m_dot_gap, 'n_gaps': n_gaps, 'n_discs': n_discs,
+        'L_pack': n_discs * t_disc + n_gaps * b,
+        'u_tip': u_tip, 'A_flow': A_flow, 'V_r': m_dot / (rho_vap * A_flow),
+        'P_disc': P_shaft_W / n_discs, 'u_c0': u_c0, 'f_v': np.maximum(2 * nu - nu**2, 0.0),
+    }
+
+
+def isentropic_drop(res):
+    """
+    Isentropt entalpifall över turbinen [J/kg] för cykeln i ett ORCResultat
+    hfg-modellen har inget turbinutlopp, där löses Rankine-cykeln med η_turb = 1.
+    """
+    if res.model == 'rankine':
+        return res.w_turb * 1000 / res.eta_turb
+    from orc_rankine import solve_cycle
+    return solve_cycle(res.fluid, res.T_hot, res.T_cold, 1.0, res.eta_pump,
+                       res.dT_superheat).w_turb
+
+
+def _cycle_inputs(res):
+    """Massflöde, ångdata, axeleffekt [W] och Δh_is [J/kg] ur ett ORCResultat"""
+    dh_is = isentropic_drop(res)
+    P_shaft_W = res.P_target_W / res.eta_gen
+    return {'m_dot': res.m_dot, 'mu_vap': res.mu_vap, 'rho_vap': res.rho_vap,
+            'P_shaft_W': P_shaft_W, 'dh_is': dh_is}
+
+
+def rotor_for_cycle(res, D=D_REF, rpm=RPM_REF, t_disc=TJOCKLEK_REF, b=None):
+    """Rotorgeometri för cykeln i ett ORCResultat (calc_system_core)"""
+    return rotor_geometry(**_cycle_inputs(res), D=D, rpm=rpm, t_disc=t_disc, b=b)
+
+
+def rotor_grid(res, diameters=DIAMETRAR, speeds=VARVTAL, thicknesses=TJOCKLEKAR):
+    """Alla kombinationer av diameter, varvtal och disktjocklek som platta kolumner"""
+    D, rpm, t_disc = (x.ravel() for x in np.meshgrid(
+        np.asarray(diameters, dtype=float), np.asarray(speeds, dtype=float),
+        np.asarray(thicknesses, dtype=float), indexing='ij'))
+    return rotor_for_cycle(res, D, rpm, t_disc)
+
+
+def rank_rotors(rotors, u_max=U_MAX, L_max=None, stress=True):
+    """
+    Index för rotorerna i rangordning: högst f_v (u/c0 nära TesTurs), sedan
+    kortast paket. Rotorer över u_max [m/s] eller L_max [mm] utesluts, och
+    med stress=True även de som inte klarar överfartsprovet (orc_diskspanning).
+    """
+    feasible = np.isfinite(rotors['f_v']) & (rotors['u_tip'] <= u_max)
+    if L_max is not None:
+        feasible &= rotors['L_pack'] <= L_max
+    if stress:
+        from orc_diskspanning import disc_stress
+        feasible &= disc_stress(rotors['D'], rotors['rpm'], rotors['t_disc'])['overspeed_ok']
+    index = np.flatnonzero(feasible)
+    order = np.lexsort((rotors['L_pack'][index], -np.round(rotors['f_v'][index], 3)))
+    return index[order]
+
+
+def print_rotors(rotors, index, title):
+    rotors = {key: np.atleast_1d(value) for key, value in rotors.items()}
+    print(f"\n--- {title} ---")
+    print(f"{'D [mm]':>7} {'rpm':>7} {'t [mm]':>7} {'b [mm]':>7} {'Diskar':>7} "
+          f"{'L [mm]':>7} {'u [m/s]':>8} {'u/c0':>6} {'f_v':>6} {'A [cm²]':>8} "
+          f"{'V_r [m/s]':>10} {'P/disk [W]':>11}")
+    for i in index:
+        print(f"{rotors['D'][i]:>7.0f} {rotors['rpm'][i]:>7.0f} {rotors['t_disc'][i]:>7.3f} "
+              f"{rotors['b_disc'][i]:>7.3f} {rotors['n_discs'][i]:>7.0f} "
+              f"{rotors['L_pack'][i]:>7.1f} {rotors['u_tip'][i]:>8.1f} "
+              f"{rotors['u_c0'][i]:>6.3f} {rotors['f_v'][i]:>6.3f} "
+              f"{rotors['A_flow'][i] * 1e4:>8.2f} {rotors['V_r'][i]:>10.2f} "
+              f"{rotors['P_disc'][i]:>11.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rotorgeometri för Teslaturbinen")
+    parser.add_argument('--fluid', default='R1233zd(E)')
+    parser.add_argument('--T-hot', type=float, default=50.0, help="Förångning [°C]")
+    parser.add_argument('--T-cold', type=float, default=20.0, help="Kondensering [°C]")
+    parser.add_argument('--power', type=float, default=1.0, help="Eleffekt [kW]")
+    parser.add_argument('--model', default='rankine', choices=['hfg', 'rankine'])
+    parser.add_argument('--max-length', type=float, default=None,
+                        help="Största paketlängd [mm]")
+    parser.add_argument('--top', type=int, default=10, help="Antal rotorer att visa")
+    args = parser.parse_args()
+
+    ref = reference()
+    print(f"TesTur (luft {TESTUR_REF['tryck_in']}→{TESTUR_REF['tryck_ut']} bar): "
+          f"Δh_is {ref['dh_is'] / 1000:.1f} kJ/kg, ṁ ≈ {ref['m_dot'] * 1000:.1f} g/s "
+          f"({ref['m_dot_gap'] * 1000:.3f} g/s per spalt), K = {ref['K']:.0f}, "
+          f"u/c0 = {ref['u_c0']:.3f}")
+
+    res = calc_system_core(args.fluid, args.T_hot, args.T_cold, args.power, model=args.model)
+    print_rotors(rotor_for_cycle(res), [0],
+                 f"{args.fluid} {args.T_hot:.0f}→{args.T_cold:.0f}°C, {args.power:.1f} kW, "
+                 f"ṁ = {res.m_dot * 1000:.1f} g/s, Δh_is = {isentropic_drop(res) / 1000:.1f} kJ/kg, "
+                 f"TesTur-diameter och varvtal")
+
+    t0 = time.perf_counter()
+    rotors = rotor_grid(res)
+    order = rank_rotors(rotors, L_max=args.max_length)
+    elapsed = time.perf_counter() - t0
+    print_rotors(rotors, order[:args.top],
+                 f"Bästa {args.top} av {len(rotors['D'])} varianter "
+                 f"({len(order)} inom u ≤ {U_MAX:.0f} m/s och överfartsprovet, "
+                 f"{elapsed * 1000:.1f} ms)")
+    print()
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+SCREENING AV ARBETSMEDIER I HELA COOLPROP-BIBLIOTEKET
+Kör varje rent medium genom saturations- och cykelkärnan vid projektets
+driftfönster, filtrerar på kritisk temperatur, tryckgränser och diskavstånd
+och rangordnar efter nettoeffekt per massflöde. Medier utan
+viskositetsmodell i CoolProp rangordnas ändå; diskavståndet kan då inte
+beräknas och det kriteriet flaggas i stället för att prövas.
+
+Medierna körs parallellt i egna processer med tidsgräns per medium,
+så att ett medium där CoolProp hänger sig inte stoppar hela screeningen.
+"""
+
+import argparse
+import math
+import multiprocessing as mp
+import time
+
+from orc_instrumentering import props_si
+from orc_karna import calc_system_core
+
+# Driftpunkt (grunddimensionering)
+T_HOT = 50.0     # °C förångning
+T_COLD = 20.0    # °C kondensering
+P_TARGET = 1.0   # kW
+
+# Filtergränser
+DT_KRITISK = 10.0       # K, minsta marginal T_crit - T_hot (underkritisk cykel)
+P_LAG_MIN = 0.5         # bar, undvik djupt vakuum (luftinläckage)
+P_HOG_MAX = 10.0        # bar, övre gräns "önskat tryck 2-10 bar"
+B_DISC_OMRADE = (0.15, 0.30)  # mm, tillverkningsbart diskavstånd
+
+TIDSGRANS = 10.0  # s per medium
+
+
+def list_pure_fluids():
+    """Alla rena medier i CoolProp (blandningar och pseudo-rena exkluderas)"""
+    import CoolProp.CoolProp as CP
+    fluids = CP.get_global_param_string('FluidsList').split(',')
+    return sorted(f for f in fluids if CP.get_fluid_param_string(f, 'pure') == 'true')
+
+
+def screen_fluid(fluid, T_hot=T_HOT, T_cold=T_COLD, P_target_kW=P_TARGET,
+                 model='rankine'):
+    """
+    Screenar ett medium vid driftpunkten
+    Returnerar dict med status ('ok' eller orsak till bortfall) och nyckeltal
+    """
+    out = {'fluid': fluid, 'status': 'ok'}
+    T_crit = props_si('Tcrit', fluid) - 273.15
+    T_triple = props_si('Ttriple', fluid) - 273.15
+    out['T_crit'] = T_crit
+
+    # Kritisk temperatur och trippelpunkt
+    if T_crit - T_hot < DT_KRITISK:
+        out['status'] = 'T_crit för låg'
+        return out
+    if T_triple >= T_cold:
+        out['status'] = 'fryser vid T_cold'
+        return out
+
+    try:
+        res = calc_system_core(fluid, T_hot, T_cold, P_target_kW, model=model)
+    except ValueError:
+        out['status'] = 'CoolProp-fel'
+        return out
+
+    out.update({
+        'p_high': res.p_high,
+        'p_low': res.p_low,
+        'PR': res.PR,
+        'mu_vap': res.mu_vap,
+        'b_disc': res.b_disc,
+        'm_dot': res.m_dot,
+        'P_net': res.P_net,
+        'eta_system': res.eta_system,
+        # Nettoeffekt per massflöde [kJ/kg] (rangordningsmått)
+        'w_net': res.P_net / res.m_dot / 1000,
+    })
+
+    # Tryckgränser
+    if res.p_low < P_LAG_MIN:
+        out['status'] = 'p_låg för lågt'
+    elif res.p_high > P_HOG_MAX:
+        out['status'] = 'p_hög för högt'
+    # Diskavstånd (kräver ångans viskositet)
+    elif math.isnan(res.b_disc):
+        out['note'] = 'viskositet saknas, diskavstånd ej prövat'
+    elif not B_DISC_OMRADE[0] <= res.b_disc <= B_DISC_OMRADE[1]:
+        out['status'] = 'diskavstånd utanför område'
+    return out
+
+
+def _worker(conn, fluid, kwargs):
+    try:
+        conn.send(screen_fluid(fluid, **kwargs))
+    except Exception as e:
+        conn.send({'fluid': fluid, 'status': f'fel: {e}'})
+    finally:
+        conn.close()
+        # Processen avslutas utan atexit, skriv buffrade tillstånd till diskcachen
+        from orc_egenskapscache import flush
+        flush()
+
+
+def screen_fluids(fluids=None, processes=None, timeout=TIDSGRANS, **kwargs):
+    """
+    Screenar medier parallellt, en process per medium med tidsgräns
+    Returnerar alla resultat, godkända först rangordnade efter w_net
+    """
+    fluids = list_pure_fluids() if fluids is None else list(fluids)
+    processes = processes or mp.cpu_count()
+    ctx = mp.get_context()
+
+    pending = list(fluids)
+    running = {}  # fluid → (process, conn, starttid)
+    results = []
+
+    while pending or running:
+        # Starta nya processer
+        while pending and len(running) < processes:
+            fluid = pending.pop(0)
+            recv, send = ctx.Pipe(duplex=False)
+            proc = ctx.Process(target=_worker, args=(send, fluid, kwargs), daemon=True)
+            proc.start()
+            send.close()
+            running[fluid] = (proc, recv, time.perf_counter())
+
+        # Samla in färdiga och avbryt de som överskridit tidsgränsen
+        for fluid, (proc, recv, started) in list(running.items()):
+            if recv.poll():
+                try:
+                    results.append(recv.recv())
+                except EOFError:
+                    results.append({'fluid': fluid, 'status': 'process avbröts'})
+            elif time.perf_counter() - started > timeout:
+                proc.terminate()
+                results.append({'fluid': fluid, 'status': f'tidsgräns ({timeout:.0f} s)'})
+            elif not proc.is_alive():
+                results.append({'fluid': fluid, 'status': 'process avbröts'})
+            else:
+                continue
+            proc.join()
+            recv.close()
+            del running[fluid]
+
+        time.sleep(0.005)
+
+    results.sort(key=lambda r: (r['status'] != 'ok', -r.get('w_net', 0.0)))
+    return results
+
+
+def print_screening(results, elapsed=None, top=20):
+    ok = [r for r in results if r['status'] == 'ok']
+    print("\n" + "="*90)
+    print(f"MEDIESCREENING: {len(results)} medier, {len(ok)} godkända"
+          + (f" ({elapsed:.1f} s)" if elapsed is not None else ""))
+    print(f"Drift {T_HOT:.0f}°C → {T_COLD:.0f}°C, p_låg ≥ {P_LAG_MIN} bar, "
+          f"p_hög ≤ {P_HOG_MAX} bar, b = {B_DISC_OMRADE[0]}-{B_DISC_OMRADE[1]} mm")
+    print("="*90)
+    print(f"{'Medium':<16} {'T_crit':>7} {'p_hög':>7} {'p_låg':>7} {'PR':>6} "
+          f"{'μ':>6} {'b_disc':>7} {'m_dot':>7} {'w_net':>7} {'η_sys':>7}")
+    print(f"{'':16} {'[°C]':>7} {'[bar]':>7} {'[bar]':>7} {'[-]':>6} "
+          f"{'[μPa·s]':>6} {'[mm]':>7} {'[g/s]':>7} {'[kJ/kg]':>7} {'[%]':>7}")
+    print("-"*90)
+    for r in ok[:top]:
+        mu = (f"{'-':>6} {'-':>7}" if 'note' in r
+              else f"{r['mu_vap']:>6.1f} {r['b_disc']:>7.3f}")
+        print(f"{r['fluid']:<16} {r['T_crit']:>7.1f} {r['p_high']:>7.2f} {r['p_low']:>7.2f} "
+              f"{r['PR']:>6.2f} {mu} "
+              f"{r['m_dot']*1000:>7.1f} {r['w_net']:>7.2f} {r['eta_system']*100:>7.2f}"
+              + ("  *" if 'note' in r else ""))
+    if any('note' in r for r in ok[:top]):
+        print("* viskositetsmodell saknas i CoolProp, diskavståndet är inte prövat")
+
+    # Sammanfattning av bortfall
+    reasons = {}
+    for r in results:
+        if r['status'] != 'ok':
+            reasons[r['status']] = reasons.get(r['status'], 0) + 1
+    if reasons:
+        print("\nBortfall:")
+        for reason, count in sorted(reasons.items(), key=lambda kv: -kv[1]):
+            print(f"  {reason:<32} {count:>4}")
+    print("="*90 + "\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Screening av ORC-medier i CoolProp")
+    parser.add_argument('--processes', type=int, default=None)
+    parser.add_argument('--timeout', type=float, default=TIDSGRANS,
+                        help="Tidsgräns per medium [s]")
+    parser.add_argument('--model', default='rankine', choices=['hfg', 'rankine'])
+    parser.add_argument('--top', type=int, default=20)
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    results = screen_fluids(processes=args.processes, timeout=args.timeout,
+                            model=args.model)
+    print_screening(results, time.perf_counter() - t0, args.top)
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+DESIGNSVEP FÖR ORC-SYSTEMET
+Expanderar parameterområden till ett kartesiskt rutnät och utvärderar
+den vektoriserade beräkningskärnan (calc_system_vectorized) blockvis
+parallellt i en processpool.
+Resultatet strömmas kolumnvis till fil (.npz, .parquet eller .arrow).
+Varje punkt får även värmeväxlarnas LMTD, UA och area (orc_varmevaxlare).
+"""
+
+import argparse
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from orc_karna import calc_system_vectorized
+from orc_kolumnlagring import SVEP_ENHETER, KolumnSkrivare, read_table
+from orc_varmevaxlare import PINCH_KOLUMNER, VVX_KOLUMNER, pinch_columns, size_heat_exchangers
+
+# Svepparametrar i rutnätets ordning (sista varierar snabbast)
+SVEP_PARAMETRAR = ('fluid', 'T_hot', 'T_cold', 'P_target_kW',
+                   'eta_turb', 'eta_gen', 'eta_pump')
+
+# Resultatkolumner från kärnan
+SVEP_RESULTAT = ('p_high', 'p_low', 'PR', 'hfg', 'mu_vap', 'eta_carnot', 'm_dot',
+                 'Q_evap', 'Q_cond', 'P_pump', 'b_disc', 'm_dot_KB', 'P_net',
+                 'eta_system')
+
+# Extra resultatkolumner i Rankine-modellen
+SVEP_RESULTAT_RANKINE = ('eta_rankine', 'w_turb', 'T_turb_out')
+
+# Standardområden (driftfönstret i projektet)
+STANDARD_OMRADEN = {
+    'fluid': ['R1233zd(E)', 'R245fa'],
+    'T_hot': np.arange(30, 81, 5),           # °C
+    'T_cold': np.arange(5, 31, 5),           # °C
+    'P_target_kW': np.linspace(0.5, 5, 10),  # kW
+    'eta_turb': [0.45, 0.55, 0.65],
+    'eta_gen': [0.90, 0.93, 0.95],
+    'eta_pump': [0.55, 0.65, 0.75],
+}
+
+# .npz kan inte strömmas (hela svepet hålls i minnet), större svep kräver .arrow/.parquet
+NPZ_MAX_PUNKTER = 1_000_000
+
+
+def _normalize_ranges(ranges):
+    """Fyller på saknade parametrar med standardvärdet (mitten av standardområdet)"""
+    out = {}
+    for key in SVEP_PARAMETRAR:
+        if key in ranges:
+            values = ranges[key]
+        else:
+            default = STANDARD_OMRADEN[key]
+            values = [default[len(default) // 2]]
+        out[key] = list(values) if key == 'fluid' else np.asarray(values, dtype=float).ravel()
+    return out
+
+
+def grid_size(ranges):
+    """Antal punkter i det kartesiska rutnätet"""
+    ranges = _normalize_ranges(ranges)
+    return int(np.prod([len(ranges[key]) for key in SVEP_PARAMETRAR]))
+
+
+def expand_grid(ranges, start=0, stop=None):
+    """
+    Kartesiskt rutnät (eller en del av det, platta index start:stop)
+    Returnerar dict med en kolumn per parameter
+    """
+    ranges = _normalize_ranges(ranges)
+    shape = tuple(len(ranges[key]) for key in SVEP_PARAMETRAR)
+    stop = int(np.prod(shape)) if stop is None else stop
+    index = np.unravel_index(np.arange(start, stop), shape)
+    columns = {}
+    for key, idx in zip(SVEP_PARAMETRAR, index):
+        values = ranges[key]
+        columns[key] = np.asarray(values)[idx]
+    return columns
+
+
+def iter_chunks(ranges, chunk_size=100000):
+    """Lat uppdelning av rutnätet i block av platta index (start, stop)"""
+    n_total = grid_size(ranges)
+    for start in range(0, n_total, chunk_size):
+        yield start, min(start + chunk_size, n_total)
+
+
+def _evaluate_chunk(args):
+    """Utvärderar en del av rutnätet (körs i arbetsprocess), returnerar hela batchen"""
+    ranges, start, stop, backend, model, pinch_segments = args
+    try:
+        grid = expand_grid(ranges, start, stop)
+        res = calc_system_vectorized(grid['fluid'], grid['T_hot'], grid['T_cold'],
+                                     grid['P_target_kW'], grid['eta_turb'],
+                                     grid['eta_gen'], grid['eta_pump'], backend=backend,
+                                     model=model)
+        res.update(size_heat_exchangers(res))
+        grid['fluid'] = grid['fluid'].astype(str)
+        if pinch_segments:
+            res.update(pinch_columns(grid['fluid'], res, n_segments=pinch_segments))
+        grid.update((key, res[key]) for key in _result_columns(model, pinch_segments))
+        return grid
+    finally:
+        # Arbetsprocesserna avslutas utan atexit, skriv buffrade tillstånd till diskcachen
+        from orc_egenskapscache import flush
+        flush()
+
+
+def _result_columns(model, pinch_segments=0):
+    columns = SVEP_RESULTAT + tuple(VVX_KOLUMNER)
+    if model == 'rankine':
+        columns = SVEP_RESULTAT + SVEP_RESULTAT_RANKINE + tuple(VVX_KOLUMNER)
+    return columns + (tuple(PINCH_KOLUMNER) if pinch_segments else ())
+
+
+def _bounded_map(pool, fn, tasks, max_pending):
+    """Som pool.map men med högst max_pending block i arbete åt gången (ordning bevaras)"""
+    pending = deque()
+    for task in tasks:
+        pending.append(pool.submit(fn, task))
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def _print_progress(done, total, t0, final=False):
+    elapsed = time.perf_counter() - t0
+    rate = done / elapsed if elapsed > 0 else 0.0
+    eta = (total - done) / rate if rate > 0 else float('nan')
+    print(f"\r  {done:>12,} / {total:,} punkter ({done / total:6.1%})  "
+          f"{rate:>10,.0f} punkter/s  ETA {eta:6.1f} s", end="\n" if final else "",
+          flush=True)
+
+
+def run_sweep(ranges, output_path, processes=None, chunk_size=100000,
+              backend='tabell', model='hfg', pinch_segments=0, verbose=True):
+    """
+    Kör ett designsvep och strömmar resultatet kolumnvis till fil
+
+    ranges: dict parameter → värden (saknade parametrar får standardvärde)
+    backend: 'tabell' (splinetabeller, snabbast) eller 'coolprop'
+    model: cykelmodell i kärnan, 'hfg' eller 'rankine'
+    pinch_segments: > 0 ger även segmenterad pinch-ΔT per växlare (Rankine-
+    profiler med så många entalpisegment, se orc_varmevaxlare)
+
+    Rutnätet delas lat i block om chunk_size punkter och högst två block per
+    process är i arbete åt gången. Varje block skrivs direkt som en record
+    batch, så minnet är oberoende av svepets storlek (.arrow/.parquet;
+    .npz samlar blocken och skrivs i slutet, se orc_kolumnlagring, och
+    tillåts därför bara upp till NPZ_MAX_PUNKTER punkter).
+    """
+    n_total = grid_size(ranges)
+    if os.path.splitext(output_path)[1].lower() == '.npz' and n_total > NPZ_MAX_PUNKTER:
+        raise ValueError(f".npz hålls i minnet tills svepet är klart ({n_total:,} punkter, "
+                         f"gräns {NPZ_MAX_PUNKTER:,}), använd .arrow eller .parquet")
+    n_chunks = -(-n_total // chunk_size)
+    workers = processes or os.cpu_count()
+
+    if verbose:
+        print(f"Designsvep: {n_total} punkter i {n_chunks} block "
+              f"({workers} processer, källa: {backend}, "
+              f"modell: {model})")
+    t0 = time.perf_counter()
+
+    if backend == 'tabell':
+        # Bygg/ladda tabellerna en gång innan arbetsprocesserna startar
+        from orc_egenskapstabeller import load_table
+        for fluid in _normalize_ranges(ranges)['fluid']:
+            load_table(fluid)
+
+    tasks = ((ranges, start, stop, backend, model, pinch_segments)
+             for start, stop in iter_chunks(ranges, chunk_size))
+    metadata = {'kind': 'sweep', 'backend': backend, 'model': model,
+                'pinch_segments': pinch_segments}
+
+    n_done = n_valid = 0
+    last_report = t0
+    with ProcessPoolExecutor(max_workers=workers) as pool, \
+            KolumnSkrivare(output_path, units=SVEP_ENHETER, metadata=metadata) as writer:
+        for batch in _bounded_map(pool, _evaluate_chunk, tasks, 2 * workers):
+            writer.write(batch)
+            n_done += len(batch['eta_system'])
+            n_valid += int(np.isfinite(batch['eta_system']).sum())
+            if verbose and time.perf_counter() - last_report > 0.5:
+                _print_progress(n_done, n_total, t0)
+                last_report = time.perf_counter()
+
+    if verbose:
+        _print_progress(n_done, n_total, t0, final=True)
+        elapsed = time.perf_counter() - t0
+        print(f"Klart på {elapsed:.1f} s ({n_total / elapsed:,.0f} punkter/s), "
+              f"{n_valid} giltiga punkter → {output_path}")
+
+    return output_path
+
+
+def load_sweep(path, columns=None):
+    """Läser in ett sparat svep som dict med kolumner (.arrow minnesmappas)"""
+    return read_table(path, columns)[0]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Designsvep för ORC Malung")
+    parser.add_argument('--output', default='orc_svep.arrow',
+                        help="Resultatfil (.arrow, .parquet eller .npz för små svep)")
+    parser.add_argument('--processes', type=int, default=None, help="Antal processer")
+    parser.add_argument('--backend', default='tabell', choices=['tabell', 'coolprop'])
+    parser.add_argument('--model', default='hfg', choices=['hfg', 'rankine'])
+    parser.add_argument('--pinch', type=int, default=0, metavar='N',
+                        help="Segmenterad pinch-analys med N entalpisegment (0 = av)")
+    args = parser.parse_args()
+
+    run_sweep(STANDARD_OMRADEN, args.output, processes=args.processes,
+              backend=args.backend, model=args.model, pinch_segments=args.pinch)
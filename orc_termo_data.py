@@ -4,54 +4,70 @@ Termodynamisk data för ORC arbetsmedium
 Genererar saturerade ångtabeller för R245fa och R1233zd(E)
 """
 
-from CoolProp.CoolProp import PropsSI
-import pandas as pd
+import argparse
+import os
+
+import numpy as np
+
+from orc_egenskaper import (get_sat_state, get_saturation_batch, get_critical,
+                            print_cache_info)
+
+# Tabellerna skrivs i outputs/ om inget annat anges (inte över de incheckade CSV-filerna)
+OUTPUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'outputs')
+
+# Temperaturområden
+temp_orc = list(range(10, 85, 5))  # 10-80°C i 5°C steg
+
+def _table_columns(temp_celsius, p, rho_l, rho_v, h_l, h_v, s_l, s_v, mu_v):
+    """Tabellkolumner i visningsenheter (fungerar för skalärer och arrayer)"""
+    return {
+        'T [°C]': temp_celsius,
+        'p [bar]': np.round(p / 1e5, 3),                 # Pa → bar
+        'ρ_vätska [kg/m³]': np.round(rho_l, 1),
+        'ρ_ånga [kg/m³]': np.round(rho_v, 2),
+        'h_vätska [kJ/kg]': np.round(h_l / 1000, 2),     # J/kg → kJ/kg
+        'h_ånga [kJ/kg]': np.round(h_v / 1000, 2),
+        'hfg [kJ/kg]': np.round((h_v - h_l) / 1000, 2),
+        's_vätska [kJ/kg·K]': np.round(s_l / 1000, 4),   # J/kg·K → kJ/kg·K
+        's_ånga [kJ/kg·K]': np.round(s_v / 1000, 4),
+        'μ_ånga [μPa·s]': np.round(mu_v * 1e6, 2)        # Pa·s → μPa·s
+    }
 
 def get_saturated_properties(fluid, temp_celsius):
     """Hämtar saturerade egenskaper vid given temperatur"""
     T = temp_celsius + 273.15  # Konvertera till Kelvin
     
     try:
-        # Saturerade egenskaper
-        p = PropsSI('P', 'T', T, 'Q', 0, fluid) / 1e5  # Pa → bar
-        rho_l = PropsSI('D', 'T', T, 'Q', 0, fluid)     # Vätska densitet kg/m³
-        rho_v = PropsSI('D', 'T', T, 'Q', 1, fluid)     # Ånga densitet kg/m³
-        h_l = PropsSI('H', 'T', T, 'Q', 0, fluid) / 1000  # J/kg → kJ/kg
-        h_v = PropsSI('H', 'T', T, 'Q', 1, fluid) / 1000  # J/kg → kJ/kg
-        hfg = h_v - h_l
-        s_l = PropsSI('S', 'T', T, 'Q', 0, fluid) / 1000  # J/kg·K → kJ/kg·K
-        s_v = PropsSI('S', 'T', T, 'Q', 1, fluid) / 1000  # J/kg·K → kJ/kg·K
-        mu_v = PropsSI('V', 'T', T, 'Q', 1, fluid) * 1e6  # Pa·s → μPa·s
-        
-        return {
-            'T [°C]': temp_celsius,
-            'p [bar]': round(p, 3),
-            'ρ_vätska [kg/m³]': round(rho_l, 1),
-            'ρ_ånga [kg/m³]': round(rho_v, 2),
-            'h_vätska [kJ/kg]': round(h_l, 2),
-            'h_ånga [kJ/kg]': round(h_v, 2),
-            'hfg [kJ/kg]': round(hfg, 2),
-            's_vätska [kJ/kg·K]': round(s_l, 4),
-            's_ånga [kJ/kg·K]': round(s_v, 4),
-            'μ_ånga [μPa·s]': round(mu_v, 2)
-        }
+        # Saturerade egenskaper (via gemensam egenskapscache)
+        liq = get_sat_state(fluid, T, 0)
+        vap = get_sat_state(fluid, T, 1)
+        return _table_columns(temp_celsius, liq['P'], liq['D'], vap['D'],
+                              liq['H'], vap['H'], liq['S'], vap['S'], vap['V'])
     except Exception as e:
         print(f"Error för {fluid} vid {temp_celsius}°C: {e}")
         return None
 
 def generate_table(fluid_name, fluid_coolprop, temp_range):
     """Genererar komplett tabell för ett medium"""
+    import pandas as pd
+
     print(f"\n{'='*80}")
     print(f"SATURERADE ÅNGTABELLER: {fluid_name}")
     print(f"{'='*80}\n")
     
-    data = []
-    for T in temp_range:
-        props = get_saturated_properties(fluid_coolprop, T)
-        if props:
-            data.append(props)
+    # Hela temperaturområdet i ett batch-anrop
+    temps = np.asarray(list(temp_range))
+    sat = get_saturation_batch(fluid_coolprop, temps + 273.15)
+    
+    df = pd.DataFrame(_table_columns(temps, sat['p'], sat['rho_l'], sat['rho_v'],
+                                     sat['h_l'], sat['h_v'], sat['s_l'], sat['s_v'],
+                                     sat['mu_v']))
+    
+    failed = df.isna().any(axis=1)
+    for T in df.loc[failed, 'T [°C]']:
+        print(f"Error för {fluid_coolprop} vid {T}°C: saknar saturerat tillstånd")
+    df = df[~failed].reset_index(drop=True)
     
-    df = pd.DataFrame(data)
     print(df.to_string(index=False))
     
     return df
@@ -59,55 +75,94 @@ def generate_table(fluid_name, fluid_coolprop, temp_range):
 def critical_properties(fluid_name, fluid_coolprop):
     """Hämtar kritiska egenskaper"""
     try:
-        T_crit = PropsSI('Tcrit', fluid_coolprop) - 273.15
-        p_crit = PropsSI('pcrit', fluid_coolprop) / 1e5
+        T_crit_K, p_crit_Pa = get_critical(fluid_coolprop)
+        T_crit = T_crit_K - 273.15
+        p_crit = p_crit_Pa / 1e5
         print(f"\n{fluid_name} - Kritiska egenskaper:")
         print(f"  T_kritisk: {T_crit:.2f}°C")
         print(f"  p_kritisk: {p_crit:.2f} bar")
     except:
         print(f"Kunde inte hämta kritiska egenskaper för {fluid_name}")
 
-# Temperaturområden
-temp_orc = list(range(10, 85, 5))  # 10-80°C i 5°C steg
+def main(output_dir=OUTPUT_DIR, formats=('csv',)):
+    """
+    Genererar tabellerna, sparar dem i output_dir och skriver ut jämförelsen
+    formats: 'csv' (avrundad, läsbar) och/eller 'parquet', 'arrow', 'npz'
+    (full precision med ASCII-kolumner och enheter, se orc_kolumnlagring)
+    """
+    os.makedirs(output_dir, exist_ok=True)
+
+    # Generera tabeller
+    print("\n" + "="*80)
+    print("TERMODYNAMISK DATA FÖR ORC MALUNG")
+    print("="*80)
 
-# Generera tabeller
-print("\n" + "="*80)
-print("TERMODYNAMISK DATA FÖR ORC MALUNG")
-print("="*80)
+    # R245fa
+    df_r245fa = generate_table("R245fa (HFC-245fa)", "R245fa", temp_orc)
+    critical_properties("R245fa", "R245fa")
 
-# R245fa
-df_r245fa = generate_table("R245fa (HFC-245fa)", "R245fa", temp_orc)
-critical_properties("R245fa", "R245fa")
+    # R1233zd(E)
+    df_r1233zde = generate_table("R1233zd(E)", "R1233zd(E)", temp_orc)
+    critical_properties("R1233zd(E)", "R1233zd(E)")
 
-# R1233zd(E)
-df_r1233zde = generate_table("R1233zd(E)", "R1233zd(E)", temp_orc)
-critical_properties("R1233zd(E)", "R1233zd(E)")
+    saved = []
+    if 'csv' in formats:
+        # Spara till CSV
+        df_r245fa.to_csv(os.path.join(output_dir, 'R245fa_saturated.csv'), index=False)
+        df_r1233zde.to_csv(os.path.join(output_dir, 'R1233zdE_saturated.csv'), index=False)
+        saved += ['R245fa_saturated.csv', 'R1233zdE_saturated.csv']
 
-# Spara till CSV
-df_r245fa.to_csv('/home/claude/R245fa_saturated.csv', index=False)
-df_r1233zde.to_csv('/home/claude/R1233zdE_saturated.csv', index=False)
+    columnar = [fmt for fmt in formats if fmt != 'csv']
+    if columnar:
+        # Full precision i kolumnformat
+        from orc_kolumnlagring import saturation_path, write_saturation_table
+        for fmt in columnar:
+            for fluid in ('R245fa', 'R1233zd(E)'):
+                path = saturation_path(fluid, output_dir, '.' + fmt)
+                write_saturation_table(fluid, temp_orc, path)
+                saved.append(os.path.basename(path))
 
-print("\n" + "="*80)
-print("DATA SPARAD:")
-print("  - R245fa_saturated.csv")
-print("  - R1233zdE_saturated.csv")
-print("="*80 + "\n")
+    print("\n" + "="*80)
+    print("DATA SPARAD:")
+    for name in saved:
+        print(f"  - {name}")
+    print("="*80 + "\n")
 
-# Jämförelse vid nyckeltemperaturer
-print("\n" + "="*80)
-print("DIREKT JÄMFÖRELSE VID NYCKELTEMPERATURER")
-print("="*80 + "\n")
+    # Jämförelse vid nyckeltemperaturer
+    print("\n" + "="*80)
+    print("DIREKT JÄMFÖRELSE VID NYCKELTEMPERATURER")
+    print("="*80 + "\n")
 
-for T in [10, 20, 30, 50, 80]:
-    print(f"\n--- {T}°C ---")
+    for T in [10, 20, 30, 50, 80]:
+        print(f"\n--- {T}°C ---")
     
-    r245_props = get_saturated_properties("R245fa", T)
-    r1233_props = get_saturated_properties("R1233zd(E)", T)
+        # Återanvänd raderna från tabellerna ovan, hämta bara temperaturer som saknas
+        r245_row = df_r245fa[df_r245fa['T [°C]'] == T]
+        r1233_row = df_r1233zde[df_r1233zde['T [°C]'] == T]
+        r245_props = (r245_row.iloc[0] if len(r245_row)
+                      else get_saturated_properties("R245fa", T))
+        r1233_props = (r1233_row.iloc[0] if len(r1233_row)
+                       else get_saturated_properties("R1233zd(E)", T))
     
-    if r245_props and r1233_props:
-        print(f"{'Parameter':<20} {'R245fa':>12} {'R1233zd(E)':>12} {'Skillnad':>12}")
-        print("-" * 60)
-        print(f"{'Tryck [bar]':<20} {r245_props['p [bar]']:>12.2f} {r1233_props['p [bar]']:>12.2f} {(r1233_props['p [bar]']-r245_props['p [bar]']):>12.2f}")
-        print(f"{'hfg [kJ/kg]':<20} {r245_props['hfg [kJ/kg]']:>12.1f} {r1233_props['hfg [kJ/kg]']:>12.1f} {(r1233_props['hfg [kJ/kg]']-r245_props['hfg [kJ/kg]']):>12.1f}")
-        print(f"{'μ_ånga [μPa·s]':<20} {r245_props['μ_ånga [μPa·s]']:>12.1f} {r1233_props['μ_ånga [μPa·s]']:>12.1f} {(r1233_props['μ_ånga [μPa·s]']-r245_props['μ_ånga [μPa·s]']):>12.1f}")
-        print(f"{'ρ_ånga [kg/m³]':<20} {r245_props['ρ_ånga [kg/m³]']:>12.2f} {r1233_props['ρ_ånga [kg/m³]']:>12.2f} {(r1233_props['ρ_ånga [kg/m³]']-r245_props['ρ_ånga [kg/m³]']):>12.2f}")
+        if r245_props is not None and r1233_props is not None:
+            print(f"{'Parameter':<20} {'R245fa':>12} {'R1233zd(E)':>12} {'Skillnad':>12}")
+            print("-" * 60)
+            print(f"{'Tryck [bar]':<20} {r245_props['p [bar]']:>12.2f} {r1233_props['p [bar]']:>12.2f} {(r1233_props['p [bar]']-r245_props['p [bar]']):>12.2f}")
+            print(f"{'hfg [kJ/kg]':<20} {r245_props['hfg [kJ/kg]']:>12.1f} {r1233_props['hfg [kJ/kg]']:>12.1f} {(r1233_props['hfg [kJ/kg]']-r245_props['hfg [kJ/kg]']):>12.1f}")
+            print(f"{'μ_ånga [μPa·s]':<20} {r245_props['μ_ånga [μPa·s]']:>12.1f} {r1233_props['μ_ånga [μPa·s]']:>12.1f} {(r1233_props['μ_ånga [μPa·s]']-r245_props['μ_ånga [μPa·s]']):>12.1f}")
+            print(f"{'ρ_ånga [kg/m³]':<20} {r245_props['ρ_ånga [kg/m³]']:>12.2f} {r1233_props['ρ_ånga [kg/m³]']:>12.2f} {(r1233_props['ρ_ånga [kg/m³]']-r245_props['ρ_ånga [kg/m³]']):>12.2f}")
+
+    print()
+    print_cache_info()
+
+    return df_r245fa, df_r1233zde
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Saturerade ångtabeller för ORC-medier")
+    parser.add_argument('--output-dir', default=OUTPUT_DIR, help="Mapp för tabellfilerna")
+    parser.add_argument('--format', nargs='+', default=['csv'],
+                        choices=['csv', 'parquet', 'arrow', 'npz'],
+                        help="Filformat (parquet/arrow/npz sparar full precision)")
+    args = parser.parse_args()
+    main(args.output_dir, args.format)
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+TIDTAGNING OCH PROFILERING AV BYGGFASER
+Faser mäts med span(namn) (väggtid och CPU-tid), kan nästlas och ger en
+maskinläsbar tidrapport (JSON). Toppnivåfaser kan dessutom profileras med
+cProfile (.prof + textsammanfattning) eller pyinstrument (.html), om det är
+installerat.
+
+Moduler anropar span() utan att känna till vem som mäter; utan aktiv
+Tidtagning är span() en tom kontext. Arbete i processpooler syns bara som
+väggtid i föräldern (profilen visar väntan, inte renderingen).
+"""
+
+import importlib.util
+import json
+import os
+import platform
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+
+PROFILERARE = ('cprofile', 'pyinstrument')
+
+# Antal funktioner i textsammanfattningen av en cProfile-profil
+PROFIL_RADER = 25
+
+_aktiv = None
+
+
+def span(name):
+    """Tidsspann i den aktiva Tidtagningen (tom kontext om ingen är aktiv)"""
+    return _aktiv.span(name) if _aktiv is not None else nullcontext()
+
+
+class Tidtagning:
+    """
+    Samlar tidsspann för en körning
+    profiler: None, 'cprofile' eller 'pyinstrument' (bara toppnivåfaser)
+    """
+
+    def __init__(self, profiler=None, profile_dir=None):
+        if profiler not in (None,) + PROFILERARE:
+            raise ValueError(f"Okänd profilerare {profiler!r}, välj något av {PROFILERARE}")
+        if profiler == 'pyinstrument' and importlib.util.find_spec('pyinstrument') is None:
+            raise ImportError("pyinstrument saknas (pip install pyinstrument), "
+                              "använd cprofile")
+        self.profiler = profiler
+        self.profile_dir = profile_dir
+        self.spans = []
+        self.profiles = {}
+        self._stack = []
+        self._t0 = time.perf_counter()
+        self._started = datetime.now()
+
+    def __enter__(self):
+        global _aktiv
+        self._previous, _aktiv = _aktiv, self
+        return self
+
+    def __exit__(self, *exc):
+        global _aktiv
+        _aktiv = self._previous
+
+    @contextmanager
+    def span(self, name):
+        path = "/".join(self._stack + [name])
+        entry = {'name': path, 'depth': len(self._stack),
+                 'start_s': time.perf_counter() - self._t0}
+        profiler = self._start_profiler() if not self._stack else None
+        self._stack.append(name)
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield entry
+            entry['status'] = 'ok'
+        except BaseException as e:
+            entry['status'] = f'fel: {type(e).__name__}'
+            raise
+        finally:
+            entry['wall_s'] = time.perf_counter() - wall
+            entry['cpu_s'] = time.process_time() - cpu
+            self._stack.pop()
+            if profiler is not None:
+                self.profiles[path] = self._stop_profiler(profiler, path)
+            self.spans.append(entry)
+
+    # ------------------------------------------------------------------------
+    # Profilering
+    # ------------------------------------------------------------------------
+
+    def _start_profiler(self):
+        if self.profiler == 'cprofile':
+            import cProfile
+            profiler = cProfile.Profile()
+            profiler.enable()
+            return profiler
+        if self.profiler == 'pyinstrument':
+            from pyinstrument import Profiler
+            profiler = Profiler()
+            profiler.start()
+            return profiler
+        return None
+
+    def _stop_profiler(self, profiler, name):
+        """Stoppar profileraren och sparar profilen, returnerar filsökvägarna"""
+        os.makedirs(self.profile_dir, exist_ok=True)
+        base = os.path.join(self.profile_dir, name.replace("/", "_"))
+        if self.profiler == 'cprofile':
+            import io
+            import pstats
+            profiler.disable()
+            profiler.dump_stats(base + '.prof')
+            text = io.StringIO()
+            pstats.Stats(profiler, stream=text).sort_stats('cumulative').print_stats(PROFIL_RADER)
+            with open(base + '.txt', 'w', encoding='utf-8') as f:
+                f.write(text.getvalue())
+            return [base + '.prof', base + '.txt']
+        profiler.stop()
+        with open(base + '.html', 'w', encoding='utf-8') as f:
+            f.write(profiler.output_html())
+        return [base + '.html']
+
+    # ------------------------------------------------------------------------
+    # Rapport
+    # ------------------------------------------------------------------------
+
+    def report(self):
+        """Tidrapport som dict (spann i startordning)"""
+        data = {
+            'started': self._started.isoformat(timespec='seconds'),
+            'total_s': time.perf_counter() - self._t0,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'profiler': self.profiler,
+            'spans': sorted(self.spans, key=lambda entry: entry['start_s']),
+            'profiles': self.profiles,
+        }
+        instrumentering = sys.modules.get('orc_instrumentering')
+        if instrumentering is not None and instrumentering.enabled():
+            summary = instrumentering.summary()
+            data['coolprop'] = {'calls': summary['total_calls'],
+                                'total_s': summary['total_s']}
+        return data
+
+    def write_json(self, path):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, indent=2, ensure_ascii=False)
+        return path
+
+    def print_summary(self):
+        data = self.report()
+        total = data['total_s']
+        print(f"\n{'Fas':<32} {'Vägg [s]':>10} {'CPU [s]':>10} {'Andel':>7}")
+        print("-"*62)
+        for entry in data['spans']:
+            name = "  " * entry['depth'] + entry['name'].rsplit("/", 1)[-1]
+            print(f"{name:<32} {entry['wall_s']:>10.3f} {entry['cpu_s']:>10.3f} "
+                  f"{entry['wall_s'] / total if total else 0:>7.1%}"
+                  + ("" if entry['status'] == 'ok' else f"  ({entry['status']})"))
+        print(f"{'Totalt':<32} {total:>10.3f}")
+        if 'coolprop' in data:
+            print(f"  varav CoolProp-anrop: {data['coolprop']['total_s']:.3f} s "
+                  f"({data['coolprop']['calls']} anrop)")
+        for name, paths in data['profiles'].items():
+            print(f"Profil {name}: {paths[0]}")
@@ -0,0 +1,426 @@
+#!/usr/bin/env python3
+"""
+VÄRMEVÄXLARDIMENSIONERING (LMTD / UA) FÖR FÖRÅNGARE OCH KONDENSOR
+Implementerar formel 6 och 7 i ORC_Berakningsformler.txt:
+
+  Q̇ = U · A · LMTD
+  LMTD = (ΔT₁ - ΔT₂) / ln(ΔT₁ / ΔT₂)
+  ΔT₁ = T_varm_in - T_kall_ut,  ΔT₂ = T_varm_ut - T_kall_in   (motström)
+
+Tar cykelresultatet (ORCResultat eller kolumner från calc_system_vectorized /
+ett designsvep) plus värmekällans och köldbärarens in- och utloppstemperaturer
+och ger LMTD, UA och area per växlare. Fall med ΔT ≤ 0 i någon ände är
+fysikaliskt omöjliga och flaggas (hx_ok = False, storheterna NaN).
+Allt är vektoriserat, så växlarytan blir en billig extrakolumn i svepen.
+
+En enda LMTD kan godkänna en förångare som inte fungerar (pinch vid
+bubbelpunkten). Den segmenterade analysen längre ned delar växlarna i
+entalpisegment, hittar minsta ΔT och löser ut massflödet för en given pinch.
+"""
+
+import argparse
+from functools import lru_cache
+
+import numpy as np
+
+from orc_egenskaper import get_abstract_state, get_sat_state
+from orc_karna import C_P_WATER, DT_KB, calc_system_core
+
+# Standardverkningsgrader (som i kalkylatorerna) för cykeln bakom pinch-profilerna
+ETA_TURB = 0.55
+ETA_PUMP = 0.65
+
+# Sekundärsidornas temperaturer relativt cykeln (när inget annat anges)
+DT_KALLA_IN = 10.0   # K, värmekällans framledning över förångningstemperaturen
+DT_KALLA_UT = 5.0    # K, värmekällans retur över förångningstemperaturen
+DT_KB_UT = 5.0       # K, köldbärarens utlopp under kondenseringstemperaturen
+#                      (köldbärarens temperaturhöjning är DT_KB i orc_karna)
+
+# Värmegenomgångstal, lödda plattvärmeväxlare vatten/köldmedium (~800-1500)
+U_FORANGARE = 1000.0   # W/m²·K
+U_KONDENSOR = 1000.0   # W/m²·K
+
+# Kolumner från size_heat_exchangers: namn → enhet
+VVX_KOLUMNER = {
+    'LMTD_evap': 'K', 'UA_evap': 'W/K', 'A_evap': 'm²',
+    'LMTD_cond': 'K', 'UA_cond': 'W/K', 'A_cond': 'm²',
+    'm_dot_source': 'kg/s', 'm_dot_coolant': 'kg/s', 'hx_ok': '-',
+}
+
+
+def lmtd(dT1, dT2):
+    """Logaritmisk medeltemperaturdifferens [K], NaN om ΔT₁ eller ΔT₂ ≤ 0"""
+    dT1, dT2 = np.broadcast_arrays(np.asarray(dT1, dtype=float),
+                                   np.asarray(dT2, dtype=float))
+    feasible = (dT1 > 0) & (dT2 > 0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        # Skrivet med log1p så att ΔT₁ → ΔT₂ går mot ΔT₂ utan 0/0
+        x = dT1 / dT2 - 1
+        value = np.where(x == 0, dT2, dT2 * x / np.log1p(x))
+    return np.where(feasible, value, np.nan)
+
+
+def size_exchanger(Q_kW, T_hot_in, T_hot_out, T_cold_in, T_cold_out, U):
+    """
+    Motströmsväxlare: värmeflöde Q_kW [kW] och in-/utloppstemperaturer [°C]
+    Returnerar dict med dT1, dT2, LMTD [K], UA [W/K], A [m²] och ok
+    """
+    dT1 = np.asarray(T_hot_in, dtype=float) - T_cold_out
+    dT2 = np.asarray(T_hot_out, dtype=float) - T_cold_in
+    LMTD = lmtd(dT1, dT2)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        UA = np.asarray(Q_kW, dtype=float) * 1000 / LMTD
+    return {'dT1': dT1, 'dT2': dT2, 'LMTD': LMTD, 'UA': UA, 'A': UA / U,
+            'ok': np.isfinite(LMTD)}
+
+
+def secondary_temperatures(T_hot, T_cold, T_source_in=None, T_source_out=None,
+                           T_coolant_in=None, T_coolant_out=None):
+    """Värmekällans och köldbärarens temperaturer [°C], standard enligt DT_-konstanterna"""
+    T_hot = np.asarray(T_hot, dtype=float)
+    T_cold = np.asarray(T_cold, dtype=float)
+    if T_coolant_out is None:
+        T_coolant_out = T_cold - DT_KB_UT
+    if T_coolant_in is None:
+        T_coolant_in = np.asarray(T_coolant_out) - DT_KB
+    return {
+        'T_source_in': T_hot + DT_KALLA_IN if T_source_in is None else T_source_in,
+        'T_source_out': T_hot + DT_KALLA_UT if T_source_out is None else T_source_out,
+        'T_coolant_in': T_coolant_in,
+        'T_coolant_out': T_coolant_out,
+    }
+
+
+def size_heat_exchangers(res, T_source_in=None, T_source_out=None, T_coolant_in=None,
+                         T_coolant_out=None, U_evap=U_FORANGARE, U_cond=U_KONDENSOR):
+    """
+    LMTD, UA och area för förångare och kondensor
+
+    res: ORCResultat eller dict med arrayer (T_hot, T_cold, Q_evap, Q_cond och
+    i Rankine-modellen T_turb_out, dT_superheat). Temperaturerna kan vara
+    skalärer eller arrayer som broadcastas mot resultatet.
+    Returnerar dict med kolumner enligt VVX_KOLUMNER.
+    """
+    if hasattr(res, 'as_dict'):
+        res = res.as_dict()
+    T_hot = np.asarray(res['T_hot'], dtype=float)
+    T_cold = np.asarray(res['T_cold'], dtype=float)
+    temps = secondary_temperatures(T_hot, T_cold, T_source_in, T_source_out,
+                                   T_coolant_in, T_coolant_out)
+
+    # Arbetsmediet: in i förångaren som vätska vid ~T_cold (pumputlopp), ut som
+    # (ev. överhettad) ånga; in i kondensorn vid turbinutloppet, ut som kondensat
+    T_superheat = T_hot + np.asarray(res.get('dT_superheat', 0.0), dtype=float)
+    T_turb_out = np.asarray(res.get('T_turb_out', np.nan), dtype=float)
+    T_cond_in = np.where(np.isfinite(T_turb_out), np.maximum(T_turb_out, T_cold), T_cold)
+
+    evap = size_exchanger(res['Q_evap'], temps['T_source_in'], temps['T_source_out'],
+                          T_cold, T_superheat, U_evap)
+    cond = size_exchanger(res['Q_cond'], T_cond_in, T_cold,
+                          temps['T_coolant_in'], temps['T_coolant_out'], U_cond)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        dT_source = np.asarray(temps['T_source_in']) - temps['T_source_out']
+        dT_coolant = np.asarray(temps['T_coolant_out']) - temps['T_coolant_in']
+        m_dot_source = np.where(dT_source > 0, res['Q_evap'] / (C_P_WATER * dT_source), np.nan)
+        m_dot_coolant = np.where(dT_coolant > 0, res['Q_cond'] / (C_P_WATER * dT_coolant),
+                                 np.nan)
+
+    return {
+        'LMTD_evap': evap['LMTD'], 'UA_evap': evap['UA'], 'A_evap': evap['A'],
+        'LMTD_cond': cond['LMTD'], 'UA_cond': cond['UA'], 'A_cond': cond['A'],
+        'm_dot_source': m_dot_source, 'm_dot_coolant': m_dot_coolant,
+        'hx_ok': evap['ok'] & cond['ok'],
+    }
+
+
+# ============================================================================
+# SEGMENTERAD PINCH-ANALYS
+# ============================================================================
+
+# En enda LMTD döljer pinchen i en förångare med fasändring: vattnet kan vara
+# varmare än mediet i båda ändar men kallare vid bubbelpunkten. Här delas
+# varje växlare i entalpisegment längs arbetsmediets sida (vätska, tvåfas,
+# ånga) och minsta temperaturdifferensen letas upp i segmentgränserna.
+
+N_SEGMENT = 100        # entalpisegment per växlare
+DT_PINCH = 5.0         # K, dimensionerande minsta temperaturdifferens
+CACHE_STORLEK = 4096
+
+# Zon för varje punkt i profilen (arbetsmediets sida)
+ZONER = ('vätska', 'tvåfas', 'ånga')
+
+# Extra svepkolumner från pinch_columns: namn → enhet
+PINCH_KOLUMNER = {'dT_pinch_evap': 'K', 'dT_pinch_cond': 'K'}
+
+
+@lru_cache(maxsize=CACHE_STORLEK)
+def _profile(fluid, side, T_hot, T_cold, eta_turb, eta_pump, dT_superheat, n_segments):
+    """
+    Arbetsmediets temperaturprofil längs växlaren, stigande entalpi
+    side: 'evap' (pumputlopp → turbininlopp) eller 'cond' (kondensat → turbinutlopp)
+    Returnerar (h [J/kg], T [°C], zon) med segmentgränserna och fasgränserna
+    """
+    from CoolProp import HmassP_INPUTS
+    from orc_rankine import solve_cycle
+
+    cycle = solve_cycle(fluid, T_hot, T_cold, eta_turb, eta_pump, dT_superheat)
+    s1, s2, s3, s4 = cycle.states
+    if side == 'evap':
+        p, h_start, h_end, T_sat = s3.p, s2.h, s3.h, T_hot + 273.15
+    else:
+        p, h_start, h_end, T_sat = s4.p, s1.h, s4.h, T_cold + 273.15
+    h_l = get_sat_state(fluid, T_sat, 0)['H']
+    h_v = get_sat_state(fluid, T_sat, 1)['H']
+
+    h = np.linspace(h_start, h_end, n_segments + 1)
+    bounds = [x for x in (h_l, h_v) if h_start < x < h_end]
+    h = np.unique(np.concatenate([h, bounds]))
+    zone = np.where(h <= h_l, 0, np.where(h < h_v, 1, 2))
+
+    # Tvåfaszonen har mättnadstemperaturen; bara enfaspunkterna behöver flash,
+    # alla med samma återanvända AbstractState
+    T = np.full(h.shape, T_sat)
+    state = get_abstract_state(fluid)
+    for i in np.flatnonzero(zone != 1):
+        state.update(HmassP_INPUTS, h[i], p)
+        T[i] = state.T()
+    T -= 273.15
+    for array in (h, T, zone):
+        array.flags.writeable = False
+    return h, T, zone
+
+
+def evaporator_profile(fluid, T_hot, T_cold, eta_pump=ETA_PUMP, dT_superheat=0.0,
+                       n_segments=N_SEGMENT):
+    """Förångarens profil: dict med h [J/kg], T [°C] och zon per punkt"""
+    h, T, zone = _profile(fluid, 'evap', float(T_hot), float(T_cold), ETA_TURB,
+                          float(eta_pump), float(dT_superheat), int(n_segments))
+    return {'h': h, 'T': T, 'zone': zone}
+
+
+def condenser_profile(fluid, T_hot, T_cold, eta_turb=ETA_TURB, eta_pump=ETA_PUMP,
+                      dT_superheat=0.0, n_segments=N_SEGMENT):
+    """Kondensorns profil: dict med h [J/kg], T [°C] och zon per punkt"""
+    h, T, zone = _profile(fluid, 'cond', float(T_hot), float(T_cold), float(eta_turb),
+                          float(eta_pump), float(dT_superheat), int(n_segments))
+    return {'h': h, 'T': T, 'zone': zone}
+
+
+def _segment_ua(Q_segments_kW, dT):
+    """UA [W/K] som summa av segmentens Q/LMTD (NaN om något segment saknar drivkraft)"""
+    return float(np.sum(Q_segments_kW * 1000 / lmtd(dT[1:], dT[:-1])))
+
+
+def evaporator_pinch(profile, T_source_in, T_source_out):
+    """
+    Minsta temperaturdifferens när värmekällan kyls linjärt från T_source_in
+    till T_source_out (motström, källan in vid arbetsmediets utlopp)
+    Returnerar (ΔT_min [K], index i profilen)
+    """
+    h, T = profile['h'], profile['T']
+    T_water = T_source_out + (T_source_in - T_source_out) * (h - h[0]) / (h[-1] - h[0])
+    dT = T_water - T
+    i = int(np.argmin(dT))
+    return float(dT[i]), i
+
+
+def condenser_pinch(profile, T_coolant_in, T_coolant_out):
+    """Som evaporator_pinch för kondensorn (köldbäraren in vid kondensatet)"""
+    h, T = profile['h'], profile['T']
+    T_coolant = T_coolant_in + (T_coolant_out - T_coolant_in) * (h - h[0]) / (h[-1] - h[0])
+    dT = T - T_coolant
+    i = int(np.argmin(dT))
+    return float(dT[i]), i
+
+
+def solve_evaporator(fluid, T_hot, T_cold, T_source_in, m_dot_source, dT_pinch=DT_PINCH,
+                     eta_pump=ETA_PUMP, dT_superheat=0.0, n_segments=N_SEGMENT):
+    """
+    Största massflöde arbetsmedium [kg/s] som värmekällan (T_source_in,
+    m_dot_source [kg/s] vatten) kan förånga med minst dT_pinch i varje segment
+
+    Med vatten (konstant c_p) är varje segments ΔT linjär i ṁ, så villkoret
+    ΔT_i(ṁ) ≥ dT_pinch ger ett gränsflöde per punkt och lösningen är det minsta.
+    """
+    profile = evaporator_profile(fluid, T_hot, T_cold, eta_pump, dT_superheat, n_segments)
+    h, T = profile['h'], profile['T']
+    C = m_dot_source * C_P_WATER * 1000           # W/K
+    duty = h[-1] - h                               # J/kg kvar till utloppet
+    with np.errstate(divide='ignore', invalid='ignore'):
+        limits = np.where(duty > 0, (T_source_in - T - dT_pinch) * C / duty, np.inf)
+    if T_source_in - T[-1] < dT_pinch or not np.isfinite(limits.min()):
+        return {'m_dot': np.nan, 'feasible': False, 'profile': profile}
+
+    i = int(np.argmin(limits))
+    m_dot = float(limits[i])
+    Q_segments = m_dot * np.diff(h) / 1000         # kW
+    Q = float(Q_segments.sum())
+    T_water = T_source_in - m_dot * duty / C
+    dT = T_water - T
+    return {
+        'm_dot': m_dot,
+        'Q_evap': Q,
+        'T_source_out': float(T_water[0]),
+        'dT_pinch': float(dT.min()),
+        'T_pinch': float(T[i]),
+        'pinch_zone': ZONER[profile['zone'][i]],
+        'UA': _segment_ua(Q_segments, dT),
+        'feasible': True,
+        'profile': profile,
+    }
+
+
+def solve_condenser(fluid, T_hot, T_cold, m_dot, T_coolant_in, dT_pinch=DT_PINCH,
+                    eta_turb=ETA_TURB, eta_pump=ETA_PUMP, dT_superheat=0.0,
+                    n_segments=N_SEGMENT):
+    """
+    Minsta köldbärarflöde [kg/s] som kondenserar m_dot [kg/s] arbetsmedium
+    med minst dT_pinch i varje segment (köldbäraren in vid T_coolant_in)
+    """
+    profile = condenser_profile(fluid, T_hot, T_cold, eta_turb, eta_pump, dT_superheat,
+                                n_segments)
+    h, T = profile['h'], profile['T']
+    duty = m_dot * (h - h[0])                      # W upptaget av köldbäraren
+    margin = T - T_coolant_in - dT_pinch
+    if margin.min() <= 0:
+        return {'m_dot_coolant': np.nan, 'feasible': False, 'profile': profile}
+
+    limits = duty / (C_P_WATER * 1000 * margin)
+    i = int(np.argmax(limits))
+    m_dot_coolant = float(limits[i])
+    Q_segments = m_dot * np.diff(h) / 1000         # kW
+    T_coolant = T_coolant_in + duty / (m_dot_coolant * C_P_WATER * 1000)
+    dT = T - T_coolant
+    return {
+        'm_dot_coolant': m_dot_coolant,
+        'Q_cond': float(Q_segments.sum()),
+        'T_coolant_out': float(T_coolant[-1]),
+        'dT_pinch': float(dT.min()),
+        'T_pinch': float(T[i]),
+        'pinch_zone': ZONER[profile['zone'][i]],
+        'UA': _segment_ua(Q_segments, dT),
+        'feasible': True,
+        'profile': profile,
+    }
+
+
+def pinch_columns(fluid, res, T_source_in=None, T_source_out=None, T_coolant_in=None,
+                  T_coolant_out=None, n_segments=N_SEGMENT):
+    """
+    Pinch-ΔT i förångare och kondensor för kolumner från calc_system_vectorized
+    (samma sekundärtemperaturer som size_heat_exchangers). Profilerna beror
+    bara på medium, temperaturer och η, så varje unik kombination räknas en gång.
+    Returnerar dict med kolumner enligt PINCH_KOLUMNER (NaN där cykeln saknas).
+    """
+    temps = secondary_temperatures(res['T_hot'], res['T_cold'], T_source_in,
+                                   T_source_out, T_coolant_in, T_coolant_out)
+    columns = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in
+          (res['T_hot'], res['T_cold'], res['eta_turb'], res['eta_pump'],
+           res.get('dT_superheat', 0.0), temps['T_source_in'], temps['T_source_out'],
+           temps['T_coolant_in'], temps['T_coolant_out'])))
+    shape = columns[0].shape
+    fluid_names, fluid_index = np.unique(np.broadcast_to(np.asarray(fluid), shape),
+                                         return_inverse=True)
+    rows = np.stack([fluid_index.reshape(shape)] + list(columns), axis=-1).reshape(-1, 10)
+    unique_rows, inverse = np.unique(rows, axis=0, return_inverse=True)
+
+    values = np.full((len(unique_rows), 2), np.nan)
+    for j, (i_fluid, T_hot, T_cold, e_turb, e_pump, dT_sh,
+            src_in, src_out, kb_in, kb_out) in enumerate(unique_rows):
+        if not T_cold < T_hot:
+            continue
+        name = str(fluid_names[int(i_fluid)])
+        try:
+            evap = evaporator_profile(name, T_hot, T_cold, e_pump, dT_sh, n_segments)
+            cond = condenser_profile(name, T_hot, T_cold, e_turb, e_pump, dT_sh, n_segments)
+        except ValueError:
+            continue  # Utanför mediets giltighetsområde
+        values[j, 0] = evaporator_pinch(evap, src_in, src_out)[0]
+        values[j, 1] = condenser_pinch(cond, kb_in, kb_out)[0]
+
+    return {key: values[inverse.ravel(), k].reshape(shape)
+            for k, key in enumerate(PINCH_KOLUMNER)}
+
+
+def print_heat_exchangers(fluid, res, hx):
+    print(f"\n--- VÄRMEVÄXLARE: {fluid} {res.T_hot:.0f}°C → {res.T_cold:.0f}°C, "
+          f"{res.P_target_kW:.1f} kW ---")
+    print(f"{'':<12} {'Q [kW]':>8} {'LMTD [K]':>9} {'UA [W/K]':>9} {'A [m²]':>8} "
+          f"{'ṁ_sek [kg/s]':>13}")
+    for name, key, Q, m_dot in (('Förångare', 'evap', res.Q_evap, hx['m_dot_source']),
+                                ('Kondensor', 'cond', res.Q_cond, hx['m_dot_coolant'])):
+        print(f"{name:<12} {Q:>8.2f} {float(hx[f'LMTD_{key}']):>9.2f} "
+              f"{float(hx[f'UA_{key}']):>9.1f} {float(hx[f'A_{key}']):>8.3f} "
+              f"{float(m_dot):>13.3f}")
+    if not hx['hx_ok']:
+        print("[!] Omöjlig växlare: ΔT ≤ 0 i någon ände")
+
+
+def print_pinch(fluid, res, hx, T_source_in=None, T_source_out=None, T_coolant_in=None,
+                T_coolant_out=None, dT_pinch=DT_PINCH, n_segments=N_SEGMENT):
+    """Segmenterad analys bredvid LMTD-resultatet för samma sekundärtemperaturer"""
+    temps = secondary_temperatures(res.T_hot, res.T_cold, T_source_in, T_source_out,
+                                   T_coolant_in, T_coolant_out)
+    eta_turb, eta_pump, dT_superheat = res.eta_turb, res.eta_pump, res.dT_superheat
+    evap = evaporator_profile(fluid, res.T_hot, res.T_cold, eta_pump, dT_superheat,
+                              n_segments)
+    cond = condenser_profile(fluid, res.T_hot, res.T_cold, eta_turb, eta_pump,
+                             dT_superheat, n_segments)
+
+    print(f"Segmenterat ({n_segments} entalpisegment per växlare):")
+    for name, profile, (dT_min, i) in (
+            ('Förångare', evap, evaporator_pinch(evap, float(temps['T_source_in']),
+                                                 float(temps['T_source_out']))),
+            ('Kondensor', cond, condenser_pinch(cond, float(temps['T_coolant_in']),
+                                                float(temps['T_coolant_out'])))):
+        flag = "" if dT_min >= dT_pinch else f"  [!] under {dT_pinch:.1f} K"
+        print(f"  {name:<10} pinch {dT_min:>6.2f} K vid {profile['T'][i]:.1f}°C "
+              f"({ZONER[profile['zone'][i]]}){flag}")
+
+    # Största möjliga flöde med given källa och minsta köldbärarflöde därefter
+    m_dot_source = float(hx['m_dot_source'])
+    solved = solve_evaporator(fluid, res.T_hot, res.T_cold, float(temps['T_source_in']),
+                              m_dot_source, dT_pinch, eta_pump, dT_superheat, n_segments)
+    if not solved['feasible']:
+        print(f"  Värmekällan ({m_dot_source:.3f} kg/s) klarar inte {dT_pinch:.1f} K pinch")
+        return
+    cooling = solve_condenser(fluid, res.T_hot, res.T_cold, solved['m_dot'],
+                              float(temps['T_coolant_in']), dT_pinch, eta_turb, eta_pump,
+                              dT_superheat, n_segments)
+    print(f"  Pinch {dT_pinch:.1f} K: ṁ = {solved['m_dot']:.4f} kg/s "
+          f"(cykeln {res.m_dot:.4f}), Q_evap {solved['Q_evap']:.2f} kW, "
+          f"källa ut {solved['T_source_out']:.1f}°C, UA {solved['UA']:.0f} W/K")
+    if cooling['feasible']:
+        print(f"  Köldbärare ≥ {cooling['m_dot_coolant']:.3f} kg/s, "
+              f"ut {cooling['T_coolant_out']:.1f}°C, UA {cooling['UA']:.0f} W/K")
+    else:
+        print(f"  Köldbäraren in vid {float(temps['T_coolant_in']):.1f}°C klarar inte "
+              f"{dT_pinch:.1f} K pinch")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="LMTD/UA-dimensionering av förångare och kondensor")
+    parser.add_argument('--model', default='hfg', choices=['hfg', 'rankine'])
+    parser.add_argument('--source-in', type=float, default=None, help="Värmekälla in [°C]")
+    parser.add_argument('--source-out', type=float, default=None, help="Värmekälla ut [°C]")
+    parser.add_argument('--coolant-in', type=float, default=None, help="Köldbärare in [°C]")
+    parser.add_argument('--coolant-out', type=float, default=None, help="Köldbärare ut [°C]")
+    parser.add_argument('--pinch', type=float, default=None, metavar='DT',
+                        help=f"Segmenterad pinch-analys med minsta ΔT [K] (t.ex. {DT_PINCH:g})")
+    parser.add_argument('--segments', type=int, default=N_SEGMENT,
+                        help="Entalpisegment per växlare")
+    args = parser.parse_args()
+
+    # Kalkylatorernas scenarion
+    for fluid, T_hot, T_cold, P in (('R1233zd(E)', 50, 20, 1.0), ('R1233zd(E)', 50, 20, 2.0),
+                                    ('R1233zd(E)', 80, 10, 2.0), ('R245fa', 50, 20, 1.0)):
+        res = calc_system_core(fluid, T_hot, T_cold, P, model=args.model)
+        hx = size_heat_exchangers(res, args.source_in, args.source_out,
+                                  args.coolant_in, args.coolant_out)
+        print_heat_exchangers(fluid, res, hx)
+        if args.pinch is not None:
+            print_pinch(fluid, res, hx, args.source_in, args.source_out, args.coolant_in,
+                        args.coolant_out, args.pinch, args.segments)
+    print()
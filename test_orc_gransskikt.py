@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Test: gränsskiktsmodellen återger TesTurs uppmätta diskavstånd och
+flaggar gap som avviker från √μ-skalningen
+"""
+
+import math
+import os
+
+os.environ.setdefault('ORC_EGENSKAPSCACHE', 'off')
+
+from orc_gransskikt import (AVVIKELSEKOLUMN, BLOCKERING, KANTKOLUMN, KVOTKOLUMN,
+                            calibrate_blockage, gap_for_cycle, reference_point)
+from orc_karna import calc_system_core
+from orc_rotor import B_REF
+
+
+def test_testur_optimum_reproduces_measured_gap():
+    _, best = reference_point()
+    assert best[KANTKOLUMN] == 0
+    assert math.isclose(best['b_disc'], B_REF, rel_tol=0.05)
+
+
+def test_blockage_constant_matches_calibration():
+    assert math.isclose(calibrate_blockage(), BLOCKERING, rel_tol=0.05)
+
+
+def test_cycle_gap_is_compared_with_reference():
+    res = calc_system_core('R1233zd(E)', 50, 20, 1.0, model='rankine')
+    gap = gap_for_cycle(res)
+    assert math.isclose(float(gap[KVOTKOLUMN]), float(gap['b_disc']) / res.b_disc)
+    assert float(gap[AVVIKELSEKOLUMN]) == 0
+    far = gap_for_cycle(res, Re_L=100.0)
+    assert float(far[AVVIKELSEKOLUMN]) == 1
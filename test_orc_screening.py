@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+"""
+Test: medier utan viskositetsmodell i CoolProp screenas och rangordnas
+(diskavståndet flaggas i stället för att mediet faller bort)
+"""
+
+import math
+import os
+
+os.environ.setdefault('ORC_EGENSKAPSCACHE', 'off')
+
+from orc_screening import screen_fluid, screen_fluids
+
+
+def test_fluid_without_viscosity_model_is_screened():
+    result = screen_fluid('R1234ze(Z)')
+    assert result['status'] == 'ok'
+    assert math.isnan(result['mu_vap'])
+    assert 'note' in result
+    assert result['w_net'] > 0
+
+
+def test_fluid_without_viscosity_model_is_ranked():
+    results = screen_fluids(['R245fa', 'R1234ze(Z)', 'R1233zd(E)'], processes=2)
+    ranked = [r['fluid'] for r in results if r['status'] == 'ok']
+    assert 'R1234ze(Z)' in ranked
+    w_net = [r['w_net'] for r in results if r['status'] == 'ok']
+    assert w_net == sorted(w_net, reverse=True)